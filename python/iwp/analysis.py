@@ -184,7 +184,40 @@ def iwp_labels_to_rectangles( iwp_labels, grid_extents, label_color=None, line_w
 
     return rectangles, coordinates
 
-def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map=cm.bwr, quantization_table=None, iwp_labels=[], label_color=None, rotate_flag=False, colorbar_flag=True, colorbar_formatter=None ):
+def build_quantized_color_table( quantization_table, color_map ):
+    """
+    Builds a lookup table of RGBA pixels for each of a quantization table's levels.
+    Indexing the table with NumPy's digitize() applied to data produces the same
+    colors as rendering the data with imshow() using the quantization table as a
+    BoundaryNorm (see show_xy_slice()), while only evaluating the color map once
+    per level rather than once per data point.
+
+    Takes 2 arguments:
+
+      quantization_table - Quantization table to build pixels for.  Must be compatible
+                           with NumPy's digitize() function.
+      color_map          - Matplotlib colormap to colorize the quantization levels with.
+
+    Returns 1 value:
+
+      color_table - NumPy array, shaped (len( quantization_table ) + 1, 4), of uint8
+                    RGBA pixels.  The first and last entries correspond to data below
+                    and above the quantization table, respectively.
+
+    """
+
+    normalizer = colors.BoundaryNorm( boundaries=quantization_table,
+                                      ncolors=quantization_table.shape[0] )
+
+    # pick a value in each of the quantization levels so that digitize() maps
+    # it to that level's index.  every value in the table starts a level, so we
+    # only need something smaller than the table for values below it.
+    level_values = np.concatenate( ([np.nextafter( quantization_table[0], -np.inf )],
+                                    quantization_table) )
+
+    return color_map( normalizer( level_values ), bytes=True )
+
+def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map=cm.bwr, quantization_table=None, iwp_labels=[], label_color=None, rotate_flag=False, colorbar_flag=True, colorbar_formatter=None, color_table=None ):
     """
 
     Renders an XY slice via Matplotlib's imshow() and decorates it so it is easily
@@ -192,7 +225,7 @@ def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map
     name, while the XY slice's extents can be set if supplied.  The image rendered
     follows IWP conventions and has the origin in the lower left.
 
-    Takes 12 arguments:
+    Takes 13 arguments:
 
       ax_h               - Axes handle to supply to imshow().
       slice_data         - 2D NumPy array containing the XY slice data, shaped (Y, X).
@@ -227,6 +260,13 @@ def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map
                            labels.  Has no effect when colorbar_flag is False.  If
                            omitted, defaults to None and uses the default colorbar
                            tick label formatting.
+      color_table        - Optional NumPy array of RGBA pixels, one per quantization
+                           level, as returned by build_quantized_color_table() for
+                           quantization_table and color_map.  When provided, slice_data
+                           is colorized with a table lookup before calling imshow()
+                           instead of having Matplotlib normalize and colorize it.
+                           Ignored when quantization_table is omitted.  If omitted,
+                           defaults to None and Matplotlib colorizes slice_data.
 
     Returns 1 value:
 
@@ -273,13 +313,29 @@ def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map
         normalizer = colors.BoundaryNorm( boundaries=quantization_table,
                                           ncolors=quantization_table.shape[0] )
 
-    # plot the slice.
-    slice_h = ax_h.imshow( slice_data,
-                           extent=[grid_x[0], grid_x[-1],
-                                   grid_y[0], grid_y[-1]],
-                           cmap=color_map,
-                           norm=normalizer,
-                           origin="lower" )
+    # plot the slice.  colorize it ourselves in a single pass when we have the
+    # colors for each quantization level, otherwise let Matplotlib do it.
+    if (quantization_table is not None) and (color_table is not None):
+        slice_h = ax_h.imshow( np.take( color_table,
+                                        np.digitize( slice_data, quantization_table ),
+                                        axis=0 ),
+                               extent=[grid_x[0], grid_x[-1],
+                                       grid_y[0], grid_y[-1]],
+                               origin="lower" )
+
+        # the image no longer knows about the data's scale, so the colorbar
+        # needs a mappable that does.
+        colorbar_mappable = cm.ScalarMappable( norm=normalizer,
+                                               cmap=color_map )
+    else:
+        slice_h = ax_h.imshow( slice_data,
+                               extent=[grid_x[0], grid_x[-1],
+                                       grid_y[0], grid_y[-1]],
+                               cmap=color_map,
+                               norm=normalizer,
+                               origin="lower" )
+
+        colorbar_mappable = slice_h
 
     # convert our label bounding boxes (top left, bottom right) to
     # (anchor, offset)'s.
@@ -365,7 +421,7 @@ def show_xy_slice( ax_h, slice_data, variable_name, grid_extents=None, color_map
         divider = make_axes_locatable( ax_h )
         cax_h   = divider.append_axes( "right", size="5%", pad=0.05 )
 
-        plt.colorbar( slice_h,
+        plt.colorbar( colorbar_mappable,
                       cax=cax_h,
                       format=colorbar_formatter )
 
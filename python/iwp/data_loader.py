@@ -2,8 +2,10 @@
 
 import collections.abc
 import copy
+import glob
 import netCDF4
 import numpy as np
+import os
 import torch
 import torch.utils.data.dataset
 import xarray as xr
@@ -27,7 +29,7 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
 
     """
 
-    def __init__( self, dataset_path_pattern, time_indices, variables=[], xy_slice_indices=[] ):
+    def __init__( self, dataset_path_pattern, time_indices, variables=[], xy_slice_indices=[], read_ahead_flag=False, chunk_cache_size=None ):
         """
         Creates an IWPDataset object from a subset of the netCDF4 files specified.  The dataset
         may be a subset of time and/or XY slices and specific grid variables may be requested,
@@ -44,7 +46,7 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
 
 
 
-        Takes 4 arguments:
+        Takes 6 arguments:
 
           dataset_path_pattern - Path pattern of the dataset, with a format specifier to instantiate
                                  into a path for each time step.  Each time step's dataset path is
@@ -64,6 +66,18 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
           xy_slice_indices     - Optional sequence of XY slice indices to create the dataset from.  If
                                  omitted, defaults to all XY slices present.  Scalar integers may
                                  also be specified to indicate a specific XY slice.
+          read_ahead_flag      - Optional flag specifying whether the operating system should
+                                 be asked to start reading each of the netCDF4 files into its
+                                 page cache before they are opened.  This speeds up the first
+                                 access to files that are not already cached, at the expense
+                                 of reading parts of the files that may not be used.  Ignored
+                                 on systems that do not support it.  If omitted, defaults to
+                                 False.
+          chunk_cache_size     - Optional size, in bytes, of each variable's chunk cache.  Larger
+                                 caches avoid repeatedly reading and decompressing chunks when
+                                 XY slices are accessed out of order.  Caches are always large
+                                 enough to hold at least one chunk.  If omitted, defaults to
+                                 None and the netCDF4 library's default size is used.
 
         Returns 1 value:
 
@@ -108,6 +122,13 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
                     index_index,
                     str( type( xy_slice_index ) ) ) )
 
+        # ask the operating system to start reading all of the files before we
+        # open any of them so that reads from cold storage overlap with opening
+        # (and validating) each of the files below.
+        if read_ahead_flag:
+            for time_index in time_indices:
+                _advise_read_ahead( dataset_path_pattern.format( time_index ) )
+
         # get a handle to each of the netCDF files.
         #
         # NOTE: this will raise an exception if the file can't be opened.
@@ -189,6 +210,15 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
                                           self._netcdf_files[0].filepath(),
                                           self._netcdf_files[time_index].filepath() ) )
 
+        # make sure that each variable's chunk cache can hold at least one of its
+        # chunks.  XY slices are read one at a time and chunks usually span
+        # multiple slices, so a cache that is too small causes each chunk to be
+        # read and decompressed once per slice rather than once.
+        for netcdf_file in self._netcdf_files:
+            for variable in variables:
+                _fit_chunk_cache( netcdf_file[variable],
+                                  chunk_cache_size )
+
         # default to all available slices if the caller did not request any.
         if len( xy_slice_indices ) == 0:
             xy_slice_indices = range( 0, self._netcdf_files[0][variables[0]].shape[0] )
@@ -201,6 +231,12 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
                     xy_slice_index,
                     self._netcdf_files[0][variables[0]].shape[0] ) )
 
+        # keep track of where the dataset lives so it can be reopened in
+        # another process (see __getstate__()).
+        self._dataset_path_pattern = dataset_path_pattern
+        self._read_ahead_flag      = read_ahead_flag
+        self._chunk_cache_size     = chunk_cache_size
+
         # keep track of the variables we were provided, or discovered.
         self._variables = variables
 
@@ -240,6 +276,45 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
             for netcdf_file in self._netcdf_files:
                 netcdf_file.close()
 
+    def __getstate__( self ):
+        """
+        Gets the state needed to recreate an IWPDataset object when it is pickled.
+        netCDF4 files cannot be pickled, so only the parameters used to open them
+        are kept.  This allows IWPDataset objects to be sent to worker processes.
+
+        Takes no arguments.
+
+        Returns 1 value:
+
+          state - Dictionary of arguments to supply to __init__().
+
+        """
+
+        return {
+            "dataset_path_pattern": self._dataset_path_pattern,
+            "time_indices":         self._time_indices,
+            "variables":            self._variables,
+            "xy_slice_indices":     self._xy_slice_indices,
+            "read_ahead_flag":      self._read_ahead_flag,
+            "chunk_cache_size":     self._chunk_cache_size
+        }
+
+    def __setstate__( self, state ):
+        """
+        Recreates an IWPDataset object from a pickled state by reopening the
+        underlying netCDF4 files.
+
+        Takes 1 argument:
+
+          state - Dictionary of arguments, as returned by __getstate__(), to supply
+                  to __init__().
+
+        Returns nothing.
+
+        """
+
+        self.__init__( **state )
+
     def __len__( self ):
         """
         Returns the number of XY slices, across all time steps, in the dataset.
@@ -446,24 +521,23 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
 
         return copy.copy( self._xy_slice_indices )
 
-    def get_xy_slice( self, time_index, xy_slice_index ):
+    def _resolve_xy_slice_indices( self, time_index, xy_slice_index ):
         """
-        Extracts an XY slice from the underlying dataset specified by the time and XY slice
-        indices provided.
+        Resolves a time step index and an XY slice index into the position of the
+        time step's netCDF4 file and the XY slice's index within it.  Negative indices
+        are handled the same way as with __getitem__().
 
         Raises an IndexError exception if either of the specified indices are out of bounds.
 
         Takes 2 arguments:
 
-          time_index     - Integral index into the dataset's time steps.  Must be in the
-                           range [0, number_time_steps).
-          xy_slice_index - Integral index into the dataset's XY slice.  Must be in the
-                           range [0, number_xy_slices).
+          time_index     - Integral index into the dataset's time steps.
+          xy_slice_index - Integral index into the dataset's XY slice.
 
-        Returns 1 value:
+        Returns 2 values:
 
-          xy_slice - Array, shaped (number_variables, Y, X), containing the XY slice at
-                     index.
+          time_index_index - Index into the dataset's netCDF4 files for time_index.
+          xy_slice_index   - Non-negative XY slice index.
 
         """
 
@@ -504,24 +578,180 @@ class IWPDataset( torch.utils.data.dataset.Dataset ):
                 xy_slice_index,
                 self._netcdf_files[time_index_index].dimensions["z"].size ) )
 
+        return time_index_index, xy_slice_index
+
+    def get_xy_slice( self, time_index, xy_slice_index ):
+        """
+        Extracts an XY slice from the underlying dataset specified by the time and XY slice
+        indices provided.
+
+        Raises an IndexError exception if either of the specified indices are out of bounds.
+
+        Takes 2 arguments:
+
+          time_index     - Integral index into the dataset's time steps.  Must be in the
+                           range [0, number_time_steps).
+          xy_slice_index - Integral index into the dataset's XY slice.  Must be in the
+                           range [0, number_xy_slices).
+
+        Returns 1 value:
+
+          xy_slice - Array, shaped (number_variables, Y, X), containing the XY slice at
+                     index.
+
+        """
+
+        time_index_index, xy_slice_index = self._resolve_xy_slice_indices( time_index,
+                                                                           xy_slice_index )
+
         # create an empty buffer big enough for each of the variables' XY slice
         # stacked together.
         xy_slice = np.empty( self._datum_shape, dtype=np.float32 )
 
         # walk through each variable and copy its data into the buffer.
+        #
+        # NOTE: we index each dimension explicitly so the underlying library
+        #       reads a single (Y, X) hyperslab rather than the entire variable.
+        #
         for variable_index, variable_name in enumerate( self._variables ):
-            xy_slice[variable_index, :] = self._netcdf_files[time_index_index][variable_name][xy_slice_index, :]
+            xy_slice[variable_index, :] = self._netcdf_files[time_index_index][variable_name][xy_slice_index, :, :]
 
         return xy_slice
 
-def open_xarray_dataset( dataset_path_pattern ):
+    def get_xy_slices( self, time_index, xy_slice_indices ):
+        """
+        Extracts multiple XY slices from a single time step of the underlying dataset.
+        Each variable is read with a single request covering all of the XY slices,
+        rather than one request per XY slice, so that chunks spanning multiple XY
+        slices are only read once.
+
+        Raises an IndexError exception if any of the specified indices are out of bounds.
+
+        Takes 2 arguments:
+
+          time_index       - Integral index into the dataset's time steps.  See
+                             get_xy_slice() for details.
+          xy_slice_indices - Sequence of integral indices into the dataset's XY slices.
+                             See get_xy_slice() for details.  Duplicate indices are
+                             allowed and may be in any order.
+
+        Returns 1 value:
+
+          xy_slices - Array, shaped (len( xy_slice_indices ), number_variables, Y, X),
+                      containing the XY slices in the order requested.
+
+        """
+
+        # resolve each of the indices so that negative indices are handled, and
+        # everything is validated, the same way as a single XY slice.
+        resolved_xy_slice_indices = []
+        for xy_slice_index in xy_slice_indices:
+            time_index_index, xy_slice_index = self._resolve_xy_slice_indices( time_index,
+                                                                               xy_slice_index )
+            resolved_xy_slice_indices.append( xy_slice_index )
+
+        xy_slices = np.empty( (len( resolved_xy_slice_indices ),) + self._datum_shape,
+                              dtype=np.float32 )
+
+        if len( resolved_xy_slice_indices ) == 0:
+            return xy_slices
+
+        # netCDF4 requires indices to be strictly increasing, so read each
+        # unique XY slice once and map them back into the requested order.
+        unique_xy_slice_indices, xy_slice_positions = np.unique( resolved_xy_slice_indices,
+                                                                 return_inverse=True )
+
+        for variable_index, variable_name in enumerate( self._variables ):
+            variable_xy_slices = self._netcdf_files[time_index_index][variable_name][unique_xy_slice_indices, :, :]
+
+            xy_slices[:, variable_index, :] = variable_xy_slices[xy_slice_positions, :]
+
+        return xy_slices
+
+def _fit_chunk_cache( netcdf_variable, cache_size=None ):
     """
-    Opens an IWP dataset as an xarray.Dataset from one or more netCDF4 files.
+    Sizes a netCDF4 variable's chunk cache so that it holds at least one chunk.
+    Caches that are already large enough, as well as contiguous variables, are
+    left as is unless a specific size is requested.
+
+    Takes 2 arguments:
+
+      netcdf_variable - netCDF4.Variable whose chunk cache is sized.
+      cache_size      - Optional size, in bytes, of the chunk cache.  This is
+                        increased to the size of a single chunk if it is too
+                        small.  If omitted, defaults to None and the current
+                        cache size is kept when it is large enough.
+
+    Returns nothing.
+
+    """
+
+    chunk_shape = netcdf_variable.chunking()
+
+    # contiguous variables are read directly and do not use the chunk cache.
+    if chunk_shape == "contiguous":
+        return
+
+    chunk_size = int( np.prod( chunk_shape ) ) * netcdf_variable.dtype.itemsize
+
+    (current_cache_size, cache_entries, cache_preemption) = netcdf_variable.get_var_chunk_cache()
+
+    if cache_size is None:
+        cache_size = current_cache_size
+
+    cache_size = max( cache_size, chunk_size )
+
+    if cache_size != current_cache_size:
+        netcdf_variable.set_var_chunk_cache( size=cache_size,
+                                             nelems=cache_entries,
+                                             preemption=cache_preemption )
+
+def _advise_read_ahead( file_path ):
+    """
+    Advises the operating system that a file will be read in the near future so
+    that it can be read into the page cache in the background.  This is a hint
+    and does nothing on systems that do not support posix_fadvise().
+
+    Errors are ignored so that the caller reports them when the file is actually
+    opened.
 
     Takes 1 argument:
 
+      file_path - Path to the file that will be read.
+
+    Returns nothing.
+
+    """
+
+    if not hasattr( os, "posix_fadvise" ):
+        return
+
+    try:
+        file_descriptor = os.open( file_path, os.O_RDONLY )
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise( file_descriptor, 0, 0, os.POSIX_FADV_WILLNEED )
+    except OSError:
+        pass
+    finally:
+        os.close( file_descriptor )
+
+def open_xarray_dataset( dataset_path_pattern, chunks=None ):
+    """
+    Opens an IWP dataset as an xarray.Dataset from one or more netCDF4 files.
+
+    Takes 2 arguments:
+
       dataset_path_pattern - Path to the dataset to open.  May include '*' for simple
                              globbing, or specified as a list of paths to open.
+      chunks               - Optional Dask chunk specification for each file's variables.
+                             See xarray.open_mfdataset() for details.  Specifying "auto"
+                             creates chunks that are multiples of the netCDF4 files'
+                             on-disk chunks, which is well suited for reductions over
+                             the entire dataset.  If omitted, defaults to None and
+                             xarray's default chunking is used.
 
     Returns 1 value;
 
@@ -583,6 +813,7 @@ def open_xarray_dataset( dataset_path_pattern ):
     for time_step_attribute in ["time_step", "Cycle"]:
         try:
             ds = xr.open_mfdataset( dataset_path_pattern,
+                                    chunks=chunks,
                                     parallel=True,
                                     combine="nested",
                                     concat_dim=[time_step_attribute],
@@ -598,3 +829,73 @@ def open_xarray_dataset( dataset_path_pattern ):
             dataset_path_pattern ) )
 
     return ds
+
+def peek_dims( dataset_path_pattern ):
+    """
+    Gets the time steps and grid dimensions of an IWP dataset from its netCDF4
+    files' metadata.  This is substantially cheaper than opening the dataset with
+    open_xarray_dataset() and allows requests against the dataset to be validated
+    before committing to opening it.
+
+    Only each file's header is read and no variable data are accessed.  The grid
+    dimensions are taken from the first file.
+
+    Raises ValueError if dataset_path_pattern does not match any files or if a
+    file does not have a time step attribute.
+
+    Takes 1 argument:
+
+      dataset_path_pattern - Path to the dataset to peek at.  May include '*' for
+                             simple globbing, or specified as a list of paths.  See
+                             open_xarray_dataset() for details.
+
+    Returns 1 value:
+
+      dimensions - Dictionary mapping dimension names to the indices available.
+                   Contains a time step key, "time_step" or "Cycle" depending on
+                   the style of the files, whose value is a sorted list of time
+                   step values, and a key for each of the grid dimensions whose
+                   value is a range of valid indices.
+
+    """
+
+    if type( dataset_path_pattern ) != list:
+        dataset_path_pattern = [dataset_path_pattern]
+
+    # match how xarray.open_mfdataset() expands patterns so that we see the same
+    # files that open_xarray_dataset() would.
+    netcdf_paths = []
+    for path_pattern in dataset_path_pattern:
+        netcdf_paths.extend( sorted( glob.glob( path_pattern ) ) )
+
+    if len( netcdf_paths ) == 0:
+        raise ValueError( "No files matched '{}'.".format(
+            dataset_path_pattern ) )
+
+    dimensions       = {}
+    time_step_name   = None
+    time_step_values = []
+
+    for path_index, netcdf_path in enumerate( netcdf_paths ):
+        with netCDF4.Dataset( netcdf_path, "r" ) as netcdf_file:
+            # each file holds a single time step as an attribute.  new-style
+            # files use "time_step" while old-style files use "Cycle".
+            if "time_step" in netcdf_file.ncattrs():
+                time_step_name = "time_step"
+            elif "Cycle" in netcdf_file.ncattrs():
+                time_step_name = "Cycle"
+            else:
+                raise ValueError( "'{:s}' does not have a time step attribute.".format(
+                    netcdf_path ) )
+
+            time_step_values.append( int( netcdf_file.getncattr( time_step_name ) ) )
+
+            # the grid is the same across time steps, so only look at the
+            # first file.
+            if path_index == 0:
+                for dimension_name, dimension in netcdf_file.dimensions.items():
+                    dimensions[dimension_name] = range( dimension.size )
+
+    dimensions[time_step_name] = sorted( time_step_values )
+
+    return dimensions
@@ -1,8 +1,10 @@
 import collections
 import copy
 import enum
+import heapq
 import json
 import numpy as np
+import os
 
 # module for all things related to labels, IWP or otherwise.
 #
@@ -170,14 +172,7 @@ def sort_iwp_labels( iwp_labels, sort_type, in_place_flag=False ):
     if sort_type == IWPLabelSortType.NONE:
         return iwp_labels
 
-    # create the sort key lambda.
-    if sort_type == IWPLabelSortType.SPATIAL:
-        sort_key = lambda label: (label["z_index"], label["time_step_index"], label["id"])
-    elif sort_type == IWPLabelSortType.TEMPORAL:
-        sort_key = lambda label: (label["time_step_index"], label["z_index"], label["id"])
-    else:
-        raise ValueError( "Unknown IWP label sort type specified! ({})".format(
-            sort_type ) )
+    sort_key = _get_iwp_label_sort_key( sort_type )
 
     # sort the labels.  respect the request for a copy or not.
     if in_place_flag:
@@ -188,6 +183,65 @@ def sort_iwp_labels( iwp_labels, sort_type, in_place_flag=False ):
 
     return sorted_iwp_labels
 
+def merge_sorted_iwp_labels( iwp_labels_lists, sort_type ):
+    """
+    Merges multiple lists of IWP labels, each already sorted according to the
+    ordering requested, into a single sorted list.  This is equivalent to
+    concatenating the lists and sorting the result, including the order of
+    labels that compare equal, without re-sorting everything.
+
+    Takes 2 arguments:
+
+      iwp_labels_lists - Sequence of lists of IWP labels.  Each list must be sorted
+                         by sort_iwp_labels() with sort_type.
+      sort_type        - Enumeration of IWPLabelSortType specifying how labels are
+                         sorted.  If IWPLabelSortType.NONE, the lists are
+                         concatenated.
+
+    Returns 1 value:
+
+      merged_iwp_labels - List of IWP labels.
+
+    """
+
+    if sort_type == IWPLabelSortType.NONE:
+        merged_iwp_labels = []
+        for iwp_labels in iwp_labels_lists:
+            merged_iwp_labels.extend( iwp_labels )
+
+        return merged_iwp_labels
+
+    return list( heapq.merge( *iwp_labels_lists,
+                              key=_get_iwp_label_sort_key( sort_type ) ) )
+
+def _get_iwp_label_sort_key( sort_type ):
+    """
+    Gets a function that computes the sort key of an IWP label for the ordering
+    requested.
+
+    Raises ValueError if an unknown sort type is requested.
+
+    Takes 1 argument:
+
+      sort_type - Enumeration of IWPLabelSortType specifying how labels are sorted.
+                  Must not be IWPLabelSortType.NONE.
+
+    Returns 1 value:
+
+      sort_key - Function that takes an IWP label and returns its sort key.
+
+    """
+
+    if sort_type == IWPLabelSortType.SPATIAL:
+        sort_key = lambda label: (label["z_index"], label["time_step_index"], label["id"])
+    elif sort_type == IWPLabelSortType.TEMPORAL:
+        sort_key = lambda label: (label["time_step_index"], label["z_index"], label["id"])
+    else:
+        raise ValueError( "Unknown IWP label sort type specified! ({})".format(
+            sort_type ) )
+
+    return sort_key
+
 def save_iwp_labels( iwp_labels_path, iwp_labels, pretty_flag=True ):
     """
     Saves IWP labels to a file.
@@ -204,12 +258,33 @@ def save_iwp_labels( iwp_labels_path, iwp_labels, pretty_flag=True ):
 
     """
 
-    with open( iwp_labels_path, "w" ) as iwp_labels_fp:
-        #
-        # NOTE: we sort the dictionary keys so that it is easier to compare
-        #       different labels without custom tools.
-        #
-        json.dump( iwp_labels, iwp_labels_fp, indent=4, sort_keys=True )
+    #
+    # NOTE: we sort the dictionary keys so that it is easier to compare
+    #       different labels without custom tools.
+    #
+    if pretty_flag:
+        with open( iwp_labels_path, "w" ) as iwp_labels_fp:
+            json.dump( iwp_labels, iwp_labels_fp, indent=4, sort_keys=True )
+
+        return
+
+    # compact labels are written with orjson when it is available as it
+    # encodes considerably faster than the standard library's json module.
+    # coordinates computed with NumPy may be NumPy scalars, which orjson
+    # rejects unless they are explicitly enabled.
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        with open( iwp_labels_path, "wb" ) as iwp_labels_fp:
+            iwp_labels_fp.write( orjson.dumps( iwp_labels,
+                                               option=(orjson.OPT_SORT_KEYS |
+                                                       orjson.OPT_SERIALIZE_NUMPY) ) )
+    else:
+        with open( iwp_labels_path, "w" ) as iwp_labels_fp:
+            json.dump( iwp_labels, iwp_labels_fp, separators=(",", ":"), sort_keys=True )
 
     return
 
@@ -227,8 +302,22 @@ def load_iwp_labels( iwp_labels_path ):
 
     """
 
-    with open( iwp_labels_path, "r" ) as iwp_labels_fp:
-        iwp_labels = json.load( iwp_labels_fp )
+    #
+    # NOTE: we prefer orjson as it parses considerably faster than the standard
+    #       library's json module, which matters for large label files that
+    #       are loaded every time a script runs.  it is not required.
+    #
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        with open( iwp_labels_path, "rb" ) as iwp_labels_fp:
+            iwp_labels = orjson.loads( iwp_labels_fp.read() )
+    else:
+        with open( iwp_labels_path, "r" ) as iwp_labels_fp:
+            iwp_labels = json.load( iwp_labels_fp )
 
     # ensure that the slice indices are integral regardless of how they were
     # serialized.
@@ -238,6 +327,50 @@ def load_iwp_labels( iwp_labels_path ):
 
     return iwp_labels
 
+def probe_iwp_labels( iwp_labels_path ):
+    """
+    Cheaply checks whether a file looks like serialized IWP labels without decoding
+    it.  Only a small amount of data at the beginning and end of the file is read
+    so that many files may be checked before committing to loading any of them
+    with load_iwp_labels().
+
+    NOTE: This only checks that the file appears to contain a JSON list of
+          objects.  Files that pass may still fail to load if their contents
+          are malformed.
+
+    Takes 1 argument:
+
+      iwp_labels_path - Path to serialized IWP labels.
+
+    Returns 1 value:
+
+      valid_flag - Boolean indicating whether iwp_labels_path looks like
+                   serialized IWP labels.
+
+    """
+
+    # number of bytes read from each end of the file.  this comfortably covers
+    # any leading or trailing whitespace that pretty printed labels have.
+    PROBE_SIZE = 4096
+
+    try:
+        with open( iwp_labels_path, "rb" ) as iwp_labels_fp:
+            head_bytes = iwp_labels_fp.read( PROBE_SIZE ).lstrip()
+
+            iwp_labels_fp.seek( 0, os.SEEK_END )
+            iwp_labels_fp.seek( max( 0, iwp_labels_fp.tell() - PROBE_SIZE ) )
+
+            tail_bytes = iwp_labels_fp.read().rstrip()
+    except OSError:
+        return False
+
+    # labels are serialized as a list of dictionaries, possibly empty.
+    if not (head_bytes.startswith( b"[" ) and
+            tail_bytes.endswith( b"]" )):
+        return False
+
+    return head_bytes[1:].lstrip()[:1] in (b"{", b"]")
+
 def union_iwp_label( iwp_label_a, iwp_label_b ):
     """
     Creates a new IWP label whose bounding box is the union of two IWP labels.
@@ -578,6 +711,47 @@ def flipud_iwp_label_coordinates( iwp_labels, height, in_place_flag=False ):
 
     return iwp_labels
 
+def flipud_and_normalize_iwp_label_coordinates( iwp_labels, width, height, in_place_flag=False ):
+    """
+    Flips IWP labels' Y coordinate about a midpoint and normalizes their bounding
+    boxes so they are in the range of [0, 1], in a single pass over the labels.
+    This is equivalent to flipud_iwp_label_coordinates() with height followed by
+    normalize_iwp_label_coordinates() with width and height, and produces
+    identical coordinates.
+
+    Takes 4 arguments:
+
+      iwp_labels    - List of IWP labels whose bounding boxes will be flipped and
+                      normalized.
+      width         - Numeric width to normalize the bounding boxes' X coordinates.
+      height        - Numeric height to flip and normalize the bounding boxes' Y
+                      coordinates.
+      in_place_flag - Optional flag specifying in place update or an update to a
+                      copy of the labels.  If omitted, defaults to False and a new
+                      list of IWP labels is returned.
+
+    Returns 1 value:
+
+      iwp_labels - List of flipped and normalized IWP labels.
+
+    """
+
+    if not in_place_flag:
+        iwp_labels = copy.deepcopy( iwp_labels )
+
+    for iwp_label in iwp_labels:
+        bbox = iwp_label["bbox"]
+
+        new_y2 = (height - bbox["y1"]) / height
+        new_y1 = (height - bbox["y2"]) / height
+
+        bbox["x1"] = bbox["x1"] / width
+        bbox["x2"] = bbox["x2"] / width
+        bbox["y1"] = new_y1
+        bbox["y2"] = new_y2
+
+    return iwp_labels
+
 def filter_iwp_labels( iwp_labels, time_range=[], z_range=[], identifiers=[] ):
     """
     Filters a list of IWP labels by time range, XY slice range, or by identifier
@@ -623,6 +797,31 @@ def filter_iwp_labels( iwp_labels, time_range=[], z_range=[], identifiers=[] ):
 
     return filtered_iwp_labels
 
+def group_iwp_labels_by_key( iwp_labels ):
+    """
+    Groups IWP labels by their location within the underlying dataset.  This allows
+    the labels for a specific XY slice to be looked up directly rather than filtering
+    the entire list of labels for each XY slice.
+
+    Takes 1 argument:
+
+      iwp_labels - List of IWP labels to group.
+
+    Returns 1 value:
+
+      iwp_labels_map - Dictionary mapping label keys, as returned by get_iwp_label_key(),
+                       to lists of IWP labels.  Labels within each list are in the
+                       order they were found in iwp_labels.
+
+    """
+
+    iwp_labels_map = {}
+
+    for iwp_label in iwp_labels:
+        iwp_labels_map.setdefault( get_iwp_label_key( iwp_label ), [] ).append( iwp_label )
+
+    return iwp_labels_map
+
 def convert_iwp_bboxes_to_corners( iwp_labels, z_coordinates=None, two_d_flag=False ):
     """
     Converts IWP labels' bounding boxes (upper-left and lower-right corners) to a
@@ -1,5 +1,12 @@
+import concurrent.futures
 import io
+import itertools
+import math
+import matplotlib.pyplot as plt
+import multiprocessing
 import numpy as np
+import queue
+import threading
 
 #
 # NOTE: this imports the python-pptx module, not ourselves...
@@ -217,7 +224,267 @@ def _add_xy_slice_shape_group( slide, xy_slice_position, xy_slice_image, xy_slic
 
     return xy_slice_group
 
-def create_data_review_presentation( iwp_dataset, experiment_name, variable_names, time_xy_slice_pairs, data_limits, color_maps, quantization_table_builders, iwp_labels=[], label_color=None ):
+# parameters for rendering XY slices in a worker process.  set once per worker
+# by _initialize_render_worker() so they aren't serialized for each slide.
+_render_worker_dataset    = None
+_render_worker_parameters = None
+
+def _render_xy_slices( xy_slice_array, variable_names, figure_sizes, xy_grid_extents, data_limits, color_maps, quantization_table_builders, quantization_tables, color_tables ):
+    """
+    Renders each of the variables in a single XY slice into PNG images suitable for
+    a data review slide.  Each image is a Matplotlib figure with a colorbar whose
+    white background is transparent.
+
+    Takes 9 arguments:
+
+      xy_slice_array              - NumPy array, shaped (number_variables, Y, X), containing
+                                    the XY slice to render as returned by
+                                    iwp.data_loader.IWPDataset.get_xy_slice().
+      variable_names              - List of variable names to render.
+      figure_sizes                - List of (width, height) tuples, in inches, specifying
+                                    the figure size of each variable's image.
+      xy_grid_extents             - Sequence of two pairs, ((min_x, max_x), (min_y, max_y)),
+                                    specifying the XY slice's data coordinates.
+      data_limits                 - Dictionary of global statistics.  See
+                                    create_data_review_presentation() for details.  If
+                                    specified as None, statistics are computed from the
+                                    XY slice.
+      color_maps                  - Sequence of Matplotlib color maps, one per variable.
+      quantization_table_builders - Sequence of quantization table builders, one per
+                                    variable.
+      quantization_tables         - Sequence of quantization tables, one per variable,
+                                    built from data_limits.  Entries are None when
+                                    data_limits is None.
+      color_tables                - Sequence of color tables, one per variable, for
+                                    quantization_tables.  Entries are None when
+                                    data_limits is None.
+
+    Returns 1 value:
+
+      xy_slice_renderings - List of tuples, one per variable, containing the following:
+
+                              1. PNG image bytes.
+                              2. Tuple of the XY slice axes' extents, (x0, y0, x1, y1),
+                                 in normalized figure coordinates.
+                              3. Tuple of the figure's size, (width, height), in inches.
+
+    """
+
+    xy_slice_renderings = []
+
+    # compute every variable's local statistics together, one reduction per
+    # statistic, rather than reducing each variable separately.
+    if data_limits is None:
+        local_statistics = np.stack( (xy_slice_array.min( axis=(1, 2) ),
+                                      xy_slice_array.max( axis=(1, 2) ),
+                                      xy_slice_array.std( axis=(1, 2) )),
+                                     axis=1 )
+
+    for variable_index, variable_name in enumerate( variable_names ):
+        color_map                  = color_maps[variable_index]
+        quantization_table_builder = quantization_table_builders[variable_index]
+
+        # get this variable's statistics so we can quantize it properly.
+        if data_limits is not None:
+            # pull our variable's statistics out of the global statistics.
+            variable_statistics = (data_limits[variable_name]["minimum"],
+                                   data_limits[variable_name]["maximum"],
+                                   data_limits[variable_name]["stddev"])
+
+            quantization_table = quantization_tables[variable_index]
+            color_table        = color_tables[variable_index]
+        else:
+            # use our variable's local statistics from the current XY slice.
+            variable_statistics = tuple( local_statistics[variable_index] )
+
+            quantization_table = quantization_table_builder( 256,
+                                                             *variable_statistics )
+
+            # get the colors for each quantization level so the XY slice is
+            # quantized and colorized in one lookup rather than by Matplotlib.
+            color_table = iwp.analysis.build_quantized_color_table( quantization_table,
+                                                                    color_map )
+
+        # compute a scale factor (order of magnitude) for the colorbar
+        # ticks.  all tick labels are of the magnitude computed here.
+        #
+        # NOTE: we choose the floor of the extrema's log10 magnitude to
+        #       favor extremal tick values that are whole number with a
+        #       smaller exponent, rather than a decimal number with a larger
+        #       exponent.  (e.g. +-5 x 10^-2 vs +-.5 x 10^-3).
+        #
+        oom_factor = np.floor( np.log10( np.max( np.abs( variable_statistics[:2] ) ) ) )
+
+        # format our colorbar tick labels to always have our scale factor displayed
+        # and render as "x 10^<exponent>" instead of "1e<exponent>".
+        colorbar_formatter = iwp.analysis.FixedScientificFormatter( oom_factor,
+                                                                    "%1.1f",
+                                                                    offset_flag=True,
+                                                                    math_text_flag=True )
+
+        # render this XY slice to an image.  we use Matplotlib so we get
+        # properly labeled axes and a colorbar, as well as consistency with
+        # other IWP visualization workflows.
+        #
+        # we hang onto the underlying figure handle so we can access the
+        # underlying axes to identify where the XY slice data is relative
+        # to the rendered image.  this enables us to overlay our labels
+        # in the correct location.
+        (xy_slice_image,
+         xy_slice_fig_h) = iwp.rendering.array_to_image_imshow( xy_slice_array[variable_index, :],
+                                                                quantization_table,
+                                                                color_map,
+                                                                figure_size=figure_sizes[variable_index],
+                                                                show_axes_labels_flag=False,
+                                                                grid_extents=xy_grid_extents,
+                                                                colorbar_flag=True,
+                                                                colorbar_formatter=colorbar_formatter,
+                                                                constrained_layout_flag=False,
+                                                                color_table=color_table )
+
+        # set the white background to transparent to work around the fact
+        # that we have wide images that overlap.
+        #
+        # NOTE: this is done to maximize the horizontal real estate on the
+        #       slide but sometime results in a colorbar tick label being
+        #       hidden by the excess horizontal margin on the image to its
+        #       right (in the case of two and three image layouts).
+        #
+        xy_slice_image = iwp.rendering.image_make_white_transparent( xy_slice_image )
+
+        # serialize the image as a PNG.  we favor encoding speed over size since
+        # the presentation is compressed as a whole when it is saved.
+        xy_slice_image_buffer = io.BytesIO()
+        xy_slice_image.save( xy_slice_image_buffer,
+                             format="png",
+                             compress_level=1 )
+
+        # get the XY slice axes and the bounding box of the rendered data,
+        # relative to its parent figure.
+        #
+        # NOTE: the XY slice is the first axes in the figure.  its colorbar
+        #       is second.
+        #
+        # NOTE: axes positions are normalized figure coordinates with an
+        #       origin in the bottom left (!) like so:
+        #
+        #
+        #       axes y=1 ----------------------------------------
+        #
+        #                 (y1, x0)                  (y1, x1)
+        #                     +                         +
+        #
+        #                     +                         +
+        #                 (y0, x0)                  (y0, x0)
+        #
+        #       axes y=0 ----------------------------------------
+        #
+        #       one wants (1-y1, x0) as the offset from the top-left corner
+        #       of the XY slice figure to the top-left corner of the XY
+        #       slice axes.
+        #
+        xy_slice_ax_h      = xy_slice_fig_h.get_axes()[0]
+        xy_slice_axes_bbox = xy_slice_ax_h.get_position()
+
+        xy_slice_renderings.append( (xy_slice_image_buffer.getvalue(),
+                                     tuple( xy_slice_axes_bbox.extents ),
+                                     tuple( xy_slice_fig_h.get_size_inches() )) )
+
+        # we're done with the figure.  release it so we don't accumulate
+        # figures across slides.
+        plt.close( xy_slice_fig_h )
+
+    return xy_slice_renderings
+
+def _initialize_render_worker( iwp_dataset, render_parameters ):
+    """
+    Initializes a worker process for rendering XY slices.  Stashes the dataset and
+    rendering parameters so they are available to _render_xy_slices_worker().
+
+    Takes 2 arguments:
+
+      iwp_dataset       - iwp.data_loader.IWPDataset object containing the XY slices
+                          to render.
+      render_parameters - Dictionary of keyword arguments to supply to
+                          _render_xy_slices().
+
+    Returns nothing.
+
+    """
+
+    global _render_worker_dataset, _render_worker_parameters
+
+    _render_worker_dataset    = iwp_dataset
+    _render_worker_parameters = render_parameters
+
+def _render_xy_slices_worker( time_xy_slice_pairs ):
+    """
+    Renders the XY slices for one or more slides, all from the same time step, in
+    a worker process.  The XY slices are read together so the time step's data
+    are only read once.  See _render_xy_slices() for details.
+
+    Takes 1 argument:
+
+      time_xy_slice_pairs - List of tuples, (time index, XY slice index), specifying
+                            the XY slices to render.  All of the tuples must have
+                            the same time index.
+
+    Returns 1 value:
+
+      slides_xy_slice_renderings - List of renderings, one per time_xy_slice_pairs
+                                   entry.  Each is a list of tuples, one per
+                                   variable.  See _render_xy_slices() for details.
+
+    """
+
+    xy_slice_arrays = _render_worker_dataset.get_xy_slices( time_xy_slice_pairs[0][0],
+                                                            [xy_slice_index for _, xy_slice_index in
+                                                             time_xy_slice_pairs] )
+
+    return [_render_xy_slices( xy_slice_array,
+                               **_render_worker_parameters )
+            for xy_slice_array in xy_slice_arrays]
+
+def _prefetch_xy_slices( iwp_dataset, time_xy_slice_pairs, xy_slice_queue ):
+    """
+    Reads XY slices from a dataset and places them into a queue, in order, so that
+    they're available before they're needed.  Intended to run in a background thread
+    so reading the next XY slice overlaps rendering the current one.
+
+    Consecutive XY slices from the same time step are read together with a single
+    request per variable, so each time step's data are only read once.
+
+    None is placed into the queue once all of the XY slices have been read.  If
+    reading an XY slice fails, the exception raised is placed into the queue instead
+    and no further XY slices are read.
+
+    Takes 3 arguments:
+
+      iwp_dataset         - iwp.data_loader.IWPDataset object to read XY slices from.
+      time_xy_slice_pairs - List of tuples, (time index, XY slice index), specifying
+                            the XY slices to read.
+      xy_slice_queue      - queue.Queue to place the XY slices read into.  Its maximum
+                            size bounds the number of XY slices held in memory.
+
+    Returns nothing.
+
+    """
+
+    try:
+        for time_index, time_pairs in itertools.groupby( time_xy_slice_pairs,
+                                                         key=lambda pair: pair[0] ):
+            xy_slice_indices = [xy_slice_index for _, xy_slice_index in time_pairs]
+
+            for xy_slice_array in iwp_dataset.get_xy_slices( time_index,
+                                                             xy_slice_indices ):
+                xy_slice_queue.put( xy_slice_array )
+    except Exception as e:
+        xy_slice_queue.put( e )
+        return
+
+    xy_slice_queue.put( None )
+
+def create_data_review_presentation( iwp_dataset, experiment_name, variable_names, time_xy_slice_pairs, data_limits, color_maps, quantization_table_builders, iwp_labels=[], label_color=None, number_workers=1 ):
     """
     Creates a Powerpoint presentation containing data review slides for a set of
     XY slices.  One slide per XY slice is generated, with up to three variables of
@@ -228,17 +495,19 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
     Raises ValueError if too few or too many variables are specified.  This prevents
     the generated XY slices from being scaled down so much to be of no use.
 
-    Takes 9 arguments:
+    Takes 10 arguments:
 
       iwp_dataset                 - iwp.data_loader.IWPDataset object containing the XY
-                                    slices to generate review slides for.
+                                    slices to generate review slides for.  This is used
+                                    for every slide, rather than reopened, so its files
+                                    and their chunk caches stay warm throughout.
       experiment_name             - String specifying the experiment that generated the slice.
       variable_names              - List of one, two, or three variable names to generate
                                     review images for.
       time_xy_slice_pairs         - List of tuples, (time index, XY slice index), specifying
                                     the XY slices to generate slides for.
-      data_limits                 - Dictionary of tuples, keys are variable names, keys are
-                                    (minimum, maximum, standard deviation), specifying the
+      data_limits                 - Dictionary of dictionaries, keys are variable names, values
+                                    have "minimum", "maximum", and "stddev" keys, specifying the
                                     global statistics to normalize each XY slice with.  If
                                     specified as None, statistics are computed for each XY
                                     slice independently.
@@ -257,6 +526,10 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
                                     specified) as integral values in the range of [0, 255].
                                     If omitted, defaults to None and selects a high contrast
                                     color.
+      number_workers              - Optional positive integer specifying the number of
+                                    processes to render XY slices with.  Each worker
+                                    reopens iwp_dataset's underlying files.  If omitted,
+                                    defaults to 1 and XY slices are rendered serially.
 
     Returns 1 value:
 
@@ -330,15 +603,7 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
 
     # build a mapping from (time, xy slice) to labels so it is easy to identify
     # the relevant ones when building data review slides.
-    iwp_labels_map = {}
-    for iwp_label in iwp_labels:
-        label_key = iwp.labels.get_iwp_label_key( iwp_label )
-
-        # add this label to its (time, slice) list.
-        if label_key not in iwp_labels_map:
-            iwp_labels_map[label_key] = [iwp_label]
-        else:
-            iwp_labels_map[label_key].append( iwp_label )
+    iwp_labels_map = iwp.labels.group_iwp_labels_by_key( iwp_labels )
 
     # get the dataset's grid coordinates so we can provide descriptive titles
     # and properly labeled axes on XY slice figures.
@@ -352,8 +617,114 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
     xy_grid_extents = (list( x_coordinates[[0, -1]] ),
                        list( y_coordinates[[0, -1]] ))
 
+    # global statistics are the same for every XY slice, so build each
+    # variable's quantization table and level colors once up front rather
+    # than once per slide.  local statistics require them per XY slice.
+    global_quantization_tables = [None] * len( variable_names )
+    global_color_tables        = [None] * len( variable_names )
+
+    if data_limits is not None:
+        for variable_index, variable_name in enumerate( variable_names ):
+            variable_statistics = (data_limits[variable_name]["minimum"],
+                                   data_limits[variable_name]["maximum"],
+                                   data_limits[variable_name]["stddev"])
+
+            global_quantization_tables[variable_index] = quantization_table_builders[variable_index]( 256,
+                                                                                                       *variable_statistics )
+            global_color_tables[variable_index]        = iwp.analysis.build_quantized_color_table( global_quantization_tables[variable_index],
+                                                                                                   color_maps[variable_index] )
+
+    # everything needed to render a slide's XY slices, other than the slice
+    # itself.  these are handed to each worker when rendering in parallel.
+    render_parameters = {
+        "variable_names":              variable_names,
+        "figure_sizes":                [(xy_slice_position[2].inches,
+                                         xy_slice_position[3].inches)
+                                        for xy_slice_position in xy_slice_positions],
+        "xy_grid_extents":             xy_grid_extents,
+        "data_limits":                 data_limits,
+        "color_maps":                  color_maps,
+        "quantization_table_builders": quantization_table_builders,
+        "quantization_tables":         global_quantization_tables,
+        "color_tables":                global_color_tables
+    }
+
+    # render each of the slides' XY slices.  the slides are independent of each
+    # other so they may be rendered in parallel, though they're assembled into
+    # the presentation in the order requested regardless.
+    #
+    # render the XY slices grouped by time step, and in order within a time
+    # step, so each time step's file is read while it is hot in the page cache
+    # rather than bouncing between files in whatever order the slides were
+    # requested.  XY slices requested multiple times are only rendered once
+    # since their quantization tables, colors, and images are identical.
+    render_pairs   = sorted( set( map( tuple, time_xy_slice_pairs ) ) )
+    number_workers = min( number_workers, len( render_pairs ) )
+
+    if number_workers > 1:
+        # hand each worker a batch of slides from a single time step so it
+        # reads the time step's XY slices together.  large time steps are split
+        # so that there is enough work to keep every worker busy.
+        maximum_batch_size = math.ceil( len( render_pairs ) / number_workers )
+
+        render_batches = []
+        for _, time_pairs in itertools.groupby( render_pairs,
+                                                key=lambda pair: pair[0] ):
+            time_pairs = list( time_pairs )
+
+            for batch_start in range( 0, len( time_pairs ), maximum_batch_size ):
+                render_batches.append( time_pairs[batch_start:batch_start + maximum_batch_size] )
+
+        #
+        # NOTE: each worker gets its own copy of the dataset, which reopens the
+        #       underlying netCDF4 files, since file handles cannot be shared
+        #       across processes.
+        #
+        mp_context = multiprocessing.get_context( method="spawn" )
+        with concurrent.futures.ProcessPoolExecutor( max_workers=number_workers,
+                                                     mp_context=mp_context,
+                                                     initializer=_initialize_render_worker,
+                                                     initargs=(iwp_dataset,
+                                                               render_parameters) ) as executor:
+            ordered_xy_slice_renderings = list( itertools.chain.from_iterable(
+                executor.map( _render_xy_slices_worker,
+                              render_batches ) ) )
+    else:
+        # read the next XY slices in the background while rendering the current
+        # one.  netCDF4 releases the GIL while reading so this overlaps I/O with
+        # rendering.  slices are read a time step at a time, and we only queue
+        # a couple of slices ahead to bound our memory footprint.
+        xy_slice_queue    = queue.Queue( maxsize=2 )
+        prefetch_thread_h = threading.Thread( target=_prefetch_xy_slices,
+                                              args=(iwp_dataset,
+                                                    render_pairs,
+                                                    xy_slice_queue),
+                                              daemon=True )
+        prefetch_thread_h.start()
+
+        ordered_xy_slice_renderings = []
+        while True:
+            xy_slice_array = xy_slice_queue.get()
+
+            if xy_slice_array is None:
+                break
+            elif isinstance( xy_slice_array, Exception ):
+                raise xy_slice_array
+
+            ordered_xy_slice_renderings.append( _render_xy_slices( xy_slice_array,
+                                                                   **render_parameters ) )
+
+        prefetch_thread_h.join()
+
+    # put the renderings back into the order the slides were requested.
+    xy_slice_renderings_map    = dict( zip( render_pairs,
+                                            ordered_xy_slice_renderings ) )
+    slides_xy_slice_renderings = [xy_slice_renderings_map[tuple( time_xy_slice_pair )]
+                                  for time_xy_slice_pair in time_xy_slice_pairs]
+
     # iterate through each of the requested XY slices and make a slide for it.
-    for time_index, xy_slice_index in time_xy_slice_pairs:
+    for (time_index, xy_slice_index), xy_slice_renderings in zip( time_xy_slice_pairs,
+                                                                  slides_xy_slice_renderings ):
         current_slide = presentation.slides.add_slide( blank_slide_layout )
 
         # set the title.
@@ -364,10 +735,6 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
             xy_slice_index,
             time_index )
 
-        # pull the data for this XY slice.
-        xy_slice_array = iwp_dataset.get_xy_slice( time_index,
-                                                   xy_slice_index )
-
         # construct a label key so we can lookup the labels associated with
         # this XY slice.
         label_key = (time_index, xy_slice_index)
@@ -378,105 +745,9 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
         # centered, big images for a single variable vs smaller, multi-column
         # layouts for multiple variables).
         for variable_index, variable_name in enumerate( variable_names ):
-            color_map                  = color_maps[variable_index]
-            quantization_table_builder = quantization_table_builders[variable_index]
-
-            # get this variable's statistics so we can quantize it properly.
-            if data_limits is not None:
-                # pull our variable's statistics out of the global statistics.
-                variable_statistics = (data_limits[variable_name]["minimum"],
-                                       data_limits[variable_name]["maximum"],
-                                       data_limits[variable_name]["standard_deviation"])
-            else:
-                # compute our variable's local statistics from the current XY
-                # slice.
-                variable_statistics = (xy_slice_array[variable_index, :].min(),
-                                       xy_slice_array[variable_index, :].max(),
-                                       xy_slice_array[variable_index, :].std())
-
-            quantization_table = quantization_table_builder( 256,
-                                                             *variable_statistics )
-
-            # compute a scale factor (order of magnitude) for the colorbar
-            # ticks.  all tick labels are of the magnitude computed here.
-            #
-            # NOTE: we choose the floor of the extrema's log10 magnitude to
-            #       favor extremal tick values that are whole number with a
-            #       smaller exponent, rather than a decimal number with a larger
-            #       exponent.  (e.g. +-5 x 10^-2 vs +-.5 x 10^-3).
-            #
-            oom_factor = np.floor( np.log10( np.max( np.abs( variable_statistics[:2] ) ) ) )
-
-            # format our colorbar tick labels to always have our scale factor displayed
-            # and render as "x 10^<exponent>" instead of "1e<exponent>".
-            colorbar_formatter = iwp.analysis.FixedScientificFormatter( oom_factor,
-                                                                        "%1.1f",
-                                                                        offset_flag=True,
-                                                                        math_text_flag=True )
-
-            # render this XY slice to an image.  we use Matplotlib so we get
-            # properly labeled axes and a colorbar, as well as consistency with
-            # other IWP visualization workflows.
-            #
-            # we hang onto the underlying figure handle so we can access the
-            # underlying axes to identify where the XY slice data is relative
-            # to the rendered image.  this enables us to overlay our labels
-            # in the correct location.
-            (xy_slice_image,
-             xy_slice_fig_h) = iwp.rendering.array_to_image_imshow( xy_slice_array[variable_index, :],
-                                                                    quantization_table,
-                                                                    color_map,
-                                                                    figure_size=(xy_slice_positions[variable_index][2].inches,
-                                                                                 xy_slice_positions[variable_index][3].inches),
-                                                                    show_axes_labels_flag=False,
-                                                                    grid_extents=xy_grid_extents,
-                                                                    colorbar_flag=True,
-                                                                    colorbar_formatter=colorbar_formatter,
-                                                                    constrained_layout_flag=False )
-
-            # set the white background to transparent to work around the fact
-            # that we have wide images that overlap.
-            #
-            # NOTE: this is done to maximize the horizontal real estate on the
-            #       slide but sometime results in a colorbar tick label being
-            #       hidden by the excess horizontal margin on the image to its
-            #       right (in the case of two and three image layouts).
-            #
-            xy_slice_image = iwp.rendering.image_make_white_transparent( xy_slice_image )
-
-            xy_slice_image_buffer = io.BytesIO()
-            xy_slice_image.save( xy_slice_image_buffer, format="png" )
-
-            # get the figure's size so we can properly scale it and position
-            # pptx labels onto it.
-            xy_slice_figure_size = xy_slice_fig_h.get_size_inches()
-
-            # get the XY slice axes and the bounding box of the rendered data,
-            # relative to its parent figure.
-            #
-            # NOTE: the XY slice is the first axes in the figure.  its colorbar
-            #       is second.
-            #
-            # NOTE: axes positions are normalized figure coordinates with an
-            #       origin in the bottom left (!) like so:
-            #
-            #
-            #       axes y=1 ----------------------------------------
-            #
-            #                 (y1, x0)                  (y1, x1)
-            #                     +                         +
-            #
-            #                     +                         +
-            #                 (y0, x0)                  (y0, x0)
-            #
-            #       axes y=0 ----------------------------------------
-            #
-            #       one wants (1-y1, x0) as the offset from the top-left corner
-            #       of the XY slice figure to the top-left corner of the XY
-            #       slice axes.
-            #
-            xy_slice_ax_h      = xy_slice_fig_h.get_axes()[0]
-            xy_slice_axes_bbox = xy_slice_ax_h.get_position()
+            (xy_slice_image_bytes,
+             xy_slice_axes_bbox,
+             xy_slice_figure_size) = xy_slice_renderings[variable_index]
 
             # compute offsets within the rendered figure to the XY slice data
             # itself.  we need this so we can correctly position label boxes
@@ -485,15 +756,15 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
             # NOTE: mind the implicit flip up/down that accounts for the
             #       axes coordinate system not matching pptx's.
             #
-            xy_slice_axes_offset_x = pptx.util.Inches( xy_slice_axes_bbox.x0 *
+            xy_slice_axes_offset_x = pptx.util.Inches( xy_slice_axes_bbox[0] *
                                                        xy_slice_figure_size[0] )
-            xy_slice_axes_offset_y = pptx.util.Inches( (1 - xy_slice_axes_bbox.y1) *
+            xy_slice_axes_offset_y = pptx.util.Inches( (1 - xy_slice_axes_bbox[3]) *
                                                        xy_slice_figure_size[1] )
 
             # compute the size of the XY slice data within the rendered figure.
-            xy_slice_axes_width  = pptx.util.Inches( xy_slice_axes_bbox.width *
+            xy_slice_axes_width  = pptx.util.Inches( (xy_slice_axes_bbox[2] - xy_slice_axes_bbox[0]) *
                                                      xy_slice_figure_size[0] )
-            xy_slice_axes_height = pptx.util.Inches( xy_slice_axes_bbox.height *
+            xy_slice_axes_height = pptx.util.Inches( (xy_slice_axes_bbox[3] - xy_slice_axes_bbox[1]) *
                                                      xy_slice_figure_size[1] )
 
             # add this XY slice to the slide in a group.  only generate the
@@ -501,7 +772,7 @@ def create_data_review_presentation( iwp_dataset, experiment_name, variable_name
             # horizontal space and avoid clutter.
             _add_xy_slice_shape_group( current_slide,
                                        xy_slice_positions[variable_index],
-                                       xy_slice_image_buffer,
+                                       io.BytesIO( xy_slice_image_bytes ),
                                        (xy_slice_axes_offset_x,
                                         xy_slice_axes_offset_y,
                                         xy_slice_axes_width,
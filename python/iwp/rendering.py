@@ -43,13 +43,59 @@ def image_make_white_transparent( pil_image ):
     # return a new RGBA PIL image.
     return PIL.Image.fromarray( image_data )
 
-def array_to_pixels( array, quantization_table, color_map, scaler=1 ):
+def build_pixels_table( number_levels, color_map, scaler=1 ):
+    """
+    Builds a lookup table of uint8 pixels for each quantization level.  Indexing
+    the table with quantized data is equivalent to scaling the data, applying the
+    color map, and converting to uint8.
+
+    The table only depends on the number of levels and the color map, so callers
+    converting many arrays with equally sized quantization tables may build it
+    once and supply it to array_to_pixels().
+
+    Takes 3 arguments:
+
+      number_levels - Number of quantization levels in the table.  This is one
+                      more than the length of the quantization table as NumPy's
+                      digitize() maps data into [0, len( quantization_table )].
+      color_map     - Matplotlib color map to apply.
+      scaler        - Optional scalar floating point to scale the quantization
+                      levels before color_map is applied.  If omitted, defaults
+                      to 1.0 so that the levels are used as is.
+
+    Returns 1 value:
+
+      pixels_table - NumPy uint8 array, shaped (number_levels,) when color_map is
+                     an identity function and (number_levels, 4) otherwise.
+
+    """
+
+    # build the pixels for each of the quantization levels.  we follow the same
+    # steps that would be applied to each element so that the lookup table is
+    # identical to colorizing the quantized data directly.
+    quantization_levels = np.arange( number_levels,
+                                     dtype=np.float32 )
+
+    # scale the levels so they use more of the pixels' available range.
+    if scaler > 1:
+        quantization_levels = quantization_levels * np.float32( scaler )
+
+    # map into [0, 1] to apply the colormap, then back to [0, 255] before
+    # casting to uint8.
+    return np.uint8( color_map( quantization_levels / 255.0 ) * 255.0 )
+
+def array_to_pixels( array, quantization_table, color_map, scaler=1, pixels=None, pixels_table=None ):
     """
     Quantizes a NumPy array of data, applies a color map, and converts the result to
     uint8.  The intermediate quantized data may optionally be scaled to better use
     the 8-bit range.
 
-    Takes 4 arguments:
+    The color map is only evaluated once per quantization level to build a lookup
+    table of pixels which is then indexed by the quantized data.  Callers converting
+    many arrays of the same shape may supply a pixels buffer to write into so that
+    a new output array is not allocated each call.
+
+    Takes 6 arguments:
 
       array              - NumPy array of data to convert to pixels.  The data type
                            must be compatible with NumPy's digitize() function.
@@ -59,31 +105,42 @@ def array_to_pixels( array, quantization_table, color_map, scaler=1 ):
       scaler             - Optional scalar floating point to scale the quantized data
                            before color_map is applied.  If omitted, defaults to 1.0
                            so that the quantized data are used as is.
+      pixels             - Optional NumPy uint8 array to write the pixels into.  Must
+                           have the shape of the returned data_pixels (see below).  If
+                           omitted, defaults to None and a new array is allocated.
+      pixels_table       - Optional lookup table of pixels, as returned by
+                           build_pixels_table(), for len( quantization_table ) + 1
+                           levels.  Must have been built with color_map and scaler.
+                           If omitted, defaults to None and the table is built.
 
     Returns 1 value:
 
       data_pixels - NumPy array of colored, quantized, uint8 pixels corresponding to array.
                     Retains the same shape as array when color_map is an identity function,
                     otherwise adds a new inner dimension of length 4 to represent the
-                    RGBA channels.
+                    RGBA channels.  This is pixels when it was supplied.
 
     """
 
-    # quantize the data.  this generates int64's by default.
+    # quantize the data.  this generates int64's in [0, len( quantization_table )].
     data_slice = np.digitize( array,
-                              quantization_table ).astype( np.float32 )
+                              quantization_table )
 
-    # scale the data so it uses more of the pixels' available range.
-    if scaler > 1:
-        data_slice = data_slice * np.float32( scaler )
+    if pixels_table is None:
+        pixels_table = build_pixels_table( len( quantization_table ) + 1,
+                                           color_map,
+                                           scaler )
 
-    # map into [0, 1] to apply the colormap, then back to [0, 255] before
-    # casting to uint8.
-    data_pixels = np.uint8( color_map( data_slice / 255.0 ) * 255.0 )
+    # colorize the quantized data.  this writes directly into the caller's
+    # buffer when one was supplied.
+    data_pixels = np.take( pixels_table,
+                           data_slice,
+                           axis=0,
+                           out=pixels )
 
     return data_pixels
 
-def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], label_color=None, indexing_type="ij", title_text="", **kwargs ):
+def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], label_color=None, indexing_type="ij", title_text="", pixels_buffer=None, pixels_table=None, **kwargs ):
     """
     Converts a NumPy array to a PIL Image, and optionally burns in a title to
     the top of the image.  The supplied array is quantized and colorized prior
@@ -91,7 +148,7 @@ def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], lab
 
     Raises ValueError if the requested indexing method is unknown.
 
-    Takes 8 arguments:
+    Takes 10 arguments:
 
       array              - NumPy array of data to convert to pixels.  The data type
                            must be compatible with NumPy's digitize() function.
@@ -112,6 +169,18 @@ def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], lab
                            "ij" to match IWP visualization conventions.
       title_text         - Optional title string to burn into the generated image.
                            If omitted, the image is created without alteration.
+      pixels_buffer      - Optional NumPy uint8 array, of shape array.shape + (4,), to
+                           colorize array into.  Allows callers rendering many arrays
+                           to reuse a single buffer.  If omitted, defaults to None
+                           and a new buffer is allocated.
+
+                           NOTE: The returned image may reference pixels_buffer's
+                                 memory, so the buffer should not be reused until
+                                 the image is no longer needed.
+
+      pixels_table       - Optional lookup table of pixels for quantization_table and
+                           color_map.  See array_to_pixels() for details.  If omitted,
+                           defaults to None and the table is built for array.
       kwargs             - Optional keyword arguments dictionary.  Accepted for
                            compatibility with array_to_image()'s calling convention.
 
@@ -135,7 +204,9 @@ def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], lab
     #
     pixels = array_to_pixels( array,
                               quantization_table,
-                              color_map )
+                              color_map,
+                              pixels=pixels_buffer,
+                              pixels_table=pixels_table )
 
     # render the image into a 4-byte per pixel image.  once loaded, we're using
     # an XY coordinate system to be consistent with PIL.
@@ -217,14 +288,14 @@ def array_to_image_PIL( array, quantization_table, color_map, iwp_labels=[], lab
 
     return image
 
-def array_to_image_imshow( array, quantization_table, color_map, title_text="", show_axes_labels_flag=True, iwp_labels=[], label_color=None, figure_size=None, colorbar_flag=True, grid_extents=None, indexing_type="ij", constrained_layout_flag=True, colorbar_formatter=None, **kwargs ):
+def array_to_image_imshow( array, quantization_table, color_map, title_text="", show_axes_labels_flag=True, iwp_labels=[], label_color=None, figure_size=None, colorbar_flag=True, grid_extents=None, indexing_type="ij", constrained_layout_flag=True, colorbar_formatter=None, color_table=None, **kwargs ):
     """
     Takes a NumPy array and creates a Matplotlib figure decorated with title,
     axes labels, and a colorbar.  The array specified is quantized and colorized
     prior to rendering with imshow().  The resulting figure is converted into a
     PIL image.
 
-    Takes 13 arguments:
+    Takes 14 arguments:
 
       array                   - NumPy array of data to convert to pixels.  The data
                                 type must be compatible with NumPy's digitize()
@@ -280,6 +351,11 @@ def array_to_image_imshow( array, quantization_table, color_map, title_text="",
                                 effect when colorbar_flag is False.  If omitted,
                                 defaults to None and uses the default colorbar tick
                                 label formatting.
+      color_table             - Optional NumPy array of RGBA pixels for each of
+                                quantization_table's levels.  See
+                                iwp.analysis.build_quantized_color_table() for
+                                details.  If omitted, defaults to None and Matplotlib
+                                colorizes array.
       kwargs                  - Optional keyword arguments dictionary.  Accepted for
                                 compatibility with array_to_image()'s calling
                                 convention.
@@ -343,7 +419,8 @@ def array_to_image_imshow( array, quantization_table, color_map, title_text="",
                                         iwp_labels=iwp_labels,
                                         label_color=label_color,
                                         colorbar_flag=colorbar_flag,
-                                        colorbar_formatter=colorbar_formatter )
+                                        colorbar_formatter=colorbar_formatter,
+                                        color_table=color_table )
 
         # attempt to label our axes correctly.  grid extents specify we have
         # data coordinates, so we're either in meters or dimensionless units
@@ -636,6 +713,31 @@ def da_write_xy_slice_images( da, output_root, experiment_name, xy_slice_indices
     # location.
     local_kwargs = copy.copy( kwargs )
 
+    # group the labels by their location so each XY slice's labels are looked
+    # up directly rather than filtering all of the labels for every slice.
+    iwp_labels_map = iwp.labels.group_iwp_labels_by_key( kwargs.get( "iwp_labels", [] ) )
+
+    # XY slices rendered directly are colorized into a single buffer that is
+    # reused for each slice, rather than allocating a new one per slice.  each
+    # image is written to disk before the next slice is rendered so the buffer
+    # is free to be overwritten.
+    #
+    # the colorized quantization levels only depend on the color map and the
+    # size of the quantization table, so they're computed once rather than for
+    # each slice.
+    #
+    # figures are colorized in a single lookup with the colors of each
+    # quantization level, rather than by Matplotlib.  these depend on the
+    # quantization table so they're computed once when it is.
+    if not kwargs.get( "render_figure_flag", False ):
+        local_kwargs["pixels_buffer"] = np.empty( da.shape[2:] + (4,),
+                                                  dtype=np.uint8 )
+        local_kwargs["pixels_table"]  = build_pixels_table( number_table_entries + 1,
+                                                            color_map )
+    elif data_limits is not None:
+        local_kwargs["color_table"] = iwp.analysis.build_quantized_color_table( quantization_table,
+                                                                                color_map )
+
     # walk through slices in this data array and create an image for each.
     #
     # NOTE: we may be operating on a subset of a larger volume so the Z indices
@@ -678,13 +780,15 @@ def da_write_xy_slice_images( da, output_root, experiment_name, xy_slice_indices
             quantization_table = quantization_table_builder( number_table_entries,
                                                              *local_data_limits )
 
-        # filter labels down to just this XY slice so we don't see *every* label
+            if kwargs.get( "render_figure_flag", False ):
+                local_kwargs["color_table"] = iwp.analysis.build_quantized_color_table( quantization_table,
+                                                                                        color_map )
+
+        # get the labels for just this XY slice so we don't see *every* label
         # on this rendering.
-        local_kwargs["iwp_labels"] = iwp.labels.filter_iwp_labels( kwargs.get( "iwp_labels", [] ),
-                                                                   time_range=[time_step_value,
-                                                                               time_step_value],
-                                                                   z_range=[xy_slice_indices[z_index],
-                                                                            xy_slice_indices[z_index]] )
+        local_kwargs["iwp_labels"] = iwp_labels_map.get( (time_step_value,
+                                                          xy_slice_indices[z_index]),
+                                                         [] )
 
         # image this slice.
         da_write_single_xy_slice_image( da[0, z_index, :],
@@ -243,20 +243,54 @@ def build_slice_url( url_prefix, slice_path, number_components=0 ):
         url_prefix,
          "/".join( path_components[number_components:] ) )
 
-def build_scalabel_frames( experiment_name,
-                           variables_list,
-                           time_range,
-                           xy_slice_range,
-                           data_root,
-                           data_suffix,
-                           url_prefix,
-                           component_count,
-                           labeling_strategy=LabelingStrategyType.NO_ORDER,
-                           check_data_flag=False ):
+def _slice_path_exists( slice_path, directory_entries ):
     """
-    Builds a sequence of minimal, Scalabel frames according to the slice metadata provided.
-    Serializing the generated frames is sufficient for an Items list to start a new Scalabel.ai
-    video labeling project.
+    Determines whether a slice's path exists by looking it up in a listing of its
+    parent directory.  Directories are listed at most once and their contents
+    are cached for subsequent lookups.
+
+    Takes 2 arguments:
+
+      slice_path        - Path to the slice to check.
+      directory_entries - Dictionary mapping directory paths to sets of entry names
+                          within them.  Updated in place when slice_path's parent
+                          has not been listed yet.
+
+    Returns 1 value:
+
+      exists_flag - Boolean indicating whether slice_path exists.
+
+    """
+
+    parent_path, slice_name = os.path.split( slice_path )
+
+    if parent_path not in directory_entries:
+        # directories that are missing or unreadable contain nothing we can
+        # label.
+        try:
+            with os.scandir( parent_path or "." ) as entries:
+                directory_entries[parent_path] = {entry.name for entry in entries}
+        except OSError:
+            directory_entries[parent_path] = set()
+
+    return slice_name in directory_entries[parent_path]
+
+def iterate_scalabel_frames( experiment_name,
+                             variables_list,
+                             time_range,
+                             xy_slice_range,
+                             data_root,
+                             data_suffix,
+                             url_prefix,
+                             component_count,
+                             labeling_strategy=LabelingStrategyType.NO_ORDER,
+                             check_data_flag=False ):
+    """
+    Generates a sequence of minimal, Scalabel frames according to the slice metadata
+    provided.  Frames are yielded one at a time so that large playlists may be
+    serialized without holding every frame in memory.  Serializing the generated
+    frames is sufficient for an Items list to start a new Scalabel.ai video labeling
+    project.
 
     Frames are constructed in (Z, time, variable) order in the generated structure
     though are sorted by Scalabel.ai when loaded.  The labeling order within the
@@ -307,12 +341,38 @@ def build_scalabel_frames( experiment_name,
 
     Returns 1 value:
 
-      scalabel_frames - List of Scalabel frames created.
+      scalabel_frames - Generator of Scalabel frames.  Each frame is created as
+                        the generator is advanced.
 
     """
 
-    # list of Scalabel frames.
-    scalabel_frames = []
+    # map from directory path to the set of entry names within it.  each
+    # variable's slices live in a single directory, so listing it once
+    # replaces a stat() per frame with a set lookup.
+    directory_entries = {}
+
+    # map from variable name to the length of its slices' directory path and
+    # the URL of that directory.  a variable's slices only differ in their file
+    # names within a single directory, so the (comparatively expensive) path
+    # component stripping needed for URLs is done once per variable.
+    #
+    # NOTE: stripping components from the slice's directory, with a trailing
+    #       slash, yields the same URL prefix that build_slice_url() generates
+    #       for each slice within it.
+    #
+    variable_urls = {}
+    for variable_name in variables_list:
+        slice_directory = build_slice_path( data_root,
+                                            data_suffix,
+                                            experiment_name,
+                                            variable_name,
+                                            0,
+                                            0 ).rsplit( "/", 1 )[0] + "/"
+
+        variable_urls[variable_name] = (len( slice_directory ),
+                                        build_slice_url( url_prefix,
+                                                         slice_directory,
+                                                         component_count ))
 
     # walk through each XY slice one at a time, visiting each time step in
     # sequence before moving to the next slice.  each variable is visited in
@@ -348,12 +408,12 @@ def build_scalabel_frames( experiment_name,
                                                time_index,
                                                xy_slice_index )
 
-                # build the URL to the slice within the Scalabel application.
-                slice_url  = build_slice_url( url_prefix,
-                                              slice_path,
-                                              component_count )
+                # build the URL to the slice within the Scalabel application
+                # by appending its file name to the variable's URL.
+                directory_length, directory_url = variable_urls[variable_name]
+                slice_url  = directory_url + slice_path[directory_length:]
 
-                if check_data_flag and not os.path.exists( slice_path ):
+                if check_data_flag and not _slice_path_exists( slice_path, directory_entries ):
                     raise FileNotFoundError( "Scalabel frame's datum does not exist! "
                                              "({:s}, {:s}, {:s}, (T={:d}, Z={:d}))".format(
                                                  slice_path,
@@ -370,9 +430,65 @@ def build_scalabel_frames( experiment_name,
                     "videoName":  video_name
                 }
 
-                scalabel_frames.append( scalabel_frame )
+                yield scalabel_frame
 
-    return scalabel_frames
+def build_scalabel_frames( experiment_name,
+                           variables_list,
+                           time_range,
+                           xy_slice_range,
+                           data_root,
+                           data_suffix,
+                           url_prefix,
+                           component_count,
+                           labeling_strategy=LabelingStrategyType.NO_ORDER,
+                           check_data_flag=False ):
+    """
+    Builds a sequence of minimal, Scalabel frames according to the slice metadata provided.
+    Serializing the generated frames is sufficient for an Items list to start a new Scalabel.ai
+    video labeling project.
+
+    This is a convenience wrapper around iterate_scalabel_frames() that materializes
+    every frame.  See iterate_scalabel_frames() for details on frame order, naming,
+    and labeling strategies.
+
+    Raises FileNotFoundError if a datum associated with a generated frame does not
+    exist and the caller requested verification.
+
+    Takes 10 arguments:
+
+      experiment_name   - Name of the experiment that generated the underlying frame
+                          data.
+      variables_list    - Sequence of variables to build frames for.
+      time_range        - Sequence of time step indices to build frames for.
+      xy_slice_range    - Sequence of XY slice indices to build frames for.
+      data_root         - Path root to the slice's on-disk storage.
+      data_suffix       - Path suffix to the slice's on-disk storage.
+      url_prefix        - URL prefix to use for each frame's URL.
+      component_count   - Number of components to strip off of the computed slice
+                          path when building the frame's URL.
+      labeling_strategy - Optional enumeration of type iwp.labels.scalabel.LabelingStrategyType
+                          that controls the sort order generated frames.
+      check_data_flag   - Optional boolean specifying whether individual frames datum's
+                          will be checked for existence.  If True and the underlying
+                          datum does not exist, FileNotFoundError is raised.  If
+                          omitted, defaults to False.
+
+    Returns 1 value:
+
+      scalabel_frames - List of Scalabel frames created.
+
+    """
+
+    return list( iterate_scalabel_frames( experiment_name,
+                                          variables_list,
+                                          time_range,
+                                          xy_slice_range,
+                                          data_root,
+                                          data_suffix,
+                                          url_prefix,
+                                          component_count,
+                                          labeling_strategy=labeling_strategy,
+                                          check_data_flag=check_data_flag ) )
 
 def get_scalabel_frame_key( scalabel_frame ):
     """
@@ -454,30 +570,25 @@ def extract_iwp_labels_from_frames( scalabel_frames, category_filter=[] ):
 
     return iwp_labels
 
-def set_iwp_labels( scalabel_frames, iwp_labels=[] ):
+def _build_iwp_labels_map( iwp_labels ):
     """
-    Replaces the labels in the Scalabel frames with those found in the supplied IWP
-    labels path.  A copy of the frames is made so the originals are unaltered.
+    Indexes IWP labels by their location within the dataset so that all of the
+    labels for a given Scalabel frame can be found with a single lookup.
 
-    Takes 2 arguments:
+    Raises ValueError if the supplied IWP labels contain a duplicate label.
 
-      scalabel_frames - List of Scalabel frames.  Each frame is a dictionary describing
-                        a single frame within a dataset.
-      iwp_labels      - Optional list of IWP labels to set in scalabel_frames.  If
-                        omitted, defaults to an empty list.
+    Takes 1 argument:
+
+      iwp_labels - List of IWP labels to index.
 
     Returns 1 value:
 
-      scalabel_frames - Updated list of Scalabel frames.  Each frame's labels are set
-                        to those found in iwp_labels.
+      labels_map - Dictionary mapping (time step, slice index) to a dictionary
+                   containing an identifier ("id") and a list of IWP labels
+                   ("labels").
 
     """
 
-    #
-    # NOTE: we make a deep copy of the frames so we can modify them in place.
-    #
-    scalabel_frames = copy.deepcopy( scalabel_frames )
-
     # map from (time step, slice index) to a dictionary containing an identifier
     # ("id") and a list of IWP labels ("labels").  this allows flattening of IWP
     # labels which simplifies finding all labels for a given slice.
@@ -515,20 +626,195 @@ def set_iwp_labels( scalabel_frames, iwp_labels=[] ):
             # another to it.
             labels_map[label_key]["labels"].append( iwp_label )
 
+    return labels_map
+
+def _set_frame_iwp_labels( scalabel_frame, labels_map ):
+    """
+    Replaces a Scalabel frame's labels, in place, with the IWP labels indexed for
+    its location.
+
+    Takes 2 arguments:
+
+      scalabel_frame - Scalabel frame to update.
+      labels_map     - Dictionary of IWP labels as returned by _build_iwp_labels_map().
+
+    Returns nothing.
+
+    """
+
+    # get the key for IWP labels associated with this frame.
+    frame_key = get_scalabel_frame_key( scalabel_frame )
+
+    # replace the frame's existing labels so it only contains the IWP
+    # frames supplied.
+    if frame_key not in labels_map:
+        scalabel_frame["labels"] = []
+    else:
+        scalabel_frame["labels"] = iwp.labels.convert_labels_iwp_to_scalabel( labels_map[frame_key]["labels"] )
+
+def set_iwp_labels( scalabel_frames, iwp_labels=[] ):
+    """
+    Replaces the labels in the Scalabel frames with those found in the supplied IWP
+    labels path.  A copy of the frames is made so the originals are unaltered.
+
+    Takes 2 arguments:
+
+      scalabel_frames - List of Scalabel frames.  Each frame is a dictionary describing
+                        a single frame within a dataset.
+      iwp_labels      - Optional list of IWP labels to set in scalabel_frames.  If
+                        omitted, defaults to an empty list.
+
+    Returns 1 value:
+
+      scalabel_frames - Updated list of Scalabel frames.  Each frame's labels are set
+                        to those found in iwp_labels.
+
+    """
+
+    #
+    # NOTE: we make a deep copy of the frames so we can modify them in place.
+    #
+    scalabel_frames = copy.deepcopy( scalabel_frames )
+
+    labels_map = _build_iwp_labels_map( iwp_labels )
+
     # walk through the frames and add the all of the IWP labels associated.
     for scalabel_frame in scalabel_frames:
+        _set_frame_iwp_labels( scalabel_frame, labels_map )
 
-        # get the key for IWP labels associated with this frame.
-        frame_key = get_scalabel_frame_key( scalabel_frame )
+    return scalabel_frames
+
+def iterate_iwp_labeled_frames( scalabel_frames, iwp_labels=[] ):
+    """
+    Generator counterpart to set_iwp_labels().  Replaces the labels of each Scalabel
+    frame with those found in the supplied IWP labels as the frames are consumed,
+    allowing frames to be labeled without materializing the entire sequence.
 
-        # replace the frame's existing labels so it only contains the IWP
-        # frames supplied.
-        if frame_key not in labels_map:
-            scalabel_frame["labels"] = []
+    NOTE: Frames are updated in place rather than copied.  This is intended for
+          freshly generated frames, such as those from iterate_scalabel_frames().
+          Frames at the same location (e.g. one per variable) share their
+          Scalabel labels rather than each receiving a copy.
+
+    Raises ValueError if the supplied IWP labels contain a duplicate label.  This
+    is detected before any frame is yielded.
+
+    Takes 2 arguments:
+
+      scalabel_frames - Iterable of Scalabel frames.  Each frame is a dictionary
+                        describing a single frame within a dataset.
+      iwp_labels      - Optional list of IWP labels to set in scalabel_frames.  If
+                        omitted, defaults to an empty list.
+
+    Returns 1 value:
+
+      scalabel_frames - Generator of Scalabel frames whose labels are set to those
+                        found in iwp_labels.
+
+    """
+
+    # index the labels up front so malformed labels are reported before the
+    # caller has consumed, and potentially serialized, any frames.
+    labels_map = _build_iwp_labels_map( iwp_labels )
+
+    # map from (time step, slice index) to the Scalabel labels converted from
+    # that location's IWP labels.  conversion happens once per location rather
+    # than once per frame.
+    scalabel_labels_map = {}
+
+    def _label_frames():
+        for scalabel_frame in scalabel_frames:
+
+            frame_key = get_scalabel_frame_key( scalabel_frame )
+
+            if frame_key not in labels_map:
+                scalabel_frame["labels"] = []
+            else:
+                if frame_key not in scalabel_labels_map:
+                    scalabel_labels_map[frame_key] = iwp.labels.convert_labels_iwp_to_scalabel( labels_map[frame_key]["labels"] )
+
+                scalabel_frame["labels"] = list( scalabel_labels_map[frame_key] )
+
+            yield scalabel_frame
+
+    return _label_frames()
+
+def write_scalabel_frames( scalabel_frames, frames_fp, indent=None ):
+    """
+    Serializes Scalabel frames as a JSON list, one frame at a time, so that the
+    entire sequence does not need to be held in memory.  The output is readable
+    by load_scalabel_frames().
+
+    Takes 3 arguments:
+
+      scalabel_frames - Iterable of Scalabel frames to serialize.
+      frames_fp       - File object to write the serialized frames to.
+      indent          - Optional non-negative integer specifying the indentation
+                        level used to pretty print the frames.  When specified, the
+                        output is identical to json.dump( ..., indent=indent ).  If
+                        omitted, defaults to None and each frame is written compactly
+                        on its own line.
+
+    Returns 1 value:
+
+      number_frames - Number of frames written.
+
+    """
+
+    number_frames = 0
+
+    #
+    # NOTE: we prefer orjson for compact output as it encodes considerably
+    #       faster than the standard library's json module.  it does not
+    #       support arbitrary indentation so pretty printing always uses the
+    #       json module.  it is not required.
+    #
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if indent is None:
+        frame_separator = ",\n"
+        list_start      = "[\n"
+        list_end        = "\n]\n"
+
+        if orjson is not None:
+            def _encode_frame( scalabel_frame ):
+                return orjson.dumps( scalabel_frame ).decode( "utf-8" )
         else:
-            scalabel_frame["labels"] = iwp.labels.convert_labels_iwp_to_scalabel( labels_map[frame_key]["labels"] )
+            def _encode_frame( scalabel_frame ):
+                return json.dumps( scalabel_frame, separators=(",", ":") )
+    else:
+        # match json.dump()'s layout by nesting each frame one level within the
+        # list.
+        nested_indent   = "\n" + (" " * indent)
+        frame_separator = ","
+        list_start      = "["
+        list_end        = "\n]"
+
+        def _encode_frame( scalabel_frame ):
+            return nested_indent + json.dumps( scalabel_frame,
+                                               indent=indent ).replace( "\n",
+                                                                        nested_indent )
 
-    return scalabel_frames
+    for scalabel_frame in scalabel_frames:
+        if number_frames == 0:
+            frames_fp.write( list_start )
+        else:
+            frames_fp.write( frame_separator )
+
+        frames_fp.write( _encode_frame( scalabel_frame ) )
+
+        number_frames += 1
+
+    # close the list, taking care to produce a valid empty list when there
+    # weren't any frames.
+    if number_frames == 0:
+        frames_fp.write( "[]" if indent is not None else "[]\n" )
+    else:
+        frames_fp.write( list_end )
+
+    return number_frames
 
 def load_scalabel_frames( scalabel_frames_path ):
     """
@@ -547,8 +833,22 @@ def load_scalabel_frames( scalabel_frames_path ):
 
     """
 
-    with open( scalabel_frames_path, "r" ) as scalabel_frames_fp:
-        scalabel_frames = json.load( scalabel_frames_fp )
+    #
+    # NOTE: we prefer orjson as it parses considerably faster than the standard
+    #       library's json module, which matters for playlists covering entire
+    #       datasets.  it is not required.
+    #
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        with open( scalabel_frames_path, "rb" ) as scalabel_frames_fp:
+            scalabel_frames = orjson.loads( scalabel_frames_fp.read() )
+    else:
+        with open( scalabel_frames_path, "r" ) as scalabel_frames_fp:
+            scalabel_frames = json.load( scalabel_frames_fp )
 
     # handle the case where we have exported labels from Scalabel.ai itself vs
     # a list of frames.
@@ -247,8 +247,11 @@ def main( argv ):
     else:
         variable_statistics = {}
 
-    # open the dataset.
-    xarray_dataset = iwp.data_loader.open_xarray_dataset( arguments.netcdf_path_pattern )
+    # open the dataset.  we let Dask size its chunks as multiples of the on-disk
+    # chunks so each is read once and there are few enough tasks that
+    # scheduling overhead does not dominate the reductions.
+    xarray_dataset = iwp.data_loader.open_xarray_dataset( arguments.netcdf_path_pattern,
+                                                          chunks="auto" )
 
     # default to the entirety of each dimension if the caller has not specified
     # ranges of interest.
@@ -3,15 +3,13 @@
 import getopt
 import os
 import sys
+import types
 
-import matplotlib.cm
-
-import iwp.data_loader
-import iwp.labels
-import iwp.quantization
-import iwp.rendering
-import iwp.statistics
-import iwp.utilities
+#
+# NOTE: the heavyweight modules (Matplotlib, xarray, and the IWP modules that
+#       pull them in) are imported on demand so that requesting help, or
+#       making a mistake on the command line, does not pay for their import.
+#
 
 # use a sensible default colormap.  we aim for something perceptually uniform
 # and is widely accessible.
@@ -113,6 +111,30 @@ def _get_dask_cluster_manager( cluster_address, cluster_parameters ):
 
     return cluster_manager
 
+def _limit_numerical_threads( number_threads ):
+    """
+    Limits the number of threads the numerical libraries' thread pools (OpenMP,
+    OpenBLAS, and MKL) use within this process and any process it spawns.  This
+    prevents oversubscribing the system's cores when work is distributed across
+    multiple processes that each spin up their own thread pools.
+
+    NOTE: This must be called before NumPy (or anything that imports it) is
+          imported as the thread pools are sized when the libraries are loaded.
+
+    Takes 1 argument:
+
+      number_threads - Positive integer specifying the number of threads each
+                       library may use.
+
+    Returns nothing.
+
+    """
+
+    for variable_name in ["OMP_NUM_THREADS",
+                          "OPENBLAS_NUM_THREADS",
+                          "MKL_NUM_THREADS"]:
+        os.environ[variable_name] = str( number_threads )
+
 def print_usage( program_name, file_handle=sys.stdout ):
     """
     Prints the script's usage to standard output.
@@ -127,7 +149,7 @@ def print_usage( program_name, file_handle=sys.stdout ):
     """
 
     usage_str = \
-"""{program_name:s} [-C <cluster_address>] [-c <colormap>] [-F] [-h] [-L] [-l <labels_path>[,<color>]] [-n <cluster_spec>] [-q <quant_table>] [-S <statistics_path>] [-s <min>:<max>:<std>[,...]] [-T] [-t <time_start>:<time_stop>] [-v] [-z <z_start>:<z_stop>] <netcdf_pattern> <output_root> <experiment> <variables>
+"""{program_name:s} [-C <cluster_address>] [-c <colormap>] [-F] [-h] [-j <number_threads>] [-L] [-l <labels_path>[,<color>]] [-n <cluster_spec>] [-q <quant_table>] [-S <statistics_path>] [-s <min>:<max>:<std>[,...]] [-T] [-t <time_start>:<time_stop>] [-v] [-z <z_start>:<z_stop>] <netcdf_pattern> <output_root> <experiment> <variables>
 
     Renders subsets of IWP datasets into a tree of PNG images suitable for analysis
     or labeling.  The netCDF4 files at <netcdf_pattern> are read and a subset of time
@@ -167,6 +189,13 @@ def print_usage( program_name, file_handle=sys.stdout ):
                                      omitted, XY slices are converted directly.
                                      of undecorated array visualizations.
         -h                           Print this help message and exit.
+        -j <number_threads>          Limits the number of threads used by the numerical
+                                     libraries (OpenMP, OpenBLAS, and MKL) in each
+                                     process to <number_threads>.  This avoids
+                                     oversubscribing the system when work is
+                                     distributed across a local cluster (see '-n'
+                                     below).  If omitted, the libraries' defaults,
+                                     or the environment's settings, are used.
         -L                           Render images using local statistics of each XY
                                      slice instead of global statistics across all
                                      XY slices for a given variable. If omitted,
@@ -302,6 +331,11 @@ def parse_command_line( argv ):
                                                   slice or across all XY slices.
                                                   If True, per-slice statistics are
                                                   used.
+                      .number_threads           - Positive integer specifying the
+                                                  number of threads numerical
+                                                  libraries may use per process.
+                                                  None if the libraries' defaults
+                                                  should be used.
                       .quantization_table_name  - String specifying the name of a
                                                   IWP quantization table.
                       .render_figure_flag       - Flag specifying whether XY slices
@@ -348,15 +382,8 @@ def parse_command_line( argv ):
     ARG_VARIABLE_NAMES      = 3
     NUMBER_ARGUMENTS        = ARG_VARIABLE_NAMES + 1
 
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
-
-    options, arguments = _Arguments(), _Arguments()
+    # simple objects designed to hold name values.
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
 
     # set defaults for each of the options.
     #
@@ -370,6 +397,7 @@ def parse_command_line( argv ):
     options.iwp_labels_path          = None
     options.label_color              = DEFAULT_LABEL_COLOR
     options.local_statistics_flag    = False
+    options.number_threads           = None
     options.quantization_table_name  = DEFAULT_QUANT_TABLE_NAME
     options.render_figure_flag       = False
     options.slice_index_range        = None
@@ -381,7 +409,7 @@ def parse_command_line( argv ):
 
     # parse our command line options.
     try:
-        option_flags, positional_arguments = getopt.getopt( argv[1:], "C:c:Fhl:Ln:q:s:S:Tt:vz:" )
+        option_flags, positional_arguments = getopt.getopt( argv[1:], "C:c:Fhj:l:Ln:q:s:S:Tt:vz:" )
     except getopt.GetoptError as error:
         raise ValueError( "Error processing option: {:s}\n".format( str( error ) ) )
 
@@ -396,6 +424,8 @@ def parse_command_line( argv ):
         elif option == "-h":
             print_usage( argv[0] )
             return (None, None)
+        elif option == "-j":
+            options.number_threads = option_value
         elif option == "-L":
             options.local_statistics_flag = True
         elif option == "-l":
@@ -443,26 +473,60 @@ def parse_command_line( argv ):
         elif option == "-T":
             options.title_images_flag = False
         elif option == "-t":
-            options.time_index_range = iwp.utilities.parse_range( option_value )
-
-            if options.time_index_range is None:
-                raise ValueError( "Invalid time index range specified ({:s}).".format(
-                    option_value ) )
+            # parsed below once we know help wasn't requested.
+            options.time_index_range = option_value
         elif option == "-v":
             options.verbose_flag = True
         elif option == "-z":
-            options.slice_index_range = iwp.utilities.parse_range( option_value )
-
-            if options.slice_index_range is None:
-                raise ValueError( "Invalid XY slice range specified ({:s}).".format(
-                    option_value ) )
+            # parsed below once we know help wasn't requested.
+            options.slice_index_range = option_value
 
-    # ensure we have the correct number of arguments.
+    # ensure we have the correct number of arguments.  this is checked before
+    # anything below imports the heavyweight modules.
     if len( positional_arguments ) != NUMBER_ARGUMENTS:
         raise ValueError( "Incorrect number of arguments.  Expected {:d}, received {:d}.".format(
             NUMBER_ARGUMENTS,
             len( positional_arguments ) ) )
 
+    # ensure that we got a sensible number of threads and limit the numerical
+    # libraries before anything below imports them.
+    if options.number_threads is not None:
+        try:
+            options.number_threads = int( options.number_threads )
+
+            if options.number_threads <= 0:
+                raise ValueError()
+        except ValueError:
+            #
+            # NOTE: we don't specify this as a string type since we may leave
+            #       the try block either as a string or as an integer.
+            #
+            raise ValueError( "Invalid number of threads specified ({}).".format(
+                options.number_threads ) )
+
+        _limit_numerical_threads( options.number_threads )
+
+    # range parsing and color validation live in the utilities module.  we
+    # import it here, rather than at the top of the script, so that requesting
+    # help doesn't drag in its dependencies.
+    import iwp.utilities
+
+    if options.time_index_range is not None:
+        time_index_range_str     = options.time_index_range
+        options.time_index_range = iwp.utilities.parse_range( time_index_range_str )
+
+        if options.time_index_range is None:
+            raise ValueError( "Invalid time index range specified ({:s}).".format(
+                time_index_range_str ) )
+
+    if options.slice_index_range is not None:
+        slice_index_range_str     = options.slice_index_range
+        options.slice_index_range = iwp.utilities.parse_range( slice_index_range_str )
+
+        if options.slice_index_range is None:
+            raise ValueError( "Invalid XY slice range specified ({:s}).".format(
+                slice_index_range_str ) )
+
     # map the positional arguments to named variables.
     arguments.experiment_name     = positional_arguments[ARG_EXPERIMENT_NAME]
     arguments.netcdf_path_pattern = positional_arguments[ARG_NETCDF_PATH_PATTERN].split( "," )
@@ -633,6 +697,16 @@ def main( argv ):
     if (options is None) and (arguments is None):
         return 0
 
+    # now that we know we have work to do, pull in the modules that do it.
+    import matplotlib.cm
+
+    import iwp.data_loader
+    import iwp.labels
+    import iwp.quantization
+    import iwp.rendering
+    import iwp.statistics
+    import iwp.utilities
+
     # figure out our Dask cluster configuration first.  this ensures that any
     # heavyweight setup operations benefit from its existence.
     try:
@@ -679,26 +753,37 @@ def main( argv ):
                     ]
                 except Exception:
                     pass
-                else:
-                    if options.verbose_flag:
-                        print( "Loaded statistics for '{:s}'.".format(
-                            variable_name ) )
-
-        # acquire a quantization table.
-        quantization_table_builder = iwp.utilities.lookup_module_function( iwp.quantization,
-                                                                           options.quantization_table_name )
 
-        if quantization_table_builder is None:
+            if options.verbose_flag:
+                covered_names = [variable_name for variable_name in arguments.variable_names
+                                 if variable_name in variable_statistics]
+
+                print( "Loaded statistics for {:d} of {:d} requested variable{:s}{:s}.".format(
+                    len( covered_names ),
+                    len( arguments.variable_names ),
+                    "" if len( arguments.variable_names ) == 1 else "s",
+                    "" if len( covered_names ) == 0 else " ({:s})".format(
+                        ", ".join( covered_names ) ) ) )
+
+        # acquire a quantization table.  we only accept callables so that
+        # non-function module attributes (e.g. other modules) are rejected here
+        # rather than when the first XY slice is rendered.
+        quantization_table_builder = getattr( iwp.quantization,
+                                              options.quantization_table_name,
+                                              None )
+
+        if not callable( quantization_table_builder ):
             print( "Invalid quantization table builder specified ('{:s}').".format(
                 options.quantization_table_name ),
                    file=sys.stderr )
             return 1
 
         # acquire a color map.
-        colormap = iwp.utilities.lookup_module_function( matplotlib.cm,
-                                                         options.colormap_name )
+        colormap = getattr( matplotlib.cm,
+                            options.colormap_name,
+                            None )
 
-        if colormap is None:
+        if not callable( colormap ):
             print( "Invalid colormap specified ('{:s}').".format(
                 options.colormap_name ),
                    file=sys.stderr )
@@ -721,6 +806,49 @@ def main( argv ):
                        file=sys.stderr )
                 return 1
 
+        # validate the requested ranges against the dataset's metadata before
+        # opening it.  opening a multi-file dataset can take a while so we'd
+        # rather not do it only to find out the request was invalid.
+        try:
+            dataset_dimensions = iwp.data_loader.peek_dims( arguments.netcdf_path_pattern )
+        except Exception as e:
+            print( "Failed to read the dataset's dimensions from '{}' ({:s}).".format(
+                arguments.netcdf_path_pattern,
+                str( e ) ),
+                   file=sys.stderr )
+            return 1
+
+        if options.time_index_range is not None:
+            available_time_steps = set( dataset_dimensions.get( "Cycle",
+                                                                dataset_dimensions.get( "time_step", [] ) ) )
+            missing_time_steps   = [time_step_index for time_step_index in options.time_index_range
+                                    if time_step_index not in available_time_steps]
+
+            if len( missing_time_steps ) > 0:
+                print( "Failed to validate the request (time step index {:d} is not "
+                       "present in the dataset).".format(
+                           missing_time_steps[0] ),
+                       file=sys.stderr )
+                return 1
+
+        if options.slice_index_range is not None:
+            if "z" not in dataset_dimensions:
+                print( "Failed to validate the request (the dataset does not have "
+                       "a 'z' dimension to select XY slices from).",
+                       file=sys.stderr )
+                return 1
+
+            number_xy_slices = len( dataset_dimensions["z"] )
+
+            for xy_slice_index in options.slice_index_range:
+                if not (0 <= xy_slice_index < number_xy_slices):
+                    print( "Failed to validate the request (XY slice index {:d} is "
+                           "not in [0, {:d}]).".format(
+                               xy_slice_index,
+                               number_xy_slices - 1 ),
+                           file=sys.stderr )
+                    return 1
+
         # open the dataset.
         try:
             xarray_dataset = iwp.data_loader.open_xarray_dataset( arguments.netcdf_path_pattern )
@@ -763,14 +891,20 @@ def main( argv ):
             else:
                 # compute global statistics for each variable that doesn't have them
                 # pre-loaded.
-                for variable_name in arguments.variable_names:
-                    if variable_name not in variable_statistics:
+                #
+                # NOTE: this requires a full pass through each variable's data,
+                #       so we only touch the dataset when pre-computed statistics
+                #       don't cover everything requested.
+                #
+                missing_variable_names = [variable_name for variable_name in arguments.variable_names
+                                          if variable_name not in variable_statistics]
 
-                        if options.verbose_flag:
-                            print( "Computing statistics for '{:s}'.".format(
-                                variable_name ) )
+                for variable_name in missing_variable_names:
+                    if options.verbose_flag:
+                        print( "Computing statistics for '{:s}'.".format(
+                            variable_name ) )
 
-                        variable_statistics[variable_name] = iwp.statistics.compute_statistics( xarray_dataset[variable_name] )
+                    variable_statistics[variable_name] = iwp.statistics.compute_statistics( xarray_dataset[variable_name] )
 
         # render each of the requested XY slices as images.
         iwp.rendering.ds_write_xy_slice_images( xarray_dataset,
@@ -3,14 +3,16 @@
 import getopt
 import os
 import sys
+import types
 
-import matplotlib.cm
+import numpy as np
 
-import iwp.data_loader
-import iwp.pptx
-import iwp.quantization
-import iwp.statistics
-import iwp.utilities
+#
+# NOTE: the heavyweight modules (Matplotlib, python-pptx, netCDF4, and the IWP
+#       modules that pull them in) are imported on demand so that requesting
+#       help, or making a mistake on the command line, does not pay for their
+#       import.
+#
 
 # use a sensible default colormap.  we aim for something perceptually uniform
 # and is widely accessible.
@@ -37,7 +39,7 @@ def print_usage( program_name, file_handle=sys.stdout ):
     """
 
     usage_str = \
-"""{program_name:s} [-c <colormap>] [-h] [-l <labels_path>[,<color>]] [-q <quant_table>] [-S <input_statistics_path>] <netcdf_pattern> <pptx_path> <experiment> <variable>[,<variable>[,<variable>]] <time_step_index>,<xy_slice_index> [...]
+"""{program_name:s} [-C <cache_mb>] [-c <colormap>] [-h] [-l <labels_path>[,<color>]] [-n <number_workers>] [-q <quant_table>] [-S <input_statistics_path>] [-U] <netcdf_pattern> <pptx_path> <experiment> <variable>[,<variable>[,<variable>]] <time_step_index>,<xy_slice_index> [...]
 
     Exports one or more XY slices from <netcdf_pattern> into an Powerpoint slide deck
     with one slide per XY slice, written to <pptx_path>.
@@ -62,6 +64,13 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     The command line options shown above are described below:
 
+        -C <cache_mb>                Use a chunk cache of <cache_mb> megabytes for each
+                                     variable when reading the dataset.  Datasets whose
+                                     chunks span multiple XY slices benefit from a cache
+                                     large enough to hold the chunks of each requested
+                                     time step.  The cache always holds at least one
+                                     chunk.  If omitted, the netCDF4 library's default
+                                     is used.
         -c <colormap>                Use <colormap> when rendering images.  Must be a
                                      the name of a valid Matplotlib colormap that is
                                      found at "matplotlib.cm.<colormap>".  If omitted,
@@ -75,6 +84,11 @@ def print_usage( program_name, file_handle=sys.stdout ):
                                      values in the range of [0, 1].  If both are
                                      omitted, no labels are overlaid.  If <color> is
                                      omitted, a high contrast default is selected.
+        -n <number_workers>          Specifies XY slices should be rendered in parallel
+                                     using <number_workers> processes.  Specifying as 0
+                                     results in one process per core present on the
+                                     local system.  If omitted, defaults to rendering
+                                     serially.
         -q <quant_table>             Use <quant_table> for quantizing XY slice data
                                      into image data.  Must be a valid IWP quantization
                                      table that is found at "iwp.quantization.<quant_table>".
@@ -86,6 +100,11 @@ def print_usage( program_name, file_handle=sys.stdout ):
                                      statistics for all <variable>s specified. If omitted,
                                      all statistics are computed on the fly on a per-slice
                                      basis.
+        -U                           Ask the operating system to read the dataset's files
+                                     ahead of their use.  This speeds up rendering when the
+                                     files are not already cached in memory (e.g. the first
+                                     run against a dataset).  If omitted, files are read on
+                                     demand.
 """.format(
     program_name=program_name,
     colormap=DEFAULT_COLORMAP_NAME,
@@ -114,6 +133,9 @@ def parse_command_line( argv ):
       options   - Object whose attributes represent the optional flags parsed.  Contains
                   at least the following:
 
+                      .chunk_cache_size         - Size, in bytes, of each variable's
+                                                  chunk cache.  None if not specified
+                                                  which denotes the library's default.
                       .colormap_names           - Sequence of strings specifying the
                                                   names of Matplotlib colormaps to
                                                   apply to the rendered variables.
@@ -131,11 +153,16 @@ def parse_command_line( argv ):
                                                   for overlaid labels.  Will have
                                                   three components (for RGB) in the
                                                   range of [0, 255].
+                      .number_workers           - Positive integer specifying the
+                                                  number of processes to render XY
+                                                  slices with.
                       .quantization_table_names - Sequence of strings specifying the
                                                   name of IWP quantization tables to
                                                   apply to the rendered variables.
                                                   Will have the same length as
                                                   arguments.variable_names.
+                      .read_ahead_flag          - Flag specifying whether the dataset's
+                                                  files should be read ahead of use.
 
                   NOTE: Will be None if execution is not required.
 
@@ -152,6 +179,8 @@ def parse_command_line( argv ):
                                              be imaged.
                       .slice_pairs         - List of tuples, (time_step_index, xy_slice_index),
                                              of XY slices to image.
+                      .slice_pairs_array   - NumPy array, shaped (number_pairs, 2),
+                                             containing .slice_pairs.
 
                   NOTE: Will be None if execution is not required.
 
@@ -166,36 +195,38 @@ def parse_command_line( argv ):
     ARG_SLICE_PAIRS          = 4
     MINIMUM_NUMBER_ARGUMENTS = ARG_SLICE_PAIRS + 1
 
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
-
-    options, arguments = _Arguments(), _Arguments()
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
 
     # set defaults for each of the options.
     #
     # use reasonable defaults for color maps and quantization tables, and
     # process each XY slice according to global statistics.  labels or
     # pre-computed statistics must be provided to be utilized.
+    options.chunk_cache_size         = None
     options.colormap_names           = [DEFAULT_COLORMAP_NAME]
     options.input_statistics_path    = None
     options.iwp_labels_path          = None
     options.label_color              = DEFAULT_LABEL_COLOR
+    options.number_workers           = 1
     options.quantization_table_names = [DEFAULT_QUANT_TABLE_NAME]
+    options.read_ahead_flag          = False
 
     # parse our command line options.
     try:
-        option_flags, positional_arguments = getopt.getopt( argv[1:], "c:hl:q:S:" )
+        option_flags, positional_arguments = getopt.getopt( argv[1:], "C:c:hl:n:q:S:U" )
     except getopt.GetoptError as error:
         raise ValueError( "Error processing option: {:s}\n".format( str( error ) ) )
 
     # handle any valid options that were presented.
-    for option, option_value in option_flags:
-        if option == "-c":
+    #
+    # NOTE: options specified multiple times take the last value provided.
+    #       collapse the options into a dictionary so that each is only
+    #       processed once.
+    #
+    for option, option_value in dict( option_flags ).items():
+        if option == "-C":
+            options.chunk_cache_size = option_value
+        elif option == "-c":
             options.colormap_names = option_value.split( "," )
         elif option == "-h":
             print_usage( argv[0] )
@@ -213,10 +244,14 @@ def parse_command_line( argv ):
             else:
                 raise ValueError( "Invalid label specification received ({:s}).".format(
                     option_value ) )
+        elif option == "-n":
+            options.number_workers = option_value
         elif option == "-q":
             options.quantization_table_names = option_value.split( "," )
         elif option == "-S":
             options.input_statistics_path = option_value
+        elif option == "-U":
+            options.read_ahead_flag = True
 
     # ensure we have the correct number of arguments.
     if len( positional_arguments ) < MINIMUM_NUMBER_ARGUMENTS:
@@ -224,19 +259,41 @@ def parse_command_line( argv ):
             MINIMUM_NUMBER_ARGUMENTS,
             len( positional_arguments ) ) )
 
+    # label probing and color validation live in the IWP modules.  we import
+    # them here, rather than at the top of the script, and after checking the
+    # argument count, so that requesting help or miscounting arguments doesn't
+    # drag in their dependencies.
+    import iwp.labels
+    import iwp.utilities
+
     # map the positional arguments to named variables.
     arguments.netcdf_path_pattern = positional_arguments[ARG_NETCDF_PATH_PATTERN].split( "," )
     arguments.pptx_path           = positional_arguments[ARG_PPTX_PATH]
     arguments.experiment_name     = positional_arguments[ARG_EXPERIMENT_NAME]
     arguments.variable_names      = positional_arguments[ARG_VARIABLE_NAMES].split( "," )
 
+    # the dataset is opened once, from a single pattern, and held open while
+    # every slide is generated.  multiple patterns would silently be ignored.
+    if len( arguments.netcdf_path_pattern ) != 1:
+        raise ValueError( "Only a single netCDF pattern may be specified, received {:d} ({:s}).".format(
+            len( arguments.netcdf_path_pattern ),
+            positional_arguments[ARG_NETCDF_PATH_PATTERN] ) )
+
+    # parse the slice pairs into a (number_pairs, 2) array.  this fails if any
+    # of the pairs aren't integers or if the pairs have differing lengths.
     try:
-        arguments.slice_pairs = list( map( lambda x: tuple( map( lambda y: int( y ), x.split( "," ) ) ),
-                                           positional_arguments[ARG_SLICE_PAIRS:] ) )
+        arguments.slice_pairs_array = np.array( [slice_pair.split( "," ) for slice_pair in
+                                                 positional_arguments[ARG_SLICE_PAIRS:]],
+                                                dtype=np.int64 )
+
+        if (arguments.slice_pairs_array.ndim != 2) or (arguments.slice_pairs_array.shape[1] != 2):
+            raise ValueError
     except ValueError:
         raise ValueError( "Failed to parse the slice pairs ({:s}).".format(
             " ".join( positional_arguments[ARG_SLICE_PAIRS:] ) ) )
 
+    arguments.slice_pairs = list( map( tuple, arguments.slice_pairs_array.tolist() ) )
+
     # bail if we have too few or too many variables to review.  we have limited
     # space on each slide and cannot fit more than three XY slices before
     # running out of room.
@@ -258,15 +315,15 @@ def parse_command_line( argv ):
     #       slightly though, in reality, does not reduce functionality all that
     #       much.
     #
-    for pair_index, (time_index, xy_slice_index) in enumerate( arguments.slice_pairs ):
-        if time_index < 0:
-            raise ValueError( "Slice pair #{:d} has a negative time index ({:d}).".format(
-                pair_index + 1,
-                time_index ) )
-        elif xy_slice_index < 0:
-            raise ValueError( "Slice pair #{:d} has a negative XY slice index ({:d}).".format(
-                pair_index + 1,
-                time_index ) )
+    negative_pair_indices, negative_component_indices = np.nonzero( arguments.slice_pairs_array < 0 )
+
+    if len( negative_pair_indices ) > 0:
+        pair_index = negative_pair_indices[0]
+
+        raise ValueError( "Slice pair #{:d} has a negative {:s} index ({:d}).".format(
+            pair_index + 1,
+            "time" if negative_component_indices[0] == 0 else "XY slice",
+            arguments.slice_pairs_array[pair_index, negative_component_indices[0]] ) )
 
     # ensure that labels exist if we're overlaying them.
     if ((options.iwp_labels_path is not None) and
@@ -274,6 +331,11 @@ def parse_command_line( argv ):
         raise ValueError( "Label overlay was requested with labels in '{:s}' but "
                           "it does not exist.".format(
                           options.iwp_labels_path ) )
+    elif ((options.iwp_labels_path is not None) and
+          not iwp.labels.probe_iwp_labels( options.iwp_labels_path )):
+        raise ValueError( "Label overlay was requested with labels in '{:s}' but "
+                          "it does not contain IWP labels.".format(
+                          options.iwp_labels_path ) )
 
     # validate the color specification provided.
     try:
@@ -324,6 +386,35 @@ def parse_command_line( argv ):
         # tables, one per variable.
         options.quantization_table_names *= len( arguments.variable_names )
 
+    # ensure that we got a sensible number of workers.
+    try:
+        options.number_workers = int( options.number_workers )
+
+        if options.number_workers < 0:
+            raise ValueError
+    except:
+        raise ValueError( "Invalid number of workers provided ({}).  Must be a "
+                          "non-negative integer.".format(
+                              options.number_workers ) )
+
+    # ensure that we got a sensible cache size and convert it to bytes.
+    if options.chunk_cache_size is not None:
+        try:
+            options.chunk_cache_size = int( options.chunk_cache_size )
+
+            if options.chunk_cache_size <= 0:
+                raise ValueError
+        except:
+            raise ValueError( "Invalid chunk cache size provided ({}).  Must be a "
+                              "positive integer.".format(
+                                  options.chunk_cache_size ) )
+
+        options.chunk_cache_size *= 1024 * 1024
+
+    # get an explicit number of workers if the caller requested auto-detect.
+    if options.number_workers == 0:
+        options.number_workers = os.cpu_count()
+
     return options, arguments
 
 def main( argv ):
@@ -355,6 +446,16 @@ def main( argv ):
     if (options is None) and (arguments is None):
         return 0
 
+    # now that we know we have work to do, pull in the modules that do it.
+    import matplotlib.cm
+
+    import iwp.data_loader
+    import iwp.labels
+    import iwp.pptx
+    import iwp.quantization
+    import iwp.statistics
+    import iwp.utilities
+
     # load statistics from disk if provided.  otherwise start with None to
     # signal local statistics computation.
     variable_statistics = None
@@ -406,17 +507,23 @@ def main( argv ):
 
     # open the dataset.
     try:
-        time_step_indices = set( map( lambda slice_pair: slice_pair[0],
-                                      arguments.slice_pairs ) )
+        #
+        # NOTE: we open the time steps in ascending order so that the files are
+        #       accessed sequentially, which matches the order slides are
+        #       rendered in.
+        #
+        time_step_indices = np.unique( arguments.slice_pairs_array[:, 0] ).tolist()
 
         iwp_dataset = iwp.data_loader.IWPDataset( arguments.netcdf_path_pattern[0],
-                                                  list( time_step_indices ),
-                                                  variables=arguments.variable_names )
-    except ValueError as e:
+                                                  time_step_indices,
+                                                  variables=arguments.variable_names,
+                                                  read_ahead_flag=options.read_ahead_flag,
+                                                  chunk_cache_size=options.chunk_cache_size )
+    except (OSError, ValueError) as e:
         print( "Failed to open the dataset at '{:s}' with times [{:s}] and "
                "variables {:s} ({:s}).".format(
-            arguments.netcdf_path_pattern,
-                   ", ".join( sorted( time_step_indices ) ),
+            arguments.netcdf_path_pattern[0],
+                   ", ".join( map( str, time_step_indices ) ),
                    ", ".join( map( lambda x: "'" + x + "'",
                                    arguments.variable_names ) ),
                    str( e ) ) )
@@ -430,13 +537,11 @@ def main( argv ):
     #       the inefficiency since this only happens once during setup.
     #
     try:
-        time_step_indices, xy_slice_indices = zip( *arguments.slice_pairs )
-
         # only validate the unique indices.  presumably the work to deduplicate
         # indices here is more efficient than repeatedly validating the same
         # indices.
-        unique_time_step_indices = list( set( time_step_indices ) )
-        unique_xy_slice_indices  = list( set( xy_slice_indices ) )
+        unique_time_step_indices = np.unique( arguments.slice_pairs_array[:, 0] ).tolist()
+        unique_xy_slice_indices  = np.unique( arguments.slice_pairs_array[:, 1] ).tolist()
 
         iwp.utilities.validate_variables_and_ranges( iwp_dataset,
                                                      arguments.variable_names,
@@ -465,7 +570,8 @@ def main( argv ):
                                                              colormaps,
                                                              quantization_table_builders,
                                                              iwp_labels=iwp_labels,
-                                                             label_color=options.label_color )
+                                                             label_color=options.label_color,
+                                                             number_workers=options.number_workers )
 
     # write the presentation to disk.
     try:
@@ -3,6 +3,7 @@
 import getopt
 import os
 import sys
+import types
 
 import iwp.labels
 
@@ -102,15 +103,7 @@ def parse_command_line( argv ):
     ARG_INPUT_PATHS          = 1
     MINIMUM_NUMBER_ARGUMENTS = ARG_INPUT_PATHS + 1
 
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
-
-    options, arguments = _Arguments(), _Arguments()
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
 
     # set defaults for each of the options.
     #
@@ -210,8 +203,32 @@ def main( argv ):
 
             return 1
 
-    # load each of the IWP label files and concatenate.
-    iwp_labels = []
+    # check that all of the inputs look like IWP labels before spending time
+    # loading any of them.  report every bad input at once so they can all be
+    # fixed before trying again.
+    invalid_input_paths = [input_path for input_path in arguments.input_paths
+                           if not iwp.labels.probe_iwp_labels( input_path )]
+
+    if len( invalid_input_paths ) > 0:
+        print( "Failed to load IWP labels from {:s} - missing or not a list of IWP labels.".format(
+            ", ".join( map( lambda path: "\"{:s}\"".format( path ),
+                            invalid_input_paths ) ) ),
+               file=sys.stderr )
+
+        return 1
+
+    # map the sort method to its sort type.
+    if options.sort_method.lower() == SORT_METHOD_SPATIAL:
+        sort_type = iwp.labels.IWPLabelSortType.SPATIAL
+    elif options.sort_method.lower() == SORT_METHOD_TEMPORAL:
+        sort_type = iwp.labels.IWPLabelSortType.TEMPORAL
+    else:
+        sort_type = iwp.labels.IWPLabelSortType.NONE
+
+    # load each of the IWP label files.  each file's labels are sorted as
+    # they're loaded so the files can be merged together rather than sorting
+    # all of the labels at once.
+    iwp_labels_lists = []
     for input_path in arguments.input_paths:
         try:
             current_iwp_labels = iwp.labels.load_iwp_labels( input_path )
@@ -223,20 +240,15 @@ def main( argv ):
 
             return 1
 
-        iwp_labels.extend( current_iwp_labels )
-
-    # sort if requested.
-    if options.sort_method != SORT_METHOD_NONE:
-        if options.sort_method == SORT_METHOD_SPATIAL:
-            sort_type = iwp.labels.IWPLabelSortType.SPATIAL
-        elif options.sort_method == SORT_METHOD_TEMPORAL:
-            sort_type = iwp.labels.IWPLabelSortType.TEMPORAL
-
         # note that we work in place since there are no other users of the
         # labels.
-        _ = iwp.labels.sort_iwp_labels( iwp_labels,
-                                        sort_type,
-                                        in_place_flag=True )
+        iwp_labels_lists.append( iwp.labels.sort_iwp_labels( current_iwp_labels,
+                                                             sort_type,
+                                                             in_place_flag=True ) )
+
+    # combine the labels, respecting the sort order requested.
+    iwp_labels = iwp.labels.merge_sorted_iwp_labels( iwp_labels_lists,
+                                                     sort_type )
 
     # serialized the merged labels.
     try:
@@ -24,7 +24,7 @@ def print_usage( program_name, file_handle=sys.stdout ):
     """
 
     usage_str = \
-"""{program_name:s} [-f] [-h] [-n <number_workers>] [-v] <reference_name> <netcdf_path>[,<netcdf_path>[...]] <output_name>:<transform_spec> [<output_name>:<transform_spec> [...]]
+"""{program_name:s} [-c <cache_size>] [-f] [-h] [-n <number_workers>] [-t <fft_threads>] [-v] <reference_name> <netcdf_path>[,<netcdf_path>[...]] <output_name>:<transform_spec> [<output_name>:<transform_spec> [...]]
 
     Post-processes on-disk netCDF4 files by transforming a single reference variable,
     <reference_name>, into one or more output variables, <output_name>, according to
@@ -61,6 +61,9 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     The command line options shown above are described below:
 
+        -c <cache_size>      Specifies the size, in bytes, of the netCDF4 chunk cache
+                             for the reference and output variables.  If omitted,
+                             each variable's cache holds at least four of its chunks.
         -f                   Force overwriting existing variables encountered.  If
                              omitted, execution is prevented if any of the <netcdf_path>'s
                              supplied have a requested <output_name>.
@@ -68,6 +71,11 @@ def print_usage( program_name, file_handle=sys.stdout ):
         -n <number_workers>  Specifies transforms should be applied in parallel using
                              <number_workers> processes.  Specifying as 0 results in
                              one process per core present on the local system.
+        -t <fft_threads>     Specifies the CWTs' FFTs should be computed with pyFFTW
+                             using <fft_threads> threads per worker.  Specifying as 0
+                             divides the cores present on the local system amongst
+                             the workers.  Requires pyFFTW.  If omitted, NumPy's FFTs
+                             are used.
         -v                   Enable verbose execution.  Status messages about progress
                              are written to standard output.  If omitted, defaults
                              to normal execution.
@@ -102,13 +110,19 @@ def parse_command_line( argv ):
       options   - Object whose attributes represent the optional flags parsed.  Contains
                   at least the following:
 
-                      .force_flag     - Flag specifying whether existing variables
-                                        should be overwritten.
-                      .number_workers - Non-negative integer specifying the number
-                                        of workers to use during transformations.
-                                        May be specified as 0 to launch as many
-                                        workers as there are cores on the system.
-                      .verbose_flag   - Flag specifying verbose execution.
+                      .chunk_cache_size - Positive integer specifying the chunk
+                                          cache size, in bytes, or None to size it
+                                          from the variables' chunks.
+                      .fft_threads      - Positive integer specifying the number of
+                                          threads per worker for pyFFTW, or None to
+                                          use NumPy's FFTs.
+                      .force_flag       - Flag specifying whether existing variables
+                                          should be overwritten.
+                      .number_workers   - Non-negative integer specifying the number
+                                          of workers to use during transformations.
+                                          May be specified as 0 to launch as many
+                                          workers as there are cores on the system.
+                      .verbose_flag     - Flag specifying verbose execution.
 
                   NOTE: Will be None if execution is not required.
 
@@ -149,25 +163,31 @@ def parse_command_line( argv ):
     # set defaults for each of the options.
     #
     # default to safe, serial execution that is quiet.
-    options.force_flag     = False
-    options.number_workers = 1
-    options.verbose_flag   = False
+    options.chunk_cache_size = None
+    options.fft_threads      = None
+    options.force_flag       = False
+    options.number_workers   = 1
+    options.verbose_flag     = False
 
     # parse our command line options.
     try:
-        option_flags, positional_arguments = getopt.getopt( argv[1:], "fhn:v" )
+        option_flags, positional_arguments = getopt.getopt( argv[1:], "c:fhn:t:v" )
     except getopt.GetoptError as error:
         raise ValueError( "Error processing option: {:s}\n".format( str( error ) ) )
 
     # handle any valid options that were presented.
     for option, option_value in option_flags:
-        if option == "-f":
+        if option == "-c":
+            options.chunk_cache_size = option_value
+        elif option == "-f":
             options.force_flag = True
         elif option == "-h":
             print_usage( argv[0] )
             return (None, None)
         elif option == "-n":
             options.number_workers = option_value
+        elif option == "-t":
+            options.fft_threads = option_value
         elif option == "-v":
             options.verbose_flag = True
 
@@ -249,10 +269,39 @@ def parse_command_line( argv ):
                           "non-negative integer.".format(
                               options.number_workers ) )
 
+    # ensure that we got a sensible chunk cache size.
+    if options.chunk_cache_size is not None:
+        try:
+            options.chunk_cache_size = int( options.chunk_cache_size )
+
+            if options.chunk_cache_size <= 0:
+                raise ValueError
+        except:
+            raise ValueError( "Invalid chunk cache size provided ({}).  Must be a "
+                              "positive integer.".format(
+                                  options.chunk_cache_size ) )
+
     # get an explicit number of workers if the caller requested auto-detect.
     if options.number_workers == 0:
         options.number_workers = os.cpu_count()
 
+    # ensure that we got a sensible number of FFT threads.
+    if options.fft_threads is not None:
+        try:
+            options.fft_threads = int( options.fft_threads )
+
+            if options.fft_threads < 0:
+                raise ValueError
+        except:
+            raise ValueError( "Invalid number of FFT threads provided ({}).  Must "
+                              "be a non-negative integer.".format(
+                                  options.fft_threads ) )
+
+        # split the cores amongst the workers if the caller requested
+        # auto-detect.
+        if options.fft_threads == 0:
+            options.fft_threads = max( 1, os.cpu_count() // options.number_workers )
+
     return options, arguments
 
 
@@ -331,12 +380,16 @@ def main( argv ):
         netcdf_transformer = iwp.transforms.IWPnetCDFTransformer( arguments.reference_name,
                                                                   arguments.output_names,
                                                                   arguments.transform_specs,
-                                                                  verbose_flag=options.verbose_flag )
+                                                                  verbose_flag=options.verbose_flag,
+                                                                  chunk_cache_bytes=options.chunk_cache_size,
+                                                                  fft_threads=options.fft_threads )
     except Exception as e:
         print( "Could not create an netCDF4 transformer object ({:s}).".format(
             str( e ) ),
                file=sys.stderr )
 
+        return 1
+
     # launch our processing pool in separate processes.
     if options.verbose_flag:
         if options.number_workers == 1:
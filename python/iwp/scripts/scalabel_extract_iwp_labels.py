@@ -2,6 +2,7 @@
 
 import getopt
 import sys
+import types
 
 import iwp.labels
 import iwp.scalabel
@@ -20,7 +21,7 @@ def print_usage( program_name, file_handle=sys.stdout ):
     """
 
     usage_str = \
-"""{program_name:s} [-h] <playlist_path> <labels_path> <width> <height>
+"""{program_name:s} [-c] [-h] <playlist_path> <labels_path> <width> <height>
 
     Extracts IWP labels from a Scalabel.ai playlist, at <playlist_path>, and writes
     them to disk at <labels_path>.  Using <width> and <height>, IWP labels are normalized
@@ -28,6 +29,9 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     The command line options shown above are described below:
 
+        -c                        Write compact IWP labels instead of pretty printing
+                                  them.  This is substantially faster for large
+                                  playlists though is harder to read.
         -h                        Print this help message and exit.
 """.format(
     program_name=program_name,
@@ -52,8 +56,11 @@ def parse_command_line( argv ):
 
     Returns 2 values:
 
-      options   - Object whose attributes represent the optional flags parsed.  Currently
-                  is an empty object.
+      options   - Object whose attributes represent the optional flags parsed.  Contains
+                  at least the following:
+
+                      .pretty_flag - Flag specifying whether the IWP labels are
+                                     pretty printed.  If omitted, defaults to True.
 
                   NOTE: Will be None if execution is not required.
 
@@ -71,33 +78,26 @@ def parse_command_line( argv ):
 
     """
 
-    # indices into argv's positional arguments specifying each of the required
-    # arguments.
-    ARG_SCALABEL_PLAYLIST_PATH = 0
-    ARG_IWP_LABELS_PATH        = 1
-    ARG_IMAGE_WIDTH            = 2
-    ARG_IMAGE_HEIGHT           = 3
-    NUMBER_ARGUMENTS           = ARG_IMAGE_HEIGHT + 1
+    # number of required positional arguments.  see the unpacking below for
+    # their order.
+    NUMBER_ARGUMENTS = 4
 
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
 
-    options, arguments = _Arguments(), _Arguments()
+    # write human readable labels by default.
+    options.pretty_flag = True
 
     # parse our command line options.
     try:
-        option_flags, positional_arguments = getopt.getopt( argv[1:], "h" )
+        option_flags, positional_arguments = getopt.getopt( argv[1:], "ch" )
     except getopt.GetoptError as error:
         raise ValueError( "Error processing option: {:s}\n".format( str( error ) ) )
 
     # handle any valid options that were presented.
     for option, option_value in option_flags:
-        if option == "-h":
+        if option == "-c":
+            options.pretty_flag = False
+        elif option == "-h":
             print_usage( argv[0] )
             return (None, None)
 
@@ -108,10 +108,19 @@ def parse_command_line( argv ):
             len( positional_arguments ) ) )
 
     # map the positional arguments to named variables.
-    arguments.scalabel_playlist_path = positional_arguments[ARG_SCALABEL_PLAYLIST_PATH]
-    arguments.iwp_labels_path        = positional_arguments[ARG_IWP_LABELS_PATH]
-    arguments.image_width            = int( positional_arguments[ARG_IMAGE_WIDTH] )
-    arguments.image_height           = int( positional_arguments[ARG_IMAGE_HEIGHT] )
+    (arguments.scalabel_playlist_path,
+     arguments.iwp_labels_path,
+     image_width_str,
+     image_height_str) = positional_arguments
+
+    # ensure we have an integral image size.
+    try:
+        arguments.image_width  = int( image_width_str )
+        arguments.image_height = int( image_height_str )
+    except ValueError:
+        raise ValueError( "Could not parse an integral image size from '{:s}' x '{:s}'.".format(
+            image_width_str,
+            image_height_str ) )
 
     return options, arguments
 
@@ -159,24 +168,25 @@ def main( argv ):
     iwp_labels = iwp.scalabel.extract_iwp_labels_from_frames( scalabel_frames )
 
     try:
-        # switch the labels to a bottom-left coordinate system (ij) since
-        # Scalabel.ai labels relative to the top-left (xy).
-        iwp.labels.flipud_iwp_label_coordinates( iwp_labels,
-                                                 arguments.image_height,
-                                                 in_place_flag=True )
-
-        # normalize the labels so they're independent of the size of the
-        # image labeled on.
-        iwp.labels.normalize_iwp_label_coordinates( iwp_labels,
-                                                    arguments.image_width,
-                                                    arguments.image_height,
-                                                    in_place_flag=True )
-
-        # serialize the labels to disk.
+        # order the labels by time.  this only depends on the labels' integral
+        # location and identifier, so it is independent of the coordinate
+        # transformations below.
         _ = iwp.labels.sort_iwp_labels( iwp_labels,
                                         iwp.labels.IWPLabelSortType.TEMPORAL,
                                         in_place_flag=True )
-        iwp.labels.save_iwp_labels( arguments.iwp_labels_path, iwp_labels )
+
+        # switch the labels to a bottom-left coordinate system (ij) since
+        # Scalabel.ai labels relative to the top-left (xy), and normalize them
+        # so they're independent of the size of the image labeled on.
+        iwp.labels.flipud_and_normalize_iwp_label_coordinates( iwp_labels,
+                                                               arguments.image_width,
+                                                               arguments.image_height,
+                                                               in_place_flag=True )
+
+        # serialize the labels to disk.
+        iwp.labels.save_iwp_labels( arguments.iwp_labels_path,
+                                    iwp_labels,
+                                    pretty_flag=options.pretty_flag )
     except Exception as e:
         print( "Failed to write the IWP labels to '{:s}' ({:s}).".format(
             arguments.iwp_labels_path,
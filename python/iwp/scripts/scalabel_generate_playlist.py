@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
 
 import getopt
-import json
+import os
 import sys
+import tempfile
+import types
+import urllib.parse
 
 import iwp.scalabel
 import iwp.utilities
 
+# map from labeling strategy name to its enumeration.  used to parse -L.
+_LABELING_STRATEGIES = {
+    labeling_strategy.name: labeling_strategy for labeling_strategy in iwp.scalabel.LabelingStrategyType
+    }
+
+# sorted, lowercase names of the labeling strategies for reporting errors.
+_LABELING_STRATEGY_NAMES = tuple( sorted( name.lower() for name in _LABELING_STRATEGIES ) )
+
 def print_usage( program_name, file_handle=sys.stdout ):
     """
     Prints the script's usage to standard output.
@@ -20,8 +31,24 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     """
 
+    print( _build_usage_string( program_name ), file=file_handle )
+
+def _build_usage_string( program_name ):
+    """
+    Builds the script's usage string.  See print_usage() for details.
+
+    Takes 1 argument:
+
+      program_name - Name of the program currently executing.
+
+    Returns 1 value:
+
+      usage_str - String containing the script's usage.
+
+    """
+
     usage_str = \
-"""{program_name:s} [-f] [-h] [-l <path>,<width>,<height>] [-L <labeling_strategy>] <playlist_path> <experiment> <variable>[,<variable>[...]] <time_start>:<time_stop> <z_start>:<z_stop> <data_root> <url_prefix> <component_count>
+"""{program_name:s} [-c] [-f] [-h] [-l <path>,<width>,<height>] [-L <labeling_strategy>] <playlist_path> <experiment> <variable>[,<variable>[...]] <time_start>:<time_stop> <z_start>:<z_stop> <data_root> <url_prefix> <component_count>
 
     Creates a JSON playlist suitable for importing into a new Scalabel.ai labeling project
     at <playlist_path>.  The playlist generated contains a sequence of "video frames"
@@ -58,9 +85,13 @@ def print_usage( program_name, file_handle=sys.stdout ):
             http://localhost:8686/items/R5F04/
 
     To avoid headaches with Scalabel.ai's tool, Each frame's underlying data's path is
-    checked for accessibility before writing the playlist JSON.  Frame without data
+    checked for accessibility while writing the playlist JSON.  Frame without data
     generate an error message on standard error and prevent the playlist from being written.
 
+    Frames are streamed to a temporary file next to <playlist_path> as they are
+    generated.  <playlist_path> is only replaced once every frame has been written,
+    so an existing playlist is left untouched when an error occurs.
+
     The generate frames' metadata is structured such that, when exported from the labeling
     tool, the Scalabel labels may be extracted and converted into IWP labels for
     post-processing and configuration management.  Individual frames are programmaticaly
@@ -69,6 +100,9 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     The command line options shown above are described below:
 
+        -c                          Write the playlist JSON compactly, one frame per
+                                    line, rather than with four space indentation.
+                                    This substantially reduces the playlist's size.
         -f                          Force creation of the playlist JSON regardless of whether
                                     the frames' underlying data exists or not.  If a datum
                                     doesn't exist, a warning is printed to standard error.
@@ -88,7 +122,7 @@ def print_usage( program_name, file_handle=sys.stdout ):
     variables="'{:s}'".format( iwp.scalabel.LabelingStrategyType.VARIABLES.name.lower() )
 )
 
-    print( usage_str, file=file_handle )
+    return usage_str
 
 def parse_command_line( argv ):
     """
@@ -110,6 +144,9 @@ def parse_command_line( argv ):
       options   - Object whose attributes represent the optional flags parsed.  Contains
                   at least the following:
 
+                      .compact_flag    - Flag specifying whether the playlist should
+                                         be written compactly.  If omitted, defaults
+                                         to False.
                       .force_flag      - Flag specifying whether playlist creation
                                          should be forced.  If omitted, defaults to
                                          False.
@@ -147,27 +184,14 @@ def parse_command_line( argv ):
 
     """
 
-    # indices into argv's positional arguments specifying each of the required
-    # arguments.
-    ARG_PLAYLIST_PATH   = 0
-    ARG_EXPERIMENT_NAME = 1
-    ARG_VARIABLES_LIST  = 2
-    ARG_TIME_RANGE      = 3
-    ARG_XY_SLICE_RANGE  = 4
-    ARG_DATA_ROOT       = 5
-    ARG_URL_PREFIX      = 6
-    ARG_COMPONENT_COUNT = 7
-    NUMBER_ARGUMENTS    = ARG_COMPONENT_COUNT + 1
-
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
+    # number of required positional arguments.  see the unpacking below for
+    # their order.
+    NUMBER_ARGUMENTS = 8
 
-    options, arguments = _Arguments(), _Arguments()
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
+
+    # write pretty printed playlists.
+    options.compact_flag = False
 
     # abort if we are creating a Scalabel frame that references non-existent
     # data.
@@ -181,20 +205,15 @@ def parse_command_line( argv ):
 
     # parse our command line options.
     try:
-        option_flags, positional_arguments = getopt.getopt( argv[1:], "fhl:L:" )
+        option_flags, positional_arguments = getopt.getopt( argv[1:], "cfhl:L:" )
     except getopt.GetoptError as error:
         raise ValueError( "Error processing option: {:s}\n".format( str( error ) ) )
 
-    valid_labeling_strategies = {
-        iwp.scalabel.LabelingStrategyType.NO_ORDER.name:  iwp.scalabel.LabelingStrategyType.NO_ORDER,
-        iwp.scalabel.LabelingStrategyType.XY_SLICES.name: iwp.scalabel.LabelingStrategyType.XY_SLICES,
-        iwp.scalabel.LabelingStrategyType.Z_STACKS.name:  iwp.scalabel.LabelingStrategyType.Z_STACKS,
-        iwp.scalabel.LabelingStrategyType.VARIABLES.name: iwp.scalabel.LabelingStrategyType.VARIABLES
-        }
-
     # handle any valid options that were presented.
     for option, option_value in option_flags:
-        if option == "-f":
+        if option == "-c":
+            options.compact_flag = True
+        elif option == "-f":
             options.force_flag = True
         elif option == "-h":
             print_usage( argv[0] )
@@ -212,13 +231,12 @@ def parse_command_line( argv ):
                     option_value,
                     str( e ) ) )
         elif option == "-L":
-            if option_value.upper() in valid_labeling_strategies:
-                options.labeling_strategy = valid_labeling_strategies[option_value.upper()]
+            if option_value.upper() in _LABELING_STRATEGIES:
+                options.labeling_strategy = _LABELING_STRATEGIES[option_value.upper()]
             else:
                 raise ValueError( "Unknown labeling strategy '{:s}'.  Must be one of: {:s}.".format(
                     option_value,
-                    ", ".join( map( lambda x: x.lower(),
-                                    sorted( valid_labeling_strategies.keys() ) ) ) ) )
+                    ", ".join( _LABELING_STRATEGY_NAMES ) ) )
 
     # ensure we have the correct number of arguments.
     if len( positional_arguments ) != NUMBER_ARGUMENTS:
@@ -227,22 +245,26 @@ def parse_command_line( argv ):
             len( positional_arguments ) ) )
 
     # map the positional arguments to named variables.
-    arguments.playlist_path   = positional_arguments[ARG_PLAYLIST_PATH]
-    arguments.experiment_name = positional_arguments[ARG_EXPERIMENT_NAME]
-    arguments.variable_names  = positional_arguments[ARG_VARIABLES_LIST].split( "," )
-    arguments.time_range      = iwp.utilities.parse_range( positional_arguments[ARG_TIME_RANGE] )
-    arguments.xy_slice_range  = iwp.utilities.parse_range( positional_arguments[ARG_XY_SLICE_RANGE] )
-    arguments.data_root       = positional_arguments[ARG_DATA_ROOT]
-    arguments.url_prefix      = positional_arguments[ARG_URL_PREFIX]
-    arguments.component_count = positional_arguments[ARG_COMPONENT_COUNT]
+    (arguments.playlist_path,
+     arguments.experiment_name,
+     variables_str,
+     time_range_str,
+     xy_slice_range_str,
+     arguments.data_root,
+     arguments.url_prefix,
+     component_count_str) = positional_arguments
+
+    arguments.variable_names  = variables_str.split( "," )
+    arguments.time_range      = iwp.utilities.parse_range( time_range_str )
+    arguments.xy_slice_range  = iwp.utilities.parse_range( xy_slice_range_str )
 
     # validate the ranges supplied are sensible.
     if arguments.time_range is None:
         raise ValueError( "Failed to parse a time range from \"{:s}\"".format(
-            positional_arguments[ARG_TIME_RANGE] ) )
+            time_range_str ) )
     if arguments.xy_slice_range is None:
         raise ValueError( "Failed to parse a xy slice range from \"{:s}\"".format(
-            positional_arguments[ARG_XY_SLICE_RANGE] ) )
+            xy_slice_range_str ) )
 
     # ensure that we're reasonably scaling our labels.
     if (options.iwp_labels_path is not None and
@@ -254,15 +276,44 @@ def parse_command_line( argv ):
 
     # ensure we have a non-negative component count.
     try:
-        arguments.component_count = int( arguments.component_count )
+        arguments.component_count = int( component_count_str )
     except ValueError:
         raise ValueError( "Could not parse an integral component count from '{:s}'.".format(
-            positional_arguments[ARG_COMPONENT_COUNT] ) )
+            component_count_str ) )
 
     if arguments.component_count < 0:
         raise ValueError( "Component count must be non-negative ({:d}).".format(
             arguments.component_count ) )
 
+    # ensure the URL prefix is well formed.
+    try:
+        urllib.parse.urlsplit( arguments.url_prefix )
+    except ValueError as e:
+        raise ValueError( "Could not parse a URL prefix from '{:s}' ({:s}).".format(
+            arguments.url_prefix,
+            str( e ) ) )
+
+    # ensure that each variable's slices have enough path components to strip
+    # before any frames are generated.  slice paths only differ by their
+    # zero-padded indices within a variable, so a single path per variable is
+    # representative.
+    for variable_name in arguments.variable_names:
+        slice_path = iwp.scalabel.build_slice_path( arguments.data_root,
+                                                    ".png",
+                                                    arguments.experiment_name,
+                                                    variable_name,
+                                                    0,
+                                                    0 )
+
+        try:
+            iwp.scalabel.build_slice_url( arguments.url_prefix,
+                                          slice_path,
+                                          arguments.component_count )
+        except IndexError as e:
+            raise ValueError( "Component count is too large for '{:s}' ({:s}).".format(
+                arguments.data_root,
+                str( e ) ) )
+
     return options, arguments
 
 def main( argv ):
@@ -294,25 +345,6 @@ def main( argv ):
     if (options is None) and (arguments is None):
         return 0
 
-    # generate playlist's frames based on the parameters.
-    try:
-        scalabel_frames = iwp.scalabel.build_scalabel_frames( arguments.experiment_name,
-                                                              arguments.variable_names,
-                                                              arguments.time_range,
-                                                              arguments.xy_slice_range,
-                                                              arguments.data_root,
-                                                              ".png",
-                                                              arguments.url_prefix,
-                                                              arguments.component_count,
-                                                              labeling_strategy=options.labeling_strategy,
-                                                              check_data_flag=(not options.force_flag) )
-    except FileNotFoundError as e:
-        print( "Could not build Scalabel playlist - {:s}".format(
-            str( e ) ),
-               file=sys.stderr )
-
-        return 1
-
     # load and scale the labels if provided.
     if options.iwp_labels_path is not None:
         try:
@@ -338,16 +370,46 @@ def main( argv ):
     else:
         iwp_labels = []
 
+    # generate playlist's frames based on the parameters.  frames are created
+    # as they're serialized so the playlist is never held in memory.
+    scalabel_frames = iwp.scalabel.iterate_scalabel_frames( arguments.experiment_name,
+                                                            arguments.variable_names,
+                                                            arguments.time_range,
+                                                            arguments.xy_slice_range,
+                                                            arguments.data_root,
+                                                            ".png",
+                                                            arguments.url_prefix,
+                                                            arguments.component_count,
+                                                            labeling_strategy=options.labeling_strategy,
+                                                            check_data_flag=(not options.force_flag) )
+
     # merge the IWP labels into the frames.  this is a no-op if we were not
     # supplied labels by the caller.
-    scalabel_frames = iwp.scalabel.set_iwp_labels( scalabel_frames,
-                                                   iwp_labels )
+    try:
+        scalabel_frames = iwp.scalabel.iterate_iwp_labeled_frames( scalabel_frames,
+                                                                   iwp_labels )
+    except ValueError as e:
+        print( "Failed to set IWP labels from '{:s}' ({:s}).".format(
+            options.iwp_labels_path,
+            str( e ) ),
+               file=sys.stderr )
 
-    # serialize playlist.
+        return 1
+
+    # serialize playlist into a temporary file next to the requested path and
+    # move it into place once it is complete.  missing data is only detected
+    # once the offending frame is generated, so this leaves an existing
+    # playlist untouched when we fail part of the way through.
+    #
+    # NOTE: frames are written individually, so we use a large buffer to
+    #       coalesce them into a small number of writes.
+    #
     try:
-        with open( arguments.playlist_path, "w" ) as playlist_path:
-            json.dump( scalabel_frames, playlist_path, indent=4 )
-    except Exception as e:
+        playlist_fd, temporary_path = tempfile.mkstemp( dir=(os.path.dirname( arguments.playlist_path ) or "."),
+                                                        prefix=".{:s}.".format(
+                                                            os.path.basename( arguments.playlist_path ) ),
+                                                        suffix=".tmp" )
+    except OSError as e:
         print( "Failed to write the Scalabel playlist to '{:s}' ({:s}).".format(
             arguments.playlist_path,
             str( e ) ),
@@ -355,6 +417,34 @@ def main( argv ):
 
         return 1
 
+    try:
+        # temporary files are only accessible by their owner.  give the
+        # playlist the permissions it would have had if created directly.
+        umask = os.umask( 0 )
+        os.umask( umask )
+        os.chmod( temporary_path, 0o666 & ~umask )
+
+        with open( playlist_fd, "w", buffering=(1024 * 1024) ) as playlist_fp:
+            iwp.scalabel.write_scalabel_frames( scalabel_frames,
+                                                playlist_fp,
+                                                indent=(None if options.compact_flag else 4) )
+
+        os.replace( temporary_path, arguments.playlist_path )
+    except Exception as e:
+        if isinstance( e, FileNotFoundError ):
+            print( "Could not build Scalabel playlist - {:s}".format(
+                str( e ) ),
+                   file=sys.stderr )
+        else:
+            print( "Failed to write the Scalabel playlist to '{:s}' ({:s}).".format(
+                arguments.playlist_path,
+                str( e ) ),
+                   file=sys.stderr )
+
+        os.remove( temporary_path )
+
+        return 1
+
     return 0
 
 if __name__ == "__main__":
@@ -2,7 +2,9 @@
 
 import getopt
 import sys
+import types
 
+import iwp.utilities
 import iwp.xdmf
 
 def print_usage( program_name, file_handle=sys.stdout ):
@@ -18,6 +20,22 @@ def print_usage( program_name, file_handle=sys.stdout ):
 
     """
 
+    print( _build_usage_string( program_name ), file=file_handle )
+
+def _build_usage_string( program_name ):
+    """
+    Builds the script's usage string.  See print_usage() for details.
+
+    Takes 1 argument:
+
+      program_name - Name of the program currently executing.
+
+    Returns 1 value:
+
+      usage_str - String containing the script's usage.
+
+    """
+
     usage_str = \
 """{program_name:s} [-h] <xmdf_path> <netcdf_path_template> <sequence_start>:<sequence_stop> <dataset> [<dataset> ...]
 
@@ -36,7 +54,7 @@ The command line options shown above are described below:
     program_name=program_name
 )
 
-    print( usage_str, file=file_handle )
+    return usage_str
 
 def parse_command_line( argv ):
     """
@@ -78,15 +96,7 @@ def parse_command_line( argv ):
     ARG_DATASET_NAME         = 3
     NUMBER_MINIMUM_ARGUMENTS = ARG_DATASET_NAME + 1
 
-    # empty class designed to hold name values.
-    #
-    # XXX: this is a kludge until we sort out how to replace everything with
-    #      argparse.
-    #
-    class _Arguments( object ):
-        pass
-
-    options, arguments = _Arguments(), _Arguments()
+    options, arguments = types.SimpleNamespace(), types.SimpleNamespace()
 
     # parse our command line options.
     try:
@@ -111,28 +121,33 @@ def parse_command_line( argv ):
     arguments.xdmf_path            = positional_arguments[ARG_XDMF_PATH]
     arguments.netcdf_path_template = positional_arguments[ARG_NETCDF_PATH_TEMPLATE]
     arguments.sequence             = iwp.utilities.parse_range( positional_arguments[ARG_SEQUENCE] )
-    arguments.datasets             = positional_arguments[ARG_DATASET_NAME:]
+    arguments.datasets             = []
 
-    # drop leading slashes on datasets.  attributes are presented relative to
-    # the group opened and must be accessed sans leading slash.
-    arguments.datasets = list( map( lambda dataset: dataset.removeprefix( "/" ),
-                                    arguments.datasets ) )
+    # validate the sequence supplied is sensible.
+    if arguments.sequence is None:
+        raise ValueError( "Failed to parse a sequence range from \"{:s}\"".format(
+            positional_arguments[ARG_SEQUENCE] ) )
 
-    # ensure the datasets are unique.
+    # drop leading slashes on datasets and ensure they're unique in a single
+    # pass.  attributes are presented relative to the group opened and must be
+    # accessed sans leading slash.
     #
-    # NOTE: we do this after partial normalization (stripping leading slashes)
-    #       so we catch more common duplications.  this isn't perfect since we
-    #       don't resolve links within the file's datasets, but that is highly
-    #       unlikely to ever be encountered.
+    # NOTE: we check for duplicates after partial normalization (stripping
+    #       leading slashes) so we catch more common duplications.  this isn't
+    #       perfect since we don't resolve links within the file's datasets,
+    #       but that is highly unlikely to ever be encountered.
     #
-    seen_datasets      = []
-    duplicate_datasets = []
-    for dataset in arguments.datasets:
+    seen_datasets      = set()
+    duplicate_datasets = set()
+
+    for dataset in positional_arguments[ARG_DATASET_NAME:]:
+        dataset = dataset.removeprefix( "/" )
+
         if dataset in seen_datasets:
-            if dataset not in duplicate_datasets:
-                duplicate_datasets.append( dataset )
+            duplicate_datasets.add( dataset )
         else:
-            seen_datasets.append( dataset )
+            seen_datasets.add( dataset )
+            arguments.datasets.append( dataset )
 
     if len( duplicate_datasets ) > 0:
         raise ValueError( "{:d} dataset{:s} specified multiple times: {:s}".format(
@@ -174,8 +189,11 @@ def main( argv ):
                                              arguments.sequence,
                                              arguments.datasets )
 
-    with open( arguments.xdmf_path, "w" ) as xdmf_fp:
-        xdmf_size_bytes = xdmf_fp.write( xdmf_generator.generate() )
+    # write the document in binary so each fragment is encoded once, directly,
+    # rather than through a text-mode file's encoder.  this also reports the
+    # number of bytes written rather than characters.
+    with open( arguments.xdmf_path, "wb" ) as xdmf_fp:
+        xdmf_size_bytes = xdmf_generator.write_to( xdmf_fp, encoding="utf-8" )
 
     print( "Wrote {:d} byte{:s} to '{:s}'.".format(
         xdmf_size_bytes,
@@ -1,50 +1,263 @@
+import copy
+import functools
 import json
+import os
 
+import numpy as np
 import xarray
 
 # XXX: create a class to wrap statistics.  methods/attributes for each of the
 #      the descriptive variables.  method to load and save stats?
 
-def compute_statistics( data ):
+def compute_statistics( data, dtype=None, lazy=True ):
     """
     Computes summary statistics.  Generates the minimum, maximum, and standard
     deviation for the data provided.  Currently handles Array-like data with special
-    support for xarray Dataset's and DataArrays.
+    support for xarray Dataset's and DataArrays.  Lazy (Dask-backed) data have all
+    three statistics evaluated concurrently in a single computation.  NumPy arrays
+    are reduced with bottleneck, if it is available.
 
-    Takes 1 arguments:
+    Datasets have statistics computed for each of their data variables
+    individually.  The lazy variables are reduced in a single computation so
+    each of their chunks is read once.
 
-      data - Array-like object to compute statistics over.
+    Dask's scheduling overhead can dominate the reductions of small datasets.
+    Callers may load lazy data into memory first so the statistics are computed
+    directly with NumPy.
+
+    Takes 3 arguments:
+
+      data  - Array-like object to compute statistics over.
+      dtype - Optional NumPy data type to convert data to before computing
+              statistics.  Reducing double precision data as single precision
+              halves the memory traffic of the reductions, at the cost of
+              rounding data to single precision.  Lazy data are converted as
+              each chunk is read and their standard deviations are still
+              accumulated in double precision.  If omitted, defaults to None
+              and data are reduced in their own data type.
+      lazy  - Optional flag specifying whether lazy data are reduced lazily,
+              one chunk at a time.  If False, lazy data are loaded into memory
+              before statistics are computed, which is faster when data are small
+              but requires enough memory to hold all of data.  If omitted,
+              defaults to True.
 
     Returns 3 values:
 
-      minimum - Minimum value of data.
-      maximum - Maximum value of data.
-      stddev  - Standard deviation of data.
+      minimum - Minimum value of data, as a numpy.float64 scalar.
+      maximum - Maximum value of data, as a numpy.float64 scalar.
+      stddev  - Standard deviation of data, as a numpy.float64 scalar.
+
+    The statistics may be passed to save_statistics() as is.  numpy.float64
+    subclasses float so the json module encodes them directly, while orjson
+    requires them to be enabled explicitly, which save_statistics() does.
+
+    NOTE: When data is an xarray.Dataset, a single dictionary is returned
+          instead.  Its keys are the Dataset's data variable names and its values
+          are (minimum, maximum, stddev) tuples as described above.
 
     """
 
+    import dask
+
+    if dtype is not None:
+        data = data.astype( dtype, copy=False )
+
+    # load lazy data when requested.  we compute rather than load xarray
+    # objects so the caller's data are not modified.
+    if not lazy and dask.is_dask_collection( data ):
+        data = data.compute()
+
+    # reduce each of a Dataset's variables separately so they are neither
+    # reduced together nor promoted to a common data type.
+    if isinstance( data, xarray.Dataset ):
+        variable_names      = list( data.data_vars )
+        lazy_variable_names = [variable_name for variable_name in variable_names
+                               if dask.is_dask_collection( data[variable_name].data )]
+
+        # reduce the lazy variables together so their chunk reads are
+        # scheduled as a single computation.
+        variables_statistics = dict( zip( lazy_variable_names,
+                                          _compute_dask_statistics( [data[variable_name].data
+                                                                     for variable_name in lazy_variable_names] ) ) )
+
+        for variable_name in variable_names:
+            if variable_name not in variables_statistics:
+                variables_statistics[variable_name] = compute_statistics( data[variable_name] )
+
+        # return the statistics in the Dataset's variable order.
+        return {variable_name: variables_statistics[variable_name]
+                for variable_name in variable_names}
+
+    # reduce lazy arrays in a single pass over their chunks.
+    if isinstance( data, xarray.DataArray ) and dask.is_dask_collection( data.data ):
+        return _compute_dask_statistics( [data.data] )[0]
+    elif not isinstance( data, xarray.DataArray ) and dask.is_dask_collection( data ):
+        return _compute_dask_statistics( [data] )[0]
+
+    # reduce in-memory NumPy arrays with bottleneck when it is available.  its
+    # reductions are specialized for each data type and compute the standard
+    # deviation in fewer passes than NumPy's.
+    #
+    # NOTE: NumPy arrays are reduced ignoring NaNs, with or without bottleneck,
+    #       which matches the behavior of xarray's reductions and our lazy
+    #       reductions.
+    #
+    if isinstance( data, np.ndarray ):
+        try:
+            import bottleneck
+        except ImportError:
+            bottleneck = None
+
+        if bottleneck is not None:
+            return (np.float64( bottleneck.nanmin( data ) ),
+                    np.float64( bottleneck.nanmax( data ) ),
+                    np.float64( bottleneck.nanstd( data ) ))
+
+        return (np.float64( np.nanmin( data ) ),
+                np.float64( np.nanmax( data ) ),
+                np.float64( np.nanstd( data ) ))
+
     # compute the minimum, maximum, and standard deviation.
     task_min = data.min()
     task_max = data.max()
     task_std = data.std()
 
-    if isinstance( data, (xarray.Dataset, xarray.DataArray) ):
+    if isinstance( data, xarray.DataArray ):
         #
-        # NOTE: this reduces over all grid variables as well as time steps.
-        #       caller is responsible for providing the correct data.
+        # NOTE: this reduces over all dimensions, including time steps.  caller
+        #       is responsible for providing the correct data.
+        #
+        # NOTE: we compute the underlying arrays directly so the results are
+        #       not wrapped in, and then unwrapped from, new DataArrays.
         #
         (variable_min,
          variable_max,
-         variable_std) = (task_min.compute().values,
-                          task_max.compute().values,
-                          task_std.compute().values)
+         variable_std) = map( np.float64,
+                              dask.compute( task_min.data,
+                                            task_max.data,
+                                            task_std.data ) )
     else:
         (variable_min,
          variable_max,
-         variable_std) = (task_min, task_max, task_std)
+         variable_std) = (np.float64( task_min ),
+                          np.float64( task_max ),
+                          np.float64( task_std ))
 
     return (variable_min, variable_max, variable_std)
 
+def _compute_block_moments( block ):
+    """
+    Computes the partial statistics of a single block of data.  NaNs are ignored
+    to match xarray's reductions.
+
+    Takes 1 argument:
+
+      block - NumPy array to compute partial statistics for.
+
+    Returns 1 value:
+
+      block_moments - Tuple of (count, minimum, maximum, mean, M2) where count is
+                      the number of values in block, and M2 is the sum of squared
+                      differences from the mean.  The mean and M2 are computed in
+                      double precision.  When count is zero, the remaining values
+                      are NaN.
+
+    """
+
+    values = block.ravel()
+    if values.dtype.kind == "f":
+        values = values[~np.isnan( values )]
+
+    if values.size == 0:
+        return (0, np.nan, np.nan, np.nan, np.nan)
+
+    mean = values.mean( dtype=np.float64 )
+
+    return (values.size,
+            values.min(),
+            values.max(),
+            mean,
+            np.square( values - mean ).sum())
+
+def _compute_dask_statistics( arrays ):
+    """
+    Computes the minimum, maximum, and standard deviation of one or more Dask
+    arrays in a single pass over their chunks.  Each chunk is read once and
+    reduced to a handful of partial statistics which are then combined with
+    Chan et al's parallel variance algorithm.  All of the arrays' chunks are
+    reduced in a single computation.
+
+    Takes 1 argument:
+
+      arrays - List of Dask arrays to compute statistics over.
+
+    Returns 1 value:
+
+      arrays_statistics - List of (minimum, maximum, stddev) tuples, one per
+                          array in arrays.  See _combine_block_moments() for
+                          details.
+
+    """
+
+    import dask
+
+    # build the per-chunk reductions for each array and remember where each
+    # array's chunks start and stop.
+    block_tasks   = []
+    block_offsets = [0]
+    for array in arrays:
+        block_tasks.extend( dask.delayed( _compute_block_moments )( block )
+                            for block in array.to_delayed().ravel() )
+        block_offsets.append( len( block_tasks ) )
+
+    blocks_moments = dask.compute( *block_tasks )
+
+    return [_combine_block_moments( blocks_moments[block_start:block_stop] )
+            for block_start, block_stop in zip( block_offsets[:-1], block_offsets[1:] )]
+
+def _combine_block_moments( blocks_moments ):
+    """
+    Combines the partial statistics of an array's blocks into the array's minimum,
+    maximum, and standard deviation.
+
+    Takes 1 argument:
+
+      blocks_moments - Sequence of block moments, one per block, as returned by
+                       _compute_block_moments().
+
+    Returns 3 values:
+
+      minimum - Minimum value of the blocks, as a numpy.float64 scalar.
+      maximum - Maximum value of the blocks, as a numpy.float64 scalar.
+      stddev  - Population standard deviation of the blocks, as a numpy.float64
+                scalar.
+
+    """
+
+    # ignore blocks without any values so they do not contribute NaNs.
+    blocks_moments = [block_moments for block_moments in blocks_moments
+                      if block_moments[0] > 0]
+
+    if len( blocks_moments ) == 0:
+        return (np.float64( np.nan ), np.float64( np.nan ), np.float64( np.nan ))
+
+    (counts,
+     minimums,
+     maximums,
+     means,
+     m2s) = map( np.array, zip( *blocks_moments ) )
+
+    # combine the blocks' means and squared deviations.  the deviation of each
+    # block's mean from the global mean accounts for the difference between the
+    # blocks' M2 and the global M2.
+    total_count = counts.sum()
+    mean        = (counts * means).sum() / total_count
+    m2          = m2s.sum() + (counts * np.square( means - mean )).sum()
+
+    return (np.float64( minimums.min() ),
+            np.float64( maximums.max() ),
+            np.float64( np.sqrt( m2 / total_count ) ))
+
 def save_statistics( statistics_path, statistics, pretty_flag=True ):
     """
     Serializes a statistics dictionary to disk as JSON.
@@ -62,23 +275,77 @@ def save_statistics( statistics_path, statistics, pretty_flag=True ):
 
     """
 
-    with open( statistics_path, "w" ) as statistics_fp:
-        #
-        # NOTE: we sort the dictionary keys so that it is easier to compare
-        #       different labels without custom tools.
-        #
-        json.dump( statistics, statistics_fp, indent=4, sort_keys=True )
+    #
+    # NOTE: we sort the dictionary keys so that it is easier to compare
+    #       different labels without custom tools.
+    #
+    if pretty_flag:
+        with open( statistics_path, "w" ) as statistics_fp:
+            json.dump( statistics, statistics_fp, indent=4, sort_keys=True )
+
+        return
+
+    # compact statistics are written with orjson when it is available as it
+    # encodes considerably faster than the standard library's json module.
+    # compute_statistics() returns NumPy scalars which orjson only encodes
+    # when asked to.
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        with open( statistics_path, "wb" ) as statistics_fp:
+            statistics_fp.write( orjson.dumps( statistics,
+                                               option=(orjson.OPT_SORT_KEYS |
+                                                       orjson.OPT_SERIALIZE_NUMPY) ) )
+    else:
+        with open( statistics_path, "w" ) as statistics_fp:
+            json.dump( statistics, statistics_fp, separators=(",", ":"), sort_keys=True )
 
     return
 
 def load_statistics( statistics_path ):
     """
-    Loads statistics from an on-disk JSON file.
+    Loads statistics from an on-disk JSON file.  Parsed statistics are cached
+    so repeated loads of an unchanged file do not re-parse it.  The cache is
+    keyed on the file's path, modification time, and size so changes on disk
+    are picked up by the next load.
 
     Takes 1 argument:
 
       statistics_path - Path to load statistics from.
 
+    Returns 1 value:
+
+      statistics - Dictionary of the statistics loaded.  Keys are variable names
+                   and the values are dictionaries containing the underlying
+                   statistics.  Each call returns a new copy of the statistics
+                   so callers may modify it freely.
+
+    """
+
+    statistics_stat = os.stat( statistics_path )
+
+    return copy.deepcopy( _load_statistics_cached( os.path.abspath( statistics_path ),
+                                                   statistics_stat.st_mtime_ns,
+                                                   statistics_stat.st_size ) )
+
+@functools.lru_cache( maxsize=32 )
+def _load_statistics_cached( statistics_path, modification_time, size ):
+    """
+    Loads statistics from an on-disk JSON file and caches the result.  The file's
+    modification time and size are not used beyond keying the cache.
+
+    NOTE: The statistics returned are shared between callers and must not be
+          modified.
+
+    Takes 3 arguments:
+
+      statistics_path   - Absolute path to load statistics from.
+      modification_time - Modification time of statistics_path, in nanoseconds.
+      size              - Size of statistics_path, in bytes.
+
     Returns 1 value:
 
       statistics - Dictionary of the statistics loaded.  Keys are variable names
@@ -87,7 +354,21 @@ def load_statistics( statistics_path ):
 
     """
 
-    with open( statistics_path, "r" ) as statistics_fp:
-        statistics = json.load( statistics_fp )
+    #
+    # NOTE: we prefer orjson as it parses considerably faster than the standard
+    #       library's json module, though it is not required.  both raise
+    #       ValueError-derived exceptions for malformed input.
+    #
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        with open( statistics_path, "rb" ) as statistics_fp:
+            statistics = orjson.loads( statistics_fp.read() )
+    else:
+        with open( statistics_path, "r" ) as statistics_fp:
+            statistics = json.load( statistics_fp )
 
     return statistics
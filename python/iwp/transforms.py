@@ -1,5 +1,9 @@
+import collections
+import copy
+import functools
 import math
 import netCDF4 as nc
+import numpy as np
 
 import iwp.wavelet
 
@@ -82,8 +86,9 @@ import iwp.wavelet
 #
 # NOTE: these need to stay in sync with lookup_transform()'s documentation.
 #
-SYMMETRIC_MORLET_MAX_MODULUS  = "symmetric_morlet_max_modulus"
-SYMMETRIC_MORLET_SINGLE_SCALE = "symmetric_morlet_single_scale"
+SYMMETRIC_MORLET_MAX_MODULUS     = "symmetric_morlet_max_modulus"
+SYMMETRIC_MORLET_MAX_MODULUS_GPU = "symmetric_morlet_max_modulus_gpu"
+SYMMETRIC_MORLET_SINGLE_SCALE    = "symmetric_morlet_single_scale"
 
 class IWPnetCDFTransformer( object ):
     """
@@ -107,7 +112,7 @@ class IWPnetCDFTransformer( object ):
 
     """
 
-    def __init__( self, input_name, output_names, transform_specs, verbose_flag=False ):
+    def __init__( self, input_name, output_names, transform_specs, verbose_flag=False, chunk_cache_bytes=None, chunk_cache_nelems=None, fft_threads=None ):
         """
         Creates an IWPnetCDFTransformer object that will apply one or more
         transformations from a reference variable in a netCDF4 file and write the
@@ -120,23 +125,37 @@ class IWPnetCDFTransformer( object ):
         incompatible with the internal parameters (e.g.  the reference variable doesn't
         exist).
 
-        Takes 4 arguments:
-
-          input_name      - Name of the reference variable to apply transformations to.
-
-                              NOTE: This must exist in the netCDF4 file supplied when
-                                     transformations are applied.  Processing is aborted
-                                     and an error returned if it does not.
-
-          output_names    - List of variable names to write transformer outputs.  These
-                            will either be created or overwritten depending on whether
-                            they exist at the time when transformations are applied.  Must
-                            have the same number of elements as transformer_specs.
-          transform_specs - List of transformation specifications (see lookup_transform()
-                            for details) to instantiate and apply to input_name during
-                            transformation application.
-          verbose_flag    - Optional boolean flag specifying whether execution should
-                            be verbose.  If omitted, defaults to False.
+        Takes 7 arguments:
+
+          input_name         - Name of the reference variable to apply transformations to.
+
+                                 NOTE: This must exist in the netCDF4 file supplied when
+                                        transformations are applied.  Processing is aborted
+                                        and an error returned if it does not.
+
+          output_names       - List of variable names to write transformer outputs.  These
+                               will either be created or overwritten depending on whether
+                               they exist at the time when transformations are applied.  Must
+                               have the same number of elements as transformer_specs.
+          transform_specs    - List of transformation specifications (see lookup_transform()
+                               for details) to instantiate and apply to input_name during
+                               transformation application.
+          verbose_flag       - Optional boolean flag specifying whether execution should
+                               be verbose.  If omitted, defaults to False.
+          chunk_cache_bytes  - Optional positive integer specifying the size, in bytes,
+                               of the chunk cache for the reference and output variables.
+                               If omitted, defaults to None and each variable's cache is
+                               sized to hold at least four of its chunks.
+          chunk_cache_nelems - Optional positive integer specifying the number of chunk
+                               slots in the chunk cache for the reference and output
+                               variables.  If omitted, defaults to None and netCDF4's
+                               current setting is used.
+          fft_threads        - Optional positive integer specifying the number of
+                               threads each FFT is computed with.  When supplied, the
+                               CWTs' FFTs are computed with pyFFTW in the process
+                               applying the transforms.  See iwp.wavelet.enable_pyfftw()
+                               for details.  If omitted, defaults to None and NumPy's
+                               FFTs are used.
 
         Returns 1 value:
 
@@ -156,6 +175,23 @@ class IWPnetCDFTransformer( object ):
             raise ValueError( "Output names must be non-empty.  At least one name "
                               "is invalid ('{:s}').".format(
                                   output_names ) )
+        elif chunk_cache_bytes is not None and chunk_cache_bytes <= 0:
+            raise ValueError( "Chunk cache size must be positive ({:d}).".format(
+                chunk_cache_bytes ) )
+        elif chunk_cache_nelems is not None and chunk_cache_nelems <= 0:
+            raise ValueError( "Chunk cache slots must be positive ({:d}).".format(
+                chunk_cache_nelems ) )
+        elif fft_threads is not None and fft_threads <= 0:
+            raise ValueError( "FFT threads must be positive ({:d}).".format(
+                fft_threads ) )
+
+        # reject pyFFTW up front, rather than in the parallel workers, if it
+        # is not available.
+        if fft_threads is not None:
+            try:
+                import pyfftw
+            except ImportError:
+                raise ValueError( "pyFFTW is required for threaded FFTs but is not available." )
 
         # make sure we have valid transform specifications.  let the user know
         # about problems now, rather than later, when we're potentially in a
@@ -171,6 +207,11 @@ class IWPnetCDFTransformer( object ):
 
         self._verbose_flag = verbose_flag
 
+        self._chunk_cache_bytes  = chunk_cache_bytes
+        self._chunk_cache_nelems = chunk_cache_nelems
+
+        self._fft_threads = fft_threads
+
         #
         # NOTE: we store the transform specifications at object construction so
         #       that we meet Python's pickling requirements of no
@@ -240,6 +281,17 @@ class IWPnetCDFTransformer( object ):
                                             netcdf_path ) )
 
                 reference_variable = input_nc.variables[self._input_name]
+                self._set_chunk_cache( reference_variable )
+
+                # read and write blocks of XY slices that span the reference's
+                # chunks along Z so each chunk is decoded once rather than once
+                # per slice.  contiguous variables are worked in fixed size
+                # blocks.
+                reference_chunking = reference_variable.chunking()
+                if reference_chunking == "contiguous":
+                    z_block_size = 64
+                else:
+                    z_block_size = reference_chunking[0]
 
                 # walk through each the transforms.
                 for transform_index, transform_tuple in enumerate( self._transforms ):
@@ -279,12 +331,27 @@ class IWPnetCDFTransformer( object ):
                         print( "  '{:s}' already exists.".format(
                             variable_name ) )
 
-                    # work each of the XY slices one at a time.
-                    for z_index in range( reference_variable.shape[0] ):
-                        if (z_index % 50) == 0 and self._verbose_flag:
-                            print( "        Z={:d}".format( z_index ) )
+                    output_variable = input_nc.variables[variable_name]
+                    self._set_chunk_cache( output_variable )
+
+                    # work through blocks of XY slices, transforming each of
+                    # a block's slices in memory before writing it back.
+                    for z_start in range( 0, reference_variable.shape[0], z_block_size ):
+                        z_end = min( z_start + z_block_size, reference_variable.shape[0] )
+
+                        reference_block   = reference_variable[z_start:z_end, :, :]
+                        transformed_block = np.empty( reference_block.shape,
+                                                      dtype=output_variable.dtype )
+
+                        for block_index in range( reference_block.shape[0] ):
+                            z_index = z_start + block_index
+
+                            if (z_index % 50) == 0 and self._verbose_flag:
+                                print( "        Z={:d}".format( z_index ) )
+
+                            transformed_block[block_index, ...] = transform( reference_block[block_index, :, :] )
 
-                        input_nc[variable_name][z_index, :, :] = transform( reference_variable[z_index, :, :] )
+                        output_variable[z_start:z_end, :, :] = transformed_block
 
         except Exception as e:
             # XXX: we may need something more descriptive here
@@ -292,6 +359,44 @@ class IWPnetCDFTransformer( object ):
 
         return (0, "Success")
 
+    def _set_chunk_cache( self, variable ):
+        """
+        Sizes a netCDF4 variable's chunk cache so that blocks of XY slices can be
+        read or written without evicting chunks that are still in use.  The cache
+        is never shrunk below its current size.  Contiguous variables are left
+        as is.
+
+        Takes 1 argument:
+
+          variable - netCDF4.Variable object whose chunk cache is set.
+
+        Returns nothing.
+
+        """
+
+        chunking = variable.chunking()
+
+        # contiguous variables are read directly and do not use the chunk cache.
+        if chunking == "contiguous":
+            return
+
+        (cache_bytes,
+         cache_nelems,
+         cache_preemption) = variable.get_var_chunk_cache()
+
+        if self._chunk_cache_bytes is not None:
+            cache_bytes = self._chunk_cache_bytes
+        else:
+            cache_bytes = max( cache_bytes,
+                               4 * math.prod( chunking ) * variable.dtype.itemsize )
+
+        if self._chunk_cache_nelems is not None:
+            cache_nelems = self._chunk_cache_nelems
+
+        variable.set_var_chunk_cache( size=cache_bytes,
+                                      nelems=cache_nelems,
+                                      preemption=cache_preemption )
+
     def _setup_transforms( self ):
         """
         Translates transformer specifications into the underlying transform functions.
@@ -304,6 +409,11 @@ class IWPnetCDFTransformer( object ):
 
         """
 
+        # switch the FFT backend in the process applying the transforms.  this
+        # is typically a worker that did not inherit the caller's state.
+        if self._fft_threads is not None:
+            iwp.wavelet.enable_pyfftw( number_threads=self._fft_threads )
+
         #
         # NOTE: while this is normally fragile, though we can't get here unless
         #       the object was constructed with one or more valid transform
@@ -327,6 +437,10 @@ def get_symmetric_morlet_max_modulus_transform( transform_parameters ):
 
     See iwp.wavelet.cwt_2d() for details on the CWT.
 
+    NOTE: The transform returned is not re-entrant.  It reuses internal work
+          buffers between calls and must not be called concurrently from
+          multiple threads.  Get a transform per thread instead.
+
     Takes 1 argument:
 
       transform_parameters - Dictionary with the following (key, value) pairs:
@@ -335,9 +449,9 @@ def get_symmetric_morlet_max_modulus_transform( transform_parameters ):
                                              preferred orientation of the Morlet CWT.
                                              The symmetric Morlet CWT is computed at
                                              both alpha and -alpha.
-                               scales      - List of floating point values specifying
-                                             the length scales to compute the Morlet CWT
-                                             at.
+                               scales      - List or 1D NumPy array of floating point
+                                             values specifying the length scales to
+                                             compute the Morlet CWT at.
                                scale_index - Optional integer specifying the scale in
                                              scales to compute the Morlet CWT at.  If
                                              omitted, defaults to 0 and selects the
@@ -350,10 +464,33 @@ def get_symmetric_morlet_max_modulus_transform( transform_parameters ):
     """
 
     # name the parameters we use in the transformer build process for clarity.
-    preferred_angle = transform_parameters["alpha"]
-    length_scales   = transform_parameters["scales"]
-
-    def symmetric_morlet_max_modulus_transform( data, minimum_value=None ):
+    #
+    # NOTE: we freeze the length scales into a tuple of floats so the
+    #       transformer is specialized to them and does not change if the
+    #       caller later modifies the parameters.
+    #
+    preferred_angle = float( transform_parameters["alpha"] )
+    length_scales   = tuple( map( float, transform_parameters["scales"] ) )
+
+    # wavelet filters for the most recently transformed data's shape and
+    # precision.  the filters only depend on those and are otherwise fixed for
+    # this transformer, so they are built once and reused for each call.
+    #
+    # NOTE: we only keep a single shape's filters as transformers are typically
+    #       applied to a sequence of identically shaped slices.
+    #
+    wavelet_filters_map = {}
+
+    # intermediate buffers for the CWTs.  these are kept between calls so
+    # transforming a sequence of identically shaped slices does not reallocate
+    # them for each.
+    #
+    # NOTE: this makes the transformer unsafe to call concurrently from
+    #       multiple threads.  use a transformer per thread instead.
+    #
+    work_buffers = {}
+
+    def symmetric_morlet_max_modulus_transform( data, minimum_value=None, dtype=None, number_workers=1, out=None ):
         """
         Computes the modulus of a symmetric 2D continuous wavelet transform (CWT) using
         a directional Morlet wavelet function, at multiple length scales, and returns its
@@ -371,16 +508,39 @@ def get_symmetric_morlet_max_modulus_transform( transform_parameters ):
 
         See iwp.wavelet.cwt_2d() for details on the CWT.
 
-        Takes 2 arguments:
-
-          data          - 2D NumPy array to compute the 2D CWT modulus for.
-          minimum_value - Optional lower bound to clamp the modulus with.  If omitted,
-                          defaults to a small value near zero.
+        NOTE: This transform is not re-entrant.  It reuses internal work buffers
+              between calls and must not be called concurrently from multiple
+              threads.
+
+        Takes 5 arguments:
+
+          data           - 2D NumPy array to compute the 2D CWT modulus for.  May
+                           also be a 3D NumPy array, shaped (number_frames, height,
+                           width), to compute the 2D CWT modulus of each frame as
+                           a batch.
+          minimum_value  - Optional lower bound to clamp the modulus with.  If omitted,
+                           defaults to a small value near zero.
+          dtype          - Optional NumPy floating point data type to compute the
+                           transform in.  data is converted to dtype and the CWTs
+                           are computed entirely in its precision.  Specifying
+                           numpy.float32 halves the memory traffic of the transform
+                           at the cost of accuracy.  If omitted, defaults to None and
+                           the transform is computed in data's precision with double
+                           precision wavelet filters.
+          number_workers - Optional positive integer specifying the number of threads
+                           to compute the CWTs with.  If omitted, defaults to 1 and
+                           the CWTs are computed serially.
+          out            - Optional NumPy array to write the maximum modulus into.
+                           Must have data's shape and the precision the transform is
+                           computed in.  Reusing one array across calls avoids
+                           allocating a new output for each.  If omitted, defaults
+                           to None and a new array is allocated.
 
         Returns 1 value:
 
-          transformed_data - 2D NumPy array containing the maximum modulus across the
-                             computed CWTs.
+          transformed_data - NumPy array, shaped like data, containing the maximum
+                             modulus across the computed CWTs.  This is out when
+                             it is supplied.
 
         """
 
@@ -388,19 +548,37 @@ def get_symmetric_morlet_max_modulus_transform( transform_parameters ):
         if minimum_value is None:
             minimum_value = 1e-7
 
-        return iwp.wavelet.cwt_max_modulus( [iwp.wavelet.cwt_2d( data,
-                                                                 length_scales,
-                                                                 "morlet",
-                                                                 alpha=preferred_angle ),
-                                             iwp.wavelet.cwt_2d( data,
-                                                                 length_scales,
-                                                                 "morlet",
-                                                                 alpha=(-1.0 * preferred_angle) )],
-                                             minimum_value=minimum_value )
+        # convert the data to the requested precision and pick filters to match.
+        if dtype is None:
+            filter_dtype = np.dtype( np.float64 )
+        else:
+            data         = data.astype( dtype, copy=False )
+            filter_dtype = data.dtype
+
+        # build the wavelet filters if this is a new frame shape or precision.
+        # stacks of frames share the filters of a single frame.
+        filters_key = (data.shape[-2:], filter_dtype)
+        if filters_key not in wavelet_filters_map:
+            wavelet_filters_map.clear()
+            wavelet_filters_map[filters_key] = iwp.wavelet.create_symmetric_morlet_filters( data.shape[-1],
+                                                                                            data.shape[-2],
+                                                                                            length_scales,
+                                                                                            preferred_angle,
+                                                                                            dtype=filter_dtype )
+
+        return iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                         length_scales,
+                                                         preferred_angle,
+                                                         minimum_value=minimum_value,
+                                                         wavelet_filters=wavelet_filters_map[filters_key],
+                                                         number_workers=number_workers,
+                                                         out=out,
+                                                         work_buffers=work_buffers )
 
     # update the transform's docstring with its parameters so it is
     # self-descriptive.
-    symmetric_morlet_max_modulus_transform.__doc__ = symmetric_morlet_max_modulus_transform.__doc__.format(
+    symmetric_morlet_max_modulus_transform.__doc__ = _format_transform_docstring(
+        symmetric_morlet_max_modulus_transform.__doc__,
         alpha=preferred_angle,
         length_scales=length_scales )
 
@@ -430,10 +608,17 @@ def parse_symmetric_morlet_max_modulus_parameters( parameter_map ):
 
     Returns 1 value:
 
-      parameter_map - Dictionary of parameters with type cast values.
+      parameter_map - Dictionary of parameters with type cast values.  The length
+                      scales are parsed into a 1D NumPy array of numpy.float64's.
 
     """
 
+    # make sure the required parameters are present before parsing them.
+    for parameter_name in ["alpha", "scales"]:
+        if parameter_name not in parameter_map:
+            raise ValueError( "Missing the required parameter \"{:s}\".".format(
+                parameter_name ) )
+
     # parse a floating point angle.
     try:
         parameter_map["alpha"] = float( parameter_map["alpha"] )
@@ -448,22 +633,34 @@ def parse_symmetric_morlet_max_modulus_parameters( parameter_map ):
         raise ValueError( "Alpha is not finite ({:f}).".format(
             parameter_map["alpha"] ) )
 
-    # parse a list of floating point values.
+    # parse a list of floating point values into an array.  NumPy converts
+    # each of the strings and rejects those that are not numbers.
     try:
-        parameter_map["scales"] = list( map( lambda scale: float( scale ),
-                                             parameter_map["scales"].split( "," ) ) )
+        parameter_map["scales"] = np.array( parameter_map["scales"].split( "," ),
+                                            dtype=np.float64 )
     except Exception as e:
         raise ValueError( "Failed to parse a list of floating point length "
                           "scales, \"scales\", from '{:s}' ({:s}).".format(
                               parameter_map["scales"],
                               str( e ) ) )
 
-    # ensure all of the length scales are finite.
-    if not all( map( lambda scale: math.isfinite( scale ) and scale > 0,
-                     parameter_map["scales"] ) ):
-        raise ValueError( "Length scales must be positive and finite ({:s}).".format(
-            ", ".join( map( lambda scale: str( scale ),
-                            parameter_map["scales"] ) ) ) )
+    # ensure all of the length scales are finite.  identify the invalid scales
+    # in a single pass so they can be reported.
+    invalid_scales_mask = ~(np.isfinite( parameter_map["scales"] ) &
+                            (parameter_map["scales"] > 0))
+
+    number_invalid_scales = np.count_nonzero( invalid_scales_mask )
+
+    if number_invalid_scales > 0:
+        scales_str = ", ".join( map( str, parameter_map["scales"] ) )
+
+        raise ValueError( "Length scales must be positive and finite ({:s}).  "
+                          "Scale{:s} at ind{:s} {:s} {:s} invalid.".format(
+            scales_str,
+            "" if number_invalid_scales == 1 else "s",
+            "ex" if number_invalid_scales == 1 else "ices",
+            ", ".join( map( str, np.flatnonzero( invalid_scales_mask ) ) ),
+            "is" if number_invalid_scales == 1 else "are" ) )
 
     # make sure we have at least one length scale to work with.
     if len( parameter_map["scales"] ) == 0:
@@ -471,6 +668,112 @@ def parse_symmetric_morlet_max_modulus_parameters( parameter_map ):
 
     return parameter_map
 
+def get_symmetric_morlet_max_modulus_gpu_transform( transform_parameters ):
+    """
+    Gets a transform function to compute the modulus of a symmetric 2D continuous
+    wavelet transform (CWT) using a directional Morlet wavelet function at multiple
+    length scales on a GPU.  Identical to get_symmetric_morlet_max_modulus_transform()
+    except that the CWTs are computed on the GPU with CuPy.  Data are copied to the
+    GPU once per call and only the maximum modulus is copied back.
+
+    See iwp.wavelet.symmetric_morlet_max_modulus_gpu() for details.
+
+    Takes 1 argument:
+
+      transform_parameters - Dictionary with the following (key, value) pairs:
+
+                               alpha       - Floating point angle specifying the
+                                             preferred orientation of the Morlet CWT.
+                                             The symmetric Morlet CWT is computed at
+                                             both alpha and -alpha.
+                               scales      - List or 1D NumPy array of floating point
+                                             values specifying the length scales to
+                                             compute the Morlet CWT at.
+
+    Returns 1 value:
+
+      transform_function - Function to compute the transform.
+
+    """
+
+    # name the parameters we use in the transformer build process for clarity.
+    # freeze the length scales like get_symmetric_morlet_max_modulus_transform().
+    preferred_angle = float( transform_parameters["alpha"] )
+    length_scales   = tuple( map( float, transform_parameters["scales"] ) )
+
+    def symmetric_morlet_max_modulus_gpu_transform( data, minimum_value=None ):
+        """
+        Computes the modulus of a symmetric 2D continuous wavelet transform (CWT) using
+        a directional Morlet wavelet function, at multiple length scales, on a GPU and
+        returns its modulus.
+
+        This transform computes with the following parameters:
+
+          alpha:  {{{alpha:.1f}, -{alpha:.1f}}} degrees
+          scales: {length_scales}
+
+        See iwp.wavelet.symmetric_morlet_max_modulus_gpu() for details.
+
+        Takes 2 arguments:
+
+          data          - 2D NumPy array to compute the 2D CWT modulus for.
+          minimum_value - Optional lower bound to clamp the modulus with.  If omitted,
+                          defaults to a small value near zero.
+
+        Returns 1 value:
+
+          transformed_data - 2D NumPy array containing the maximum modulus across the
+                             computed CWTs.
+
+        """
+
+        # pick a lower bound close to zero if the caller does not provide one.
+        if minimum_value is None:
+            minimum_value = 1e-7
+
+        return iwp.wavelet.symmetric_morlet_max_modulus_gpu( data,
+                                                             length_scales,
+                                                             preferred_angle,
+                                                             minimum_value=minimum_value )
+
+    # update the transform's docstring with its parameters so it is
+    # self-descriptive.
+    symmetric_morlet_max_modulus_gpu_transform.__doc__ = _format_transform_docstring(
+        symmetric_morlet_max_modulus_gpu_transform.__doc__,
+        alpha=preferred_angle,
+        length_scales=length_scales )
+
+    return symmetric_morlet_max_modulus_gpu_transform
+
+def parse_symmetric_morlet_max_modulus_gpu_parameters( parameter_map ):
+    """
+    Parses parameters for the maximum modulus, symmetric Morlet wavelet GPU
+    generator.  Accepts the same parameters as
+    parse_symmetric_morlet_max_modulus_parameters().
+
+    Raises ValueError if CuPy is not available, or for any of the reasons
+    parse_symmetric_morlet_max_modulus_parameters() does.
+
+    Takes 1 argument:
+
+      parameter_map - Dictionary of parameters to parse for
+                      get_symmetric_morlet_max_modulus_gpu_transform().
+
+    Returns 1 value:
+
+      parameter_map - Dictionary of parameters with type cast values.
+
+    """
+
+    # reject the transform up front, rather than when it is first applied, if
+    # there is no GPU support.
+    try:
+        import cupy
+    except ImportError:
+        raise ValueError( "CuPy is required for GPU transforms but is not available." )
+
+    return parse_symmetric_morlet_max_modulus_parameters( parameter_map )
+
 def get_symmetric_morlet_single_scale_transform( transform_parameters ):
     """
     Gets a transform function to compute the modulus of a symmetric 2D continuous
@@ -485,6 +788,10 @@ def get_symmetric_morlet_single_scale_transform( transform_parameters ):
 
     See iwp.wavelet.cwt_2d() for details on the CWT.
 
+    NOTE: The transform returned is not re-entrant.  It reuses internal work
+          buffers between calls and must not be called concurrently from
+          multiple threads.  Get a transform per thread instead.
+
     Takes 1 argument:
 
       transform_parameters - Dictionary with the following (key, value) pairs:
@@ -493,9 +800,9 @@ def get_symmetric_morlet_single_scale_transform( transform_parameters ):
                                              preferred orientation of the Morlet CWT.
                                              The symmetric Morlet CWT is computed at
                                              both alpha and -alpha.
-                               scales      - List of floating point values specifying
-                                             the length scales to compute the Morlet CWT
-                                             at.
+                               scales      - List or 1D NumPy array of floating point
+                                             values specifying the length scales to
+                                             compute the Morlet CWT at.
                                scale_index - Optional integer specifying the scale in
                                              scales to compute the Morlet CWT at.  If
                                              omitted, defaults to 0 and selects the
@@ -508,13 +815,21 @@ def get_symmetric_morlet_single_scale_transform( transform_parameters ):
     """
 
     # name the parameters we use in the transformer build process for clarity.
-    preferred_angle = transform_parameters["alpha"]
+    preferred_angle = float( transform_parameters["alpha"] )
     length_scales   = transform_parameters["scales"]
     scale_index     = transform_parameters.get( "scale_index", 0 )
 
-    length_scale = length_scales[scale_index]
+    # specialize the transformer to its single length scale by delegating to a
+    # maximum modulus transformer with a one element sequence of scales.  this
+    # shares its cached wavelet filters and fused computation.
+    length_scale = float( length_scales[scale_index] )
+
+    max_modulus_transform = get_symmetric_morlet_max_modulus_transform( {
+        "alpha":  preferred_angle,
+        "scales": (length_scale,)
+    } )
 
-    def symmetric_morlet_single_scale_transform( data, minimum_value=None ):
+    def symmetric_morlet_single_scale_transform( data, minimum_value=None, dtype=None, out=None ):
         """
         Computes the modulus of a symmetric 2D continuous wavelet transform (CWT) using
         a directional Morlet wavelet function, at a single length scale, and returns its
@@ -532,36 +847,42 @@ def get_symmetric_morlet_single_scale_transform( transform_parameters ):
 
         See iwp.wavelet.cwt_2d() for details on the CWT.
 
-        Takes 2 arguments:
+        NOTE: This transform is not re-entrant.  It reuses internal work buffers
+              between calls and must not be called concurrently from multiple
+              threads.
 
-          data          - 2D NumPy array to compute the 2D CWT modulus for.
+        Takes 4 arguments:
+
+          data          - 2D NumPy array to compute the 2D CWT modulus for.  May also
+                          be a 3D NumPy array of frames.  See
+                          get_symmetric_morlet_max_modulus_transform() for details.
           minimum_value - Optional lower bound to clamp the modulus with.  If omitted,
                           defaults to a small value near zero.
+          dtype         - Optional NumPy floating point data type to compute the
+                          transform in.  See get_symmetric_morlet_max_modulus_transform()
+                          for details.  If omitted, defaults to None and the transform
+                          is computed in data's precision.
+          out           - Optional NumPy array to write the modulus into.  See
+                          get_symmetric_morlet_max_modulus_transform() for details.
+                          If omitted, defaults to None and a new array is allocated.
 
         Returns 1 value:
 
-          transformed_data - 2D NumPy array containing the maximum modulus across the
-                             computed CWTs.
+          transformed_data - NumPy array, shaped like data, containing the maximum
+                             modulus across the computed CWTs.  This is out when
+                             it is supplied.
 
         """
 
-        # pick a lower bound close to zero if the caller does not provide one.
-        if minimum_value is None:
-            minimum_value = 1e-7
-
-        return iwp.wavelet.cwt_max_modulus( [iwp.wavelet.cwt_2d( data,
-                                                                 [length_scale],
-                                                                 "morlet",
-                                                                 alpha=preferred_angle ),
-                                             iwp.wavelet.cwt_2d( data,
-                                                                 [length_scale],
-                                                                 "morlet",
-                                                                 alpha=(-1.0 * preferred_angle) )],
-                                             minimum_value=minimum_value )
+        return max_modulus_transform( data,
+                                      minimum_value=minimum_value,
+                                      dtype=dtype,
+                                      out=out )
 
     # update the transform's docstring with its parameters so it is
     # self-descriptive.
-    symmetric_morlet_single_scale_transform.__doc__ = symmetric_morlet_single_scale_transform.__doc__.format(
+    symmetric_morlet_single_scale_transform.__doc__ = _format_transform_docstring(
+        symmetric_morlet_single_scale_transform.__doc__,
         alpha=preferred_angle,
         length_scale=length_scale )
 
@@ -621,9 +942,36 @@ def parse_symmetric_morlet_single_scale_parameters( parameter_map ):
 
     return parameter_map
 
+#
+# NOTE: transformers with the same parameters share their formatted docstring
+#       so repeatedly building them does not reformat it each time.
+#
+@functools.lru_cache( maxsize=128 )
+def _format_transform_docstring( docstring_template, **parameters ):
+    """
+    Formats a transform's docstring template with its parameters.  Tuples of
+    parameters are formatted as lists.
+
+    Takes 2 arguments:
+
+      docstring_template - Docstring to format with str.format().
+      parameters         - Keyword arguments of hashable parameter values
+                           referenced in docstring_template.
+
+    Returns 1 value:
+
+      docstring - Formatted docstring.
+
+    """
+
+    return docstring_template.format( **{name: list( value ) if isinstance( value, tuple ) else value
+                                         for name, value in parameters.items()} )
+
 def _parse_transform_spec( transform_spec ):
     """
     Parses a transform specification into its name and parameters dictionary.
+    Parsed specifications are cached so repeatedly parsing the same specification
+    does not re-validate its parameters.
 
     Raises ValueError if the specification is invalid, it represents an unknown
     transform, or if the encoded parameters do not match the transform's expected
@@ -639,30 +987,59 @@ def _parse_transform_spec( transform_spec ):
       transform_name       - Name of the specified transform.
       transform_parameters - Dictionary of parameters for the specified transform.
                              Dictionary values are cast to the types expected
-                             the transform.
+                             the transform.  Each call returns a new copy of the
+                             parameters so callers may modify them freely.
 
     """
 
-    try:
-        # break the "<name>:<parameters>" string.  make sure we don't break
-        # the <parameters> into multiple components so it can contain colons
-        # in the (key, value) pairs.
-        (transform_name,
-         transform_parameters_spec) = transform_spec.split( ":",
-                                                            maxsplit=1 )
-    except ValueError:
+    (transform_name,
+     transform_parameters) = _parse_transform_spec_cached( transform_spec )
+
+    return (transform_name, copy.deepcopy( transform_parameters ))
+
+#
+# NOTE: cache the last N specifications parsed.  invalid specifications raise
+#       and are not cached.
+#
+@functools.lru_cache( maxsize=128 )
+def _parse_transform_spec_cached( transform_spec ):
+    """
+    Parses a transform specification into its name and parameters dictionary.
+    See _parse_transform_spec() for details.
+
+    NOTE: The parameters returned are shared between callers and must not be
+          modified.
+
+    Takes 1 argument:
+
+      transform_spec - Transform specification string.  See lookup_transform() for
+                       details.
+
+    Returns 2 values:
+
+      transform_name       - Name of the specified transform.
+      transform_parameters - Dictionary of parameters for the specified transform.
+
+    """
+
+    # break the "<name>:<parameters>" string.  make sure we don't break
+    # the <parameters> into multiple components so it can contain colons
+    # in the (key, value) pairs.
+    (transform_name,
+     separator,
+     transform_parameters_spec) = transform_spec.partition( ":" )
+
+    if len( separator ) == 0:
         raise ValueError( "Failed to get a transform name and parameters "
                           "specification from '{:s}'.".format(
                           transform_spec ) )
 
-    # make sure this is a known transform.
-    if transform_name not in _transform_map:
+    # make sure this is a known transform and get its parameter parser.
+    transform_entry = _transform_map.get( transform_name )
+    if transform_entry is None:
         raise ValueError( "Unknown transform '{:s}'!".format(
             transform_name ) )
 
-    # get the associated parameter parser for this transform.
-    _, parameter_parser = _transform_map[transform_name]
-
     try:
         # split the remaining <parameters> into (key, value) pairs.  each
         # (key, value) set is colon-delimited, and each set equal
@@ -670,11 +1047,18 @@ def _parse_transform_spec( transform_spec ):
         #
         # e.g. "parameter1=value1:parameter2=value2a,value2b,value2c"
         #
-        transform_parameters = dict( map( lambda key_value: key_value.split( "=" ),
-                                          transform_parameters_spec.split( ":" ) ) )
+        transform_parameters = {}
+        for key_value in transform_parameters_spec.split( ":" ):
+            key, separator, value = key_value.partition( "=" )
+
+            if len( separator ) == 0 or "=" in value:
+                raise ValueError( "'{:s}' is not a <key>=<value> pair".format(
+                    key_value ) )
+
+            transform_parameters[key] = value
 
         # map individual parameters to their expected data types.
-        transform_parameters = parameter_parser( transform_parameters )
+        transform_parameters = transform_entry.parser( transform_parameters )
     except ValueError as e:
         raise ValueError( "<parameters> -> (<key>, <value>) ({:s})".format(
             str( e ) ) )
@@ -728,6 +1112,14 @@ def lookup_transform( transform_spec ):
                                               the maximum modulus across all length scales
                                               for each (x, y) point in the 2D CWT.
 
+       Symmetric Morlet - Maximum Modulus     Constant: SYMMETRIC_MORLET_MAX_MODULUS_GPU
+         (GPU)                                Name:     "symmetric_morlet_max_modulus_gpu"
+                                              Function: get_symmetric_morlet_max_modulus_gpu_transform()
+
+                                              Computes the same as the Symmetric Morlet -
+                                              Maximum Modulus transform on a GPU.
+                                              Requires CuPy.
+
        Symmetric Morlet - Single Scale        Constant: SYMMETRIC_MORLET_SINGLE_SCALE
                                               Name:     "symmetric_morlet_single_scale"
                                               Function: get_symmetric_morlet_single_scale_transform()
@@ -778,7 +1170,7 @@ def lookup_transform( transform_spec ):
 
     # route the parameters to the appropriate transform builder.
     try:
-        transform = _transform_map[transform_name][0]( transform_parameters )
+        transform = _transform_map[transform_name].generator( transform_parameters )
     except ValueError as e:
         raise ValueError( "Failed to get a transform function for '{:s}' ({:s}).".format(
             transform_name,
@@ -786,11 +1178,15 @@ def lookup_transform( transform_spec ):
 
     return (transform, transform_name, transform_parameters)
 
-# internal mapping from symbolic name to 1) the transform generator and 2) the
-# generator's parameter parser.
+# pairing of a transform's generator and the generator's parameter parser.
+_TransformEntry = collections.namedtuple( "_TransformEntry", ["generator", "parser"] )
+
+# internal mapping from symbolic name to the transform's entry.
 _transform_map = {
-    SYMMETRIC_MORLET_MAX_MODULUS:  (get_symmetric_morlet_max_modulus_transform,
-                                    parse_symmetric_morlet_max_modulus_parameters),
-    SYMMETRIC_MORLET_SINGLE_SCALE: (get_symmetric_morlet_single_scale_transform,
-                                    parse_symmetric_morlet_single_scale_parameters)
+    SYMMETRIC_MORLET_MAX_MODULUS:     _TransformEntry( get_symmetric_morlet_max_modulus_transform,
+                                                       parse_symmetric_morlet_max_modulus_parameters ),
+    SYMMETRIC_MORLET_MAX_MODULUS_GPU: _TransformEntry( get_symmetric_morlet_max_modulus_gpu_transform,
+                                                       parse_symmetric_morlet_max_modulus_gpu_parameters ),
+    SYMMETRIC_MORLET_SINGLE_SCALE:    _TransformEntry( get_symmetric_morlet_single_scale_transform,
+                                                       parse_symmetric_morlet_single_scale_parameters )
 }
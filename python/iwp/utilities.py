@@ -171,20 +171,30 @@ def validate_variables_and_ranges( dataset, variable_names, time_step_indices, x
             type( dataset ) ) )
 
     # verify that each of the time step indices provided is the data value of
-    # at least one cycle.
-    for time_step_index in time_step_indices:
-        if time_step_index not in truth_time_step_indices:
-            raise ValueError( "Time step index {:d} is not present in the dataset.".format(
-                time_step_index ) )
+    # at least one cycle.  all of the indices are checked at once and the first
+    # that is missing is reported.
+    time_step_indices = np.asarray( time_step_indices, dtype=np.int64 )
+    missing_mask      = ~np.isin( time_step_indices,
+                                  np.asarray( truth_time_step_indices ) )
+
+    if missing_mask.any():
+        raise ValueError( "Time step index {:d} is not present in the dataset.".format(
+            time_step_indices[np.argmax( missing_mask )] ) )
 
     # verify that the XY slice indices map to a valid Z slice.
-    for xy_slice_index in xy_slice_indices:
-        if xy_slice_index > len( truth_xy_slice_indices ):
-            raise ValueError( "XY slice index {:d} is not present in the dataset.".format(
-                xy_slice_index ) )
-        elif xy_slice_index < 0:
+    xy_slice_indices = np.asarray( xy_slice_indices, dtype=np.int64 )
+    invalid_mask     = ((xy_slice_indices > len( truth_xy_slice_indices )) |
+                        (xy_slice_indices < 0))
+
+    if invalid_mask.any():
+        xy_slice_index = xy_slice_indices[np.argmax( invalid_mask )]
+
+        if xy_slice_index < 0:
             raise ValueError( "XY slice indices cannot be negative ({:d}).".format(
                 xy_slice_index ) )
+        else:
+            raise ValueError( "XY slice index {:d} is not present in the dataset.".format(
+                xy_slice_index ) )
 
     # verify that each variable requested is a grid variable.  we explicitly
     # check for membership in .data_vars rather than .variables to avoid false
@@ -1,5 +1,9 @@
+import atexit
+import concurrent.futures
 import functools
 import numpy as np
+import os
+import pickle
 
 # Implementation of 2D continuous wavelet transform (CWT) with three wavelet
 # filters.  See "2-D wavelet transforms: generalisation of the Hardy Space and
@@ -18,6 +22,13 @@ import numpy as np
 #                          when signals' length scales are bounded but unknown a
 #                          priori.
 #
+# symmetric_morlet_max_modulus() fuses the two for the symmetric Morlet CWT so
+# that the full 3D cubes are never materialized.  symmetric_morlet_max_modulus_gpu()
+# computes the same on a GPU with CuPy, which is an optional dependency.
+#
+# The CPU CWTs use NumPy's FFTs by default.  enable_pyfftw() switches them to
+# multi-threaded FFTW plans via pyFFTW, which is also an optional dependency.
+#
 # The framework to compute 2D CWTs is structured so that it can be easily ported
 # to GPUs in the future.  The frequency plane construction is decoupled from the
 # wavelet function computation in the CPU implementation, though may be fused
@@ -35,6 +46,10 @@ CWT_MORLET = "morlet"
 CWT_HALO   = "halo"
 CWT_ARC    = "arc"
 
+# keyword arguments for pyFFTW's FFTs when it is enabled, or None when NumPy's
+# FFTs are used.  see enable_pyfftw() for details.
+_pyfftw_parameters = None
+
 def _cwt_2d_morlet( omega_x, omega_y, scale, alpha=0. ):
     """
     2D extension of the Morlet, directional wavelet.
@@ -242,7 +257,81 @@ def _create_frequency_plane( width, height, dtype=np.float64 ):
 
     return omega_X, omega_Y
 
-def cwt_2d( data, scales, wavelet_name, **wavelet_parameters ):
+def _get_cwt_dtype( data_dtype ):
+    """
+    Gets the complex data type of a CWT computed from data of the supplied data type.
+
+    Raises ValueError if data_dtype isn't 32- or 64-bit floating point.
+
+    Takes 1 argument:
+
+      data_dtype - NumPy data type of the data to compute a CWT of.
+
+    Returns 1 value:
+
+      cwt_dtype - NumPy complex data type of the CWT.  np.complex64 for np.float32
+                  data and np.complex128 for np.float64 data.
+
+    """
+
+    #
+    # NOTE: we could be more friendly and accept integral data types, but it is
+    #       not a) a case we deal with or b) something easily done correctly
+    #       by choosing the proper data type to promote to.  as such, we simply
+    #       punt to the caller to make the choice themselves.
+    #
+    if data_dtype == np.dtype( np.float32 ):
+        return np.complex64
+    elif data_dtype == np.dtype( np.float64 ):
+        return np.complex128
+
+    #
+    # NOTE: we should be better about reporting a string value of the dtype,
+    #      this is a weird corner of NumPy so we don't bother right now.
+    #
+    raise ValueError( "Unknown data type requested ({}).  Must be either "
+                      "'np.float32' or 'np.float64'.".format(
+                          data_dtype ) )
+
+#
+# NOTE: cache the last N wavelet filters created.  transforming many slices of
+#       the same shape recreates identical filters for each slice otherwise.
+#       the filters are returned read-only so callers cannot corrupt the cache.
+#
+@functools.lru_cache( maxsize=32 )
+def _create_wavelet_filter( wavelet_name, width, height, scale, **wavelet_parameters ):
+    """
+    Creates a wavelet's Fourier response at a single length scale on the frequency
+    plane for data shaped (height, width).
+
+    Takes 5 arguments:
+
+      wavelet_name       - Name of the wavelet to create.  Must be one of CWT_MORLET,
+                           CWT_HALO, or CWT_ARC.
+      width              - Width of the frequency plane.
+      height             - Height of the frequency plane.
+      scale              - Length scale to create the wavelet at.
+      wavelet_parameters - Optional dictionary providing parameters to the filter
+                           kernel.  Values must be hashable.
+
+    Returns 1 value:
+
+      wavelet_filter - Read-only 2D NumPy array, shaped (height, width), containing
+                       the wavelet's Fourier response.
+
+    """
+
+    omega_x, omega_y = _create_frequency_plane( width, height )
+
+    wavelet_filter = _wavelet_filters_map[wavelet_name]( omega_x,
+                                                         omega_y,
+                                                         scale,
+                                                         **wavelet_parameters )
+    wavelet_filter.setflags( write=False )
+
+    return wavelet_filter
+
+def cwt_2d( data, scales, wavelet_name, data_spectra=None, **wavelet_parameters ):
     """
     Computes the 2D continuous wavelet transform (CWT) of a real-domained function.
     The CWT is computed at the length scales specified using the requested filter,
@@ -258,13 +347,18 @@ def cwt_2d( data, scales, wavelet_name, **wavelet_parameters ):
     Raises ValueError if the wavelet type requested is unknown or the input data's
     data type isn't 32- or 64-bit floating point.
 
-    Takes 4 arguments:
+    Takes 5 arguments:
 
       data               - Data, shaped (height, width), to compute the 2D CWT of.  Must
                            be of type numpy.dtype( 'float32' ) or numpy.dtype( 'float64' ).
       scales             - List of length scales to compute the 2D CWT at.  Must
       wavelet_name       - Name of the wavelet to compute with.  Must be one of
                            CWT_MORLET, CWT_HALO, or CWT_ARC.
+      data_spectra       - Optional 2D NumPy array containing data's spectra, as
+                           computed by numpy.fft.fft2().  Callers computing multiple
+                           CWTs of the same data may compute the spectra once and
+                           share it between them.  If omitted, defaults to None and
+                           the spectra are computed from data.
       wavelet_parameters - Optional dictionary providing parameters to the filter
                            kernels.  If omitted, the default parameters for each of
                            the kernels is used.
@@ -283,31 +377,12 @@ def cwt_2d( data, scales, wavelet_name, **wavelet_parameters ):
             ", ".join( map( lambda name: "'" + name + "'", _wavelet_filters_map.keys() ) ) ) )
 
     # ensure that we got floating point data to work with.
-    #
-    # NOTE: we could be more friendly and accept integral data types, but it is
-    #       not a) a case we deal with or b) something easily done correctly
-    #       by choosing the proper data type to promote to.  as such, we simply
-    #       punt to the caller to make the choice themselves.
-    #
-    if data.dtype == np.dtype( np.float32 ):
-        cwt_dtype = np.complex64
-    elif data.dtype == np.dtype( np.float64 ):
-        cwt_dtype = np.complex128
-    else:
-        #
-        # NOTE: we should be better about reporting a string value of the dtype,
-        #      this is a weird corner of NumPy so we don't bother right now.
-        #
-        raise ValueError( "Unknown data type requested ({}).  Must be either "
-                          "'np.float32' or 'np.float64'.".format(
-                              data.dtype ) )
+    cwt_dtype = _get_cwt_dtype( data.dtype )
 
     # move the data into the Fourier domain so we can do element-wise
     # multiplications instead of expensive, 2D convolutions.
-    data_spectra = np.fft.fft2( data )
-
-    # create the base frequency plane.  each CWT scales this as necessary.
-    omega_x, omega_y = _create_frequency_plane( data.shape[1], data.shape[0] )
+    if data_spectra is None:
+        data_spectra = _fft2( data )
 
     # pre-allocate space for our transformed data.
     cwt = np.empty( (len( scales ),
@@ -318,17 +393,18 @@ def cwt_2d( data, scales, wavelet_name, **wavelet_parameters ):
     # walk through each of the length scales, build the wavelet's Fourier
     # response, and filter the data.
     for scale_index, scale in enumerate( scales ):
-        wavelet_filter = _wavelet_filters_map[wavelet_name]( omega_x,
-                                                             omega_y,
-                                                             scale,
-                                                             **wavelet_parameters )
+        wavelet_filter = _create_wavelet_filter( wavelet_name,
+                                                 data.shape[1],
+                                                 data.shape[0],
+                                                 scale,
+                                                 **wavelet_parameters )
 
         # filter in the Fourier domain and invert back to the data domain.
         #
         # NOTE: this may involve a type cast because NumPy promotes inputs to
         #       its FFT routines to 64-bit.
         #
-        cwt[scale_index, ...] = np.fft.ifft2( data_spectra * wavelet_filter )
+        cwt[scale_index, ...] = _ifft2_in_place( data_spectra * wavelet_filter )
 
     return cwt
 
@@ -365,28 +441,565 @@ def cwt_max_modulus( cwt_data, axis=0, minimum_value=None, maximum_value=None ):
         # the axis of interest.
         cwt_modulus = np.max( np.abs( cwt_data ), axis=axis )
     else:
-        # create the base modulus since we have at least two CWTs to compute the
-        # maximum over.  we'll update the maximum against the remaining CWTs
-        # one-by-one.  this is effectively functools.reduce(), except we have
-        # to do it ourself since this method does not take two values to reduce.
+        # start with the first CWT's maximum modulus and update it in place
+        # against the remaining CWTs one-by-one.  each CWT is a single
+        # contiguous array so its reduction is one pass over memory.
         #
         # NOTE: we do not clip the values here as we can do that once all
         #       of the CWTs have been reduced.  this cuts down the number
         #       of calls to np.maximum() by a factor of three.
         #
-        cwt_modulus = np.maximum( cwt_max_modulus( cwt_data[0], axis ),
-                                  cwt_max_modulus( cwt_data[1], axis ) )
+        cwt_modulus = cwt_max_modulus( cwt_data[0], axis )
+
+        for this_cwt_data in cwt_data[1:]:
+            np.maximum( cwt_modulus,
+                        cwt_max_modulus( this_cwt_data, axis ),
+                        out=cwt_modulus )
+
+    # clip the bottom end of the data if we're supplied a floor.
+    if minimum_value is not None:
+        np.maximum( cwt_modulus, minimum_value, out=cwt_modulus )
+
+    # clip the top end of the data if we're supplied a ceiling.
+    if maximum_value is not None:
+        np.minimum( cwt_modulus, maximum_value, out=cwt_modulus )
+
+    return cwt_modulus
+
+def create_symmetric_morlet_filters( width, height, scales, alpha, dtype=np.float64 ):
+    """
+    Creates the Fourier responses of the symmetric 2D Morlet wavelet, at both alpha
+    and -alpha, for each of the supplied length scales.  Callers transforming many
+    inputs of the same shape may create these once and supply them to
+    symmetric_morlet_max_modulus().
+
+    Takes 5 arguments:
+
+      width  - Width of the data to be transformed.
+      height - Height of the data to be transformed.
+      scales - List of length scales to create filters for.
+      alpha  - Orientation angle, in degrees clockwise from the X-axis, specifying
+               the sensitive direction of the Morlet wavelet.
+      dtype  - Optional NumPy floating point data type of the filters.  Single
+               precision filters applied to single precision data compute the
+               CWTs entirely in single precision.  If omitted, defaults to
+               numpy.float64.
+
+    Returns 1 value:
+
+      wavelet_filters - List of (alpha filter, -alpha filter) tuples, one per length
+                        scale in scales.  Each filter is a read-only 2D NumPy array
+                        shaped (height, width).
+
+    """
+
+    def create_filter( scale, angle ):
+        wavelet_filter = _create_wavelet_filter( CWT_MORLET, width, height, scale, alpha=angle )
+
+        # cast a copy of the (cached) filter if a different precision is
+        # requested.
+        if wavelet_filter.dtype != dtype:
+            wavelet_filter = wavelet_filter.astype( dtype )
+            wavelet_filter.setflags( write=False )
+
+        return wavelet_filter
+
+    return [(create_filter( scale, alpha ), create_filter( scale, -1.0 * alpha ))
+            for scale in scales]
+
+def enable_pyfftw( number_threads=None, wisdom_path=None ):
+    """
+    Computes the CPU CWTs' FFTs with pyFFTW instead of NumPy.  FFTW plans are
+    cached between calls and computed with multiple threads.  Optionally loads
+    FFTW wisdom from, and saves it to, a file so that plans measured in one run
+    are reused by the next.
+
+    NOTE: pyFFTW's results are not bitwise identical to NumPy's.
+
+    Raises ValueError if pyFFTW is not available.
+
+    Takes 2 arguments:
+
+      number_threads - Optional positive integer specifying the number of threads
+                       each FFT is computed with.  If omitted, defaults to the
+                       number of CPUs available.
+      wisdom_path    - Optional path to a file holding FFTW wisdom.  Existing
+                       wisdom is loaded immediately and the accumulated wisdom is
+                       written back when the interpreter exits.  If omitted,
+                       defaults to None and wisdom is not persisted.
+
+    Returns nothing.
+
+    """
+
+    global _pyfftw_parameters
+
+    try:
+        import pyfftw
+        import pyfftw.interfaces.cache
+    except ImportError as e:
+        raise ValueError( "pyFFTW is not available ({:s}).".format(
+            str( e ) ) )
+
+    if number_threads is None:
+        number_threads = os.cpu_count() or 1
+
+    # keep plans around between calls so repeatedly transforming identically
+    # shaped data does not replan.
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time( 60 )
+
+    if wisdom_path is not None:
+        wisdom_path = os.path.expanduser( wisdom_path )
+
+        if os.path.exists( wisdom_path ):
+            with open( wisdom_path, "rb" ) as wisdom_fp:
+                pyfftw.import_wisdom( pickle.load( wisdom_fp ) )
+
+        atexit.register( _save_pyfftw_wisdom, wisdom_path )
+
+    _pyfftw_parameters = {
+        "threads":        number_threads,
+        "planner_effort": "FFTW_MEASURE"
+    }
+
+def disable_pyfftw():
+    """
+    Computes the CPU CWTs' FFTs with NumPy.  Reverts enable_pyfftw().
+
+    Takes no arguments.
+
+    Returns nothing.
+
+    """
+
+    global _pyfftw_parameters
+
+    _pyfftw_parameters = None
+
+def _save_pyfftw_wisdom( wisdom_path ):
+    """
+    Saves the accumulated FFTW wisdom to a file.  Failures are ignored as this
+    runs when the interpreter exits.
+
+    Takes 1 argument:
+
+      wisdom_path - Path to the file to write the wisdom to.
+
+    Returns nothing.
+
+    """
+
+    import pyfftw
+
+    try:
+        with open( wisdom_path, "wb" ) as wisdom_fp:
+            pickle.dump( pyfftw.export_wisdom(), wisdom_fp )
+    except OSError:
+        pass
+
+def _fft2( data, out=None ):
+    """
+    Computes the 2D FFT of the supplied data with the current FFT backend.
+
+    Takes 2 arguments:
+
+      data - 2D NumPy array to transform.
+      out  - Optional 2D complex NumPy array to write the spectra into when the
+             installed NumPy supports it (version 2.0 and newer).  If omitted,
+             defaults to None and a new array is allocated.
+
+    Returns 1 value:
+
+      spectra - 2D complex NumPy array containing data's spectra.  This may not
+                be out if it could not be written into.
+
+    """
+
+    if _pyfftw_parameters is not None:
+        import pyfftw.interfaces.numpy_fft
+
+        return pyfftw.interfaces.numpy_fft.fft2( data, **_pyfftw_parameters )
+
+    if out is not None:
+        try:
+            return np.fft.fft2( data, out=out )
+        except TypeError:
+            # older versions of NumPy do not accept an output array.
+            pass
+
+    return np.fft.fft2( data )
+
+def _get_work_buffer( work_buffers, buffer_name, shape, dtype ):
+    """
+    Gets a named work buffer of the requested shape and data type, creating it
+    if it does not exist or does not match.
+
+    Takes 4 arguments:
+
+      work_buffers - Dictionary of NumPy arrays keyed by name.  Updated with the
+                     buffer when it is created.
+      buffer_name  - Name of the buffer to get.
+      shape        - Tuple specifying the buffer's shape.
+      dtype        - NumPy data type of the buffer.
+
+    Returns 1 value:
+
+      work_buffer - NumPy array with the requested shape and data type.  Its
+                    contents are undefined.
+
+    """
+
+    work_buffer = work_buffers.get( buffer_name )
+
+    if (work_buffer is None or
+        work_buffer.shape != shape or
+        work_buffer.dtype != dtype):
+        work_buffer = np.empty( shape, dtype=dtype )
+        work_buffers[buffer_name] = work_buffer
+
+    return work_buffer
+
+def _ifft2_in_place( spectra ):
+    """
+    Computes the 2D inverse FFT of the supplied spectra in place with the current
+    FFT backend.  Avoids allocating a new array for the transform when the
+    installed NumPy supports it (version 2.0 and newer), otherwise falls back to
+    an out of place transform.  pyFFTW always transforms out of place.
+
+    Takes 1 argument:
+
+      spectra - 2D complex NumPy array to inverse transform.  Its contents are
+                overwritten when the transform is computed in place.
+
+    Returns 1 value:
+
+      data - 2D complex NumPy array containing the inverse transform.  This is
+             spectra when the transform is computed in place.
+
+    """
+
+    if _pyfftw_parameters is not None:
+        import pyfftw.interfaces.numpy_fft
+
+        return pyfftw.interfaces.numpy_fft.ifft2( spectra, **_pyfftw_parameters )
+
+    #
+    # NOTE: numpy.fft.ifft2() accepts an output array but does not write into
+    #       it, so we use the N-dimensional transform over the last two axes
+    #       which does.
+    #
+    try:
+        return np.fft.ifftn( spectra, axes=(-2, -1), out=spectra )
+    except TypeError:
+        # older versions of NumPy do not accept an output array.
+        return np.fft.ifft2( spectra )
 
-        for this_cwt_data in cwt_data[2:]:
-            cwt_modulus = np.maximum( cwt_modulus,
-                                      cwt_max_modulus( this_cwt_data, axis ) )
+def symmetric_morlet_max_modulus( data, scales, alpha, minimum_value=None, maximum_value=None, wavelet_filters=None, number_workers=1, out=None, work_buffers=None ):
+    """
+    Computes the maximum modulus of a symmetric 2D Morlet continuous wavelet
+    transform (CWT), optionally clipping the result above and/or below.  The Morlet
+    CWT is computed at both alpha and -alpha for each of the length scales and the
+    maximum modulus is taken across all of them.
+
+    This is equivalent to the following, though never holds more than one length
+    scale's CWT in memory and reads each of them once:
+
+      cwt_max_modulus( [cwt_2d( data, scales, CWT_MORLET, alpha=alpha ),
+                        cwt_2d( data, scales, CWT_MORLET, alpha=-alpha )],
+                       minimum_value=minimum_value,
+                       maximum_value=maximum_value )
+
+    A stack of 2D data may be supplied to transform each of its frames with the
+    same filters.  The frames' FFTs are computed as a single batch which amortizes
+    the per-call overhead across the stack.
+
+    Raises ValueError if the input data's data type isn't 32- or 64-bit floating
+    point, if the data are not 2D or 3D, or if out does not match data's shape
+    and data type.
+
+    Takes 9 arguments:
+
+      data            - Data, shaped (height, width), to compute the CWT modulus of.
+                        May also be shaped (number_frames, height, width) to
+                        compute the CWT modulus of each frame.  Must be of type
+                        numpy.dtype( 'float32' ) or numpy.dtype( 'float64' ).
+      scales          - List of length scales to compute the 2D CWT at.
+      alpha           - Orientation angle, in degrees clockwise from the X-axis,
+                        specifying the sensitive direction of the Morlet wavelet.
+      minimum_value   - Optional minimum value to clip cwt_modulus against.  If
+                        omitted, no clipping is performed.
+      maximum_value   - Optional maximum value to clip cwt_modulus against.  If
+                        omitted, no clipping is performed.
+      wavelet_filters - Optional list of wavelet filters, as returned by
+                        create_symmetric_morlet_filters() for data's shape, scales,
+                        and alpha.  If omitted, defaults to None and the filters are
+                        created.
+      number_workers  - Optional positive integer specifying the number of threads
+                        to compute the CWTs with.  Each CWT is computed in its own
+                        buffers so memory use grows with the number of workers.
+                        Callers already processing data in parallel should leave
+                        this as is to avoid oversubscribing the system.  If omitted,
+                        defaults to 1 and the CWTs are computed serially.
+      out             - Optional NumPy array, with data's shape and data type, to
+                        write the maximum modulus into.  Callers transforming many
+                        identically shaped arrays may reuse a single array rather
+                        than allocating a new one for each.  If omitted, defaults
+                        to None and a new array is allocated.
+      work_buffers    - Optional dictionary holding the intermediate buffers used to
+                        compute the CWTs.  Buffers are created on first use and kept
+                        in the dictionary so later calls with the same shape and
+                        precision reuse them.  Must not be shared by concurrent
+                        calls.  If omitted, defaults to None and the buffers are
+                        allocated for this call only.
+
+    Returns 1 value:
+
+      cwt_modulus - Array, shaped like data, containing the maximum modulus with
+                    the same precision as data (e.g. np.float32 for np.float32
+                    input).  This is out when it is supplied.
+
+    """
+
+    cwt_dtype = _get_cwt_dtype( data.dtype )
+
+    if data.ndim not in (2, 3):
+        raise ValueError( "Data must be 2D or 3D, but has {:d} dimension{:s}.".format(
+            data.ndim,
+            "" if data.ndim == 1 else "s" ) )
+
+    if work_buffers is None:
+        work_buffers = {}
+
+    if out is not None and (out.shape != data.shape or out.dtype != data.dtype):
+        raise ValueError( "Output array must match the data's shape and type "
+                          "({:s}, {:s}), but is ({:s}, {:s}).".format(
+                              str( data.shape ),
+                              str( data.dtype ),
+                              str( out.shape ),
+                              str( out.dtype ) ) )
+
+    # move the data into the Fourier domain once.  it is shared by each of
+    # the CWTs.
+    #
+    # NOTE: the FFTs operate on the last two dimensions so stacks of frames
+    #       are transformed as a batch.  the wavelet filters broadcast across
+    #       the frames.
+    #
+    data_spectra = _fft2( data,
+                          out=_get_work_buffer( work_buffers,
+                                                "data_spectra",
+                                                data.shape,
+                                                np.result_type( data.dtype,
+                                                                np.complex64 ) ) )
+
+    if wavelet_filters is None:
+        wavelet_filters = create_symmetric_morlet_filters( data.shape[-1],
+                                                           data.shape[-2],
+                                                           scales,
+                                                           alpha )
+
+    cwt_modulus = None
+
+    if number_workers > 1:
+        def compute_modulus( wavelet_filter ):
+            """
+            Computes the modulus of a single CWT in its own buffers.
+
+            Takes 1 argument:
+
+              wavelet_filter - 2D NumPy array containing the wavelet's Fourier
+                               response.
+
+            Returns 1 value:
+
+              modulus - 2D NumPy array containing the CWT's modulus.
+
+            """
+
+            cwt = _ifft2_in_place( data_spectra * wavelet_filter ).astype( cwt_dtype,
+                                                                           copy=False )
+
+            return np.abs( cwt )
+
+        # compute each of the CWTs concurrently and fold them into the running
+        # maximum as they complete.  NumPy's FFTs release the GIL so the threads
+        # run in parallel.  the maximum does not depend on the order the CWTs
+        # are reduced in.
+        with concurrent.futures.ThreadPoolExecutor( max_workers=number_workers ) as executor:
+            modulus_futures = [executor.submit( compute_modulus, wavelet_filter )
+                               for scale_filters in wavelet_filters
+                               for wavelet_filter in scale_filters]
+
+            for modulus_future in concurrent.futures.as_completed( modulus_futures ):
+                if cwt_modulus is None:
+                    if out is None:
+                        cwt_modulus = modulus_future.result()
+                    else:
+                        cwt_modulus      = out
+                        cwt_modulus[...] = modulus_future.result()
+                else:
+                    np.maximum( cwt_modulus, modulus_future.result(), out=cwt_modulus )
+    else:
+        # buffers for a single filtered spectra, CWT, and modulus.  these are
+        # reused for each length scale and angle so the working set stays the
+        # same rather than being reallocated for each.  only the serial path
+        # uses them as the threaded path computes each CWT in its own buffers.
+        #
+        # NOTE: we round each CWT to its final precision before taking the
+        #       modulus so the results match cwt_2d()'s.  the CWT buffer is only
+        #       needed when the inverse FFT's precision differs from the final
+        #       precision.  otherwise the modulus is taken from the filtered
+        #       spectra buffer that the inverse FFT was computed in, without
+        #       copying it.  pyFFTW returns a new array that is used instead.
+        #
+        # NOTE: the filtered spectra is held in the precision of the product of
+        #       the spectra and the wavelet filters, which is not necessarily
+        #       the spectra's.  double precision filters compute in double
+        #       precision.
+        #
+        spectra_buffer = _get_work_buffer( work_buffers,
+                                           "spectra",
+                                           data_spectra.shape,
+                                           np.result_type( data_spectra.dtype,
+                                                           wavelet_filters[0][0].dtype ) )
+        modulus_buffer = _get_work_buffer( work_buffers,
+                                           "modulus",
+                                           data.shape,
+                                           data.dtype )
+
+        # walk through each length scale and compute both of its angles while
+        # its scale is current.  track the running maximum modulus in place.
+        for scale_filters in wavelet_filters:
+            for wavelet_filter in scale_filters:
+                np.multiply( data_spectra, wavelet_filter, out=spectra_buffer )
+                cwt = _ifft2_in_place( spectra_buffer )
+
+                if cwt.dtype != cwt_dtype:
+                    cwt_buffer = _get_work_buffer( work_buffers,
+                                                   "cwt",
+                                                   data.shape,
+                                                   cwt_dtype )
+
+                    cwt_buffer[...] = cwt
+                    cwt             = cwt_buffer
+
+                if cwt_modulus is None:
+                    cwt_modulus = np.abs( cwt, out=out )
+                else:
+                    np.abs( cwt, out=modulus_buffer )
+                    np.maximum( cwt_modulus, modulus_buffer, out=cwt_modulus )
 
     # clip the bottom end of the data if we're supplied a floor.
     if minimum_value is not None:
-        cwt_modulus = np.maximum( cwt_modulus, minimum_value )
+        np.maximum( cwt_modulus, minimum_value, out=cwt_modulus )
 
     # clip the top end of the data if we're supplied a ceiling.
     if maximum_value is not None:
-        cwt_modulus = np.minimum( cwt_modulus, maximum_value )
+        np.minimum( cwt_modulus, maximum_value, out=cwt_modulus )
 
     return cwt_modulus
+
+#
+# NOTE: cache the last N frequency planes copied to the GPU so each is only
+#       transferred once.
+#
+@functools.lru_cache( maxsize=10 )
+def _create_gpu_frequency_plane( width, height ):
+    """
+    Creates a frequency plane in GPU memory.  See _create_frequency_plane() for
+    details.
+
+    Requires CuPy.
+
+    Takes 2 arguments:
+
+      width  - Width of the plane.
+      height - Height of the plane.
+
+    Returns 2 values:
+
+      omega_X - 2D CuPy array, shaped (height, width), containing grid values in the
+                horizontal dimension.
+      omega_Y - 2D CuPy array, shaped (height, width), containing grid values in the
+                vertical dimension.
+
+    """
+
+    import cupy
+
+    omega_X, omega_Y = _create_frequency_plane( width, height )
+
+    return cupy.asarray( omega_X ), cupy.asarray( omega_Y )
+
+def symmetric_morlet_max_modulus_gpu( data, scales, alpha, minimum_value=None, maximum_value=None ):
+    """
+    Computes the maximum modulus of a symmetric 2D Morlet continuous wavelet
+    transform (CWT) on a GPU.  Equivalent to symmetric_morlet_max_modulus(),
+    though data are copied to the GPU once, all of the CWTs are computed there,
+    and only the maximum modulus is copied back.
+
+    Requires CuPy.
+
+    Raises ValueError if the input data's data type isn't 32- or 64-bit floating
+    point.
+
+    Takes 5 arguments:
+
+      data          - Data, shaped (height, width), to compute the CWT modulus of.
+                      Must be of type numpy.dtype( 'float32' ) or
+                      numpy.dtype( 'float64' ).
+      scales        - List of length scales to compute the 2D CWT at.
+      alpha         - Orientation angle, in degrees clockwise from the X-axis,
+                      specifying the sensitive direction of the Morlet wavelet.
+      minimum_value - Optional minimum value to clip cwt_modulus against.  If omitted,
+                      no clipping is performed.
+      maximum_value - Optional maximum value to clip cwt_modulus against.  If omitted,
+                      no clipping is performed.
+
+    Returns 1 value:
+
+      cwt_modulus - 2D NumPy array, shaped (height, width), containing the maximum
+                    modulus with the same precision as data (e.g. np.float32 for
+                    np.float32 input).
+
+    """
+
+    import cupy
+
+    cwt_dtype = _get_cwt_dtype( data.dtype )
+
+    # move the data to the GPU and into the Fourier domain once.  it is shared
+    # by each of the CWTs.
+    data_spectra = cupy.fft.fft2( cupy.asarray( data ) )
+
+    omega_x, omega_y = _create_gpu_frequency_plane( data.shape[1], data.shape[0] )
+
+    cwt_modulus = None
+
+    for scale in scales:
+        for angle in (alpha, -1.0 * alpha):
+            #
+            # NOTE: the Morlet filter is built from NumPy ufuncs which CuPy
+            #       arrays dispatch to their GPU equivalents, so the filter is
+            #       created on the GPU.
+            #
+            wavelet_filter = _cwt_2d_morlet( omega_x, omega_y, scale, alpha=angle )
+
+            # round each CWT to its final precision before taking the modulus
+            # to match symmetric_morlet_max_modulus().
+            cwt = cupy.fft.ifft2( data_spectra * wavelet_filter ).astype( cwt_dtype,
+                                                                           copy=False )
+
+            if cwt_modulus is None:
+                cwt_modulus = cupy.abs( cwt )
+            else:
+                cupy.maximum( cwt_modulus, cupy.abs( cwt ), out=cwt_modulus )
+
+    if minimum_value is not None:
+        cupy.maximum( cwt_modulus, minimum_value, out=cwt_modulus )
+
+    if maximum_value is not None:
+        cupy.minimum( cwt_modulus, maximum_value, out=cwt_modulus )
+
+    return cupy.asnumpy( cwt_modulus )
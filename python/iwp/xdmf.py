@@ -56,7 +56,7 @@ class XDMFGenerator( object ):
     #       slowest.  this is confusing since the Topology's dimensions
     #       are specified slowest to fastest.
     #
-    _xdmf_fragment = """<?xml version="1.0" encoding="utf-8" ?>
+    _xdmf_header_fragment = """<?xml version="1.0" encoding="utf-8" ?>
 <!DOCTYPE Xdmf SYSTEM "Xdmf.dtd" []>
 <Xdmf xmlns:xi="http://www.w3.org/2001/XInclude" Version="2.0">
     <Domain>
@@ -86,7 +86,10 @@ class XDMFGenerator( object ):
         </Grid>
 
         <Grid Name="timesteps" CollectionType="Temporal" GridType="Collection">
-{time_step_fragments:s}
+"""
+
+    # fragment closing the document after the last time step.
+    _xdmf_trailer_fragment = """
         </Grid>
     </Domain>
 </Xdmf>
@@ -459,6 +462,8 @@ class XDMFGenerator( object ):
         Generates an XDMF document describing the underlying netCDF4 datasets.  May
         generate a description of a subset of the underlying datasets if requested.
 
+        See write_to() for writing large documents without holding them in memory.
+
         Takes 2 arguments:
 
           time_step_indices - Optional sequence of time step indices to output in
@@ -476,6 +481,75 @@ class XDMFGenerator( object ):
 
         """
 
+        return "".join( self._generate_fragments( time_step_indices,
+                                                  variable_names ) )
+
+    def write_to( self, xdmf_fp, time_step_indices=[], variable_names=[], encoding=None ):
+        """
+        Generates an XDMF document describing the underlying netCDF4 datasets and
+        writes it to a file-like object.  The document is written one time step at
+        a time so that it is never entirely held in memory.  May generate a
+        description of a subset of the underlying datasets if requested.
+
+        Raises ValueError if the requested time steps or variables are invalid.
+        Nothing is written to xdmf_fp in that case.
+
+        Takes 4 arguments:
+
+          xdmf_fp           - File-like object that provides a write() method.
+          time_step_indices - Optional sequence of time step indices to output in
+                              the generated XDMF.  See generate() for details.
+          variable_names    - Optional list of variable names to output in the
+                              the generated XDMF.  See generate() for details.
+          encoding          - Optional string specifying the encoding to apply to
+                              the document before writing it.  Must be specified
+                              when xdmf_fp was opened in binary mode, and should
+                              be "utf-8" to match the document's XML declaration.
+                              If omitted, defaults to None and the document is
+                              written as strings to a text-mode xdmf_fp.
+
+        Returns 1 value:
+
+          number_bytes - Number of bytes written to xdmf_fp.  This is the number
+                         of characters written when encoding is None.
+
+        """
+
+        number_bytes = 0
+
+        for xdmf_fragment in self._generate_fragments( time_step_indices,
+                                                       variable_names ):
+            if encoding is not None:
+                xdmf_fragment = xdmf_fragment.encode( encoding )
+
+            number_bytes += xdmf_fp.write( xdmf_fragment )
+
+        return number_bytes
+
+    def _generate_fragments( self, time_step_indices, variable_names ):
+        """
+        Generator that yields an XDMF document describing the underlying netCDF4
+        datasets as a sequence of fragments.  The first fragment contains the
+        document's grid, each time step has its own fragment, and the last fragment
+        closes the document.
+
+        Raises ValueError if the requested time steps or variables are invalid.
+        This is raised before the first fragment is yielded.
+
+        Takes 2 arguments:
+
+          time_step_indices - Sequence of time step indices to output in the
+                              generated XDMF.  See generate() for details.
+          variable_names    - List of variable names to output in the generated
+                              XDMF.  See generate() for details.
+
+        Returns 1 value:
+
+          xdmf_fragment - String containing the next fragment of the serialized
+                          XDMF document.
+
+        """
+
         def numpy_dtype_to_xdmf_number_type( dtype ):
             """
             Converts a NumPy dtype to an XDMF NumberType.
@@ -587,8 +661,16 @@ class XDMFGenerator( object ):
                     size_bytes_z=size_bytes_z
                     )
 
+        # instantiate the start of the document, up to the time steps.  fill in
+        # the grid characteristics.
+        yield XDMFGenerator._xdmf_header_fragment.format(
+            dimensions_list_commas=dimensions_commas,
+            dimensions_list_shape=dimensions_shape,
+            dimensions_list_whitespace=dimensions_whitespace,
+            fastest_dimension=self._dimension_names[-1].upper(),
+            geometry_fragment=geometry_fragment )
+
         # build each time step's XML, one at a time.
-        time_step_fragments = ""
         for time_step_index in time_step_indices:
 
             # assemble each of the variable's descriptions, one at a time.
@@ -607,21 +689,12 @@ class XDMFGenerator( object ):
                     variable_byte_size=variable_dtype.itemsize )
 
             # instantiate the time step fragment.
-            time_step_fragments += XDMFGenerator._time_step_fragment.format(
+            yield XDMFGenerator._time_step_fragment.format(
                 time_step=time_step_index,
                 variable_fragments=variable_fragments )
 
-        # instantiate the document.  fill in the grid characteristics and
-        # assemble the time steps.
-        xdmf_document = XDMFGenerator._xdmf_fragment.format(
-            dimensions_list_commas=dimensions_commas,
-            dimensions_list_shape=dimensions_shape,
-            dimensions_list_whitespace=dimensions_whitespace,
-            fastest_dimension=self._dimension_names[-1].upper(),
-            geometry_fragment=geometry_fragment,
-            time_step_fragments=time_step_fragments )
-
-        return xdmf_document
+        # close the document.
+        yield XDMFGenerator._xdmf_trailer_fragment
 
     def serialize( self, xdmf_path ):
         """
@@ -645,9 +718,9 @@ class XDMFGenerator( object ):
         # directly write to the file-like if we were given one, otherwise open
         # it and write to that.
         if hasattr( xdmf_path, "write" ):
-            number_bytes = xdmf_path.write( self.generate() )
+            number_bytes = self.write_to( xdmf_path )
         else:
             with open( xdmf_path, "w" ) as xdmf_fp:
-                number_bytes = xdmf_fp.write( self.generate() )
+                number_bytes = self.write_to( xdmf_fp )
 
         return number_bytes
@@ -1171,6 +1171,51 @@ class TestSyntheticIWPDataset:
             time_indices,
             xy_slice_indices )
 
+    @pytest.mark.parametrize( "create_netcdf_files",
+                              [( 2, (4,  4,  2), ["u", "v", "w"], "normal"),
+                               (10, (8, 16, 32), ["u", "v"],      "normal")],
+                              indirect=True )
+    def test_batched_data_values( self, create_netcdf_files ):
+        """
+        Verifies that reading multiple XY slices at once, via get_xy_slices(), returns
+        the same values as reading them individually.  XY slices are requested out of
+        order, with duplicates, and with negative indices.
+
+        Raises AssertionError if the XY slices read do not match.
+
+        Takes 1 argument:
+
+          create_netcdf_files - pytest fixture specifying the parameters, path pattern, and
+                                individual time step file paths.
+
+        Returns nothing.
+
+        """
+
+        parameters, netcdf_pattern, netcdf_paths = create_netcdf_files
+
+        time_indices     = range( parameters["number_time_steps"] )
+        xy_slice_indices = list( reversed( range( parameters["grid_size"][2] ) ) ) + [0, -1]
+
+        dataset = iwp.data_loader.IWPDataset( netcdf_pattern,
+                                              time_indices )
+
+        for time_index in time_indices:
+            xy_slices = dataset.get_xy_slices( time_index, xy_slice_indices )
+
+            assert xy_slices.shape == (len( xy_slice_indices ),
+                                       len( parameters["variable_names"] ),
+                                       parameters["grid_size"][1],
+                                       parameters["grid_size"][0])
+
+            for xy_slice, xy_slice_index in zip( xy_slices, xy_slice_indices ):
+                assert np.array_equal( xy_slice,
+                                       dataset.get_xy_slice( time_index, xy_slice_index ) )
+
+        # verify that out of bounds XY slices are caught.
+        with pytest.raises( IndexError ):
+            dataset.get_xy_slices( 0, [0, parameters["grid_size"][2]] )
+
     @pytest.mark.parametrize( "create_netcdf_files",
                               [( 2, (3,  5,  4), ["u", "v", "w"], "normal"),
                                ( 5, (7, 11, 17), ["u"],            "normal"),
@@ -1734,6 +1779,105 @@ class TestSyntheticIWPDataset:
         with pytest.raises( ValueError ):
             dataset = iwp.data_loader.IWPDataset( netcdf_pattern, "abc" )
 
+class TestPeekDims:
+    """
+    Test harness for iwp.data_loader.peek_dims().  Verifies that the time steps and
+    grid dimensions are read from the netCDF4 files' metadata for both new- and
+    old-style files.
+    """
+
+    @staticmethod
+    def create_netcdf_file( netcdf_path, time_step_name, time_step_value, grid_size ):
+        """
+        Creates a netCDF4 file for a single time step with a time step attribute and
+        a single grid variable.
+
+        Takes 4 arguments:
+
+          netcdf_path     - Path to the netCDF4 file to create.
+          time_step_name  - Name of the time step attribute, either "time_step" or
+                            "Cycle".  May be None to omit the attribute.
+          time_step_value - Time step value stored in the attribute.
+          grid_size       - Size of the underlying grid, shaped (x, y, z).
+
+        Returns nothing.
+
+        """
+
+        with nc.Dataset( netcdf_path,
+                         "w",
+                         format="NETCDF4",
+                         clobber=True ) as ds:
+
+            for dimension_name, dimension_size in zip( ["x", "y", "z"], grid_size ):
+                ds.createDimension( dimension_name, dimension_size )
+
+            ds.createVariable( "u", np.float32, dimensions=("z", "y", "x") )
+
+            if time_step_name is not None:
+                ds.setncattr( time_step_name, time_step_value )
+
+    @pytest.mark.parametrize( "time_step_name", ["time_step", "Cycle"] )
+    def test_time_step_attribute( self, tmp_path, time_step_name ):
+        """
+        Verifies that the time steps are read from the time step attribute and
+        sorted, and that the grid dimensions are ranges of valid indices.
+
+        Takes 2 arguments:
+
+          tmp_path       - pytest fixture specifying a temporary directory.
+          time_step_name - Name of the time step attribute to create.
+
+        Returns nothing.
+
+        """
+
+        grid_size        = (5, 4, 3)
+        time_step_values = [30, 10, 20]
+
+        for file_index, time_step_value in enumerate( time_step_values ):
+            self.create_netcdf_file( str( tmp_path / "iwp-{:d}.nc".format( file_index ) ),
+                                     time_step_name,
+                                     time_step_value,
+                                     grid_size )
+
+        dimensions = iwp.data_loader.peek_dims( str( tmp_path / "iwp-*.nc" ) )
+
+        assert dimensions == {time_step_name: sorted( time_step_values ),
+                              "x":            range( grid_size[0] ),
+                              "y":            range( grid_size[1] ),
+                              "z":            range( grid_size[2] )}
+
+        # verify that a list of paths is equivalent to the pattern.
+        netcdf_paths = [str( tmp_path / "iwp-{:d}.nc".format( file_index ) )
+                        for file_index in range( len( time_step_values ) )]
+
+        assert iwp.data_loader.peek_dims( netcdf_paths ) == dimensions
+
+    def test_invalid_files( self, tmp_path ):
+        """
+        Verifies that patterns matching no files, and files without a time step
+        attribute, raise ValueError.
+
+        Takes 1 argument:
+
+          tmp_path - pytest fixture specifying a temporary directory.
+
+        Returns nothing.
+
+        """
+
+        with pytest.raises( ValueError ):
+            iwp.data_loader.peek_dims( str( tmp_path / "does-not-exist-*.nc" ) )
+
+        self.create_netcdf_file( str( tmp_path / "iwp.nc" ),
+                                 None,
+                                 0,
+                                 (5, 4, 3) )
+
+        with pytest.raises( ValueError ):
+            iwp.data_loader.peek_dims( str( tmp_path / "iwp.nc" ) )
+
 
 if __name__ == "__main__":
     pytest.main()
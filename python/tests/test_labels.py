@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+# Tests for the labels module.
+
+import numpy as np
+import pytest
+import sys
+
+import iwp.labels
+
+class TestSaveIWPLabels:
+    """
+    Test harness for iwp.labels.save_iwp_labels().  Verifies that labels survive
+    a round trip through disk.
+    """
+
+    @pytest.mark.parametrize( "orjson_flag", [True, False] )
+    @pytest.mark.parametrize( "pretty_flag", [True, False] )
+    def test_round_trip( self, tmp_path, monkeypatch, pretty_flag, orjson_flag ):
+        """
+        Verifies that labels whose coordinates are NumPy scalars are saved and
+        loaded, both pretty printed and compactly, with and without orjson.
+
+        Takes 4 arguments:
+
+          tmp_path    - pytest fixture specifying a temporary directory.
+          monkeypatch - pytest fixture for hiding orjson.
+          pretty_flag - Flag specifying whether the labels are pretty printed.
+          orjson_flag - Flag specifying whether orjson is used, if installed.
+
+        Returns nothing.
+
+        """
+
+        if orjson_flag:
+            pytest.importorskip( "orjson" )
+        else:
+            # make orjson's import fail so the json module is used instead.
+            monkeypatch.setitem( sys.modules, "orjson", None )
+
+        iwp_labels_path = str( tmp_path / "labels.json" )
+        iwp_labels      = [{"bbox":            {"x1": np.float64( 0.25 ),
+                                                "x2": np.float64( 0.5 ),
+                                                "y1": 0.125,
+                                                "y2": 0.75},
+                            "id":              "1",
+                            "time_step_index": 10,
+                            "z_index":         20}]
+
+        iwp.labels.save_iwp_labels( iwp_labels_path,
+                                    iwp_labels,
+                                    pretty_flag=pretty_flag )
+
+        assert iwp.labels.load_iwp_labels( iwp_labels_path ) == iwp_labels
+
+class TestProbeIWPLabels:
+    """
+    Test harness for iwp.labels.probe_iwp_labels().  Verifies that serialized
+    labels are accepted and that other files are rejected.
+    """
+
+    @pytest.mark.parametrize( "number_labels", [0, 1, 500] )
+    @pytest.mark.parametrize( "pretty_flag", [True, False] )
+    def test_valid_labels( self, tmp_path, pretty_flag, number_labels ):
+        """
+        Verifies that saved labels are accepted, including empty lists and files
+        larger than the regions probed.
+
+        Takes 3 arguments:
+
+          tmp_path      - pytest fixture specifying a temporary directory.
+          pretty_flag   - Flag specifying whether the labels are pretty printed.
+          number_labels - Number of labels to save.
+
+        Returns nothing.
+
+        """
+
+        iwp_labels_path = str( tmp_path / "labels.json" )
+        iwp_labels      = [{"bbox":            {"x1": 0.25, "x2": 0.5, "y1": 0.125, "y2": 0.75},
+                            "id":              str( label_index ),
+                            "time_step_index": label_index,
+                            "z_index":         label_index}
+                           for label_index in range( number_labels )]
+
+        iwp.labels.save_iwp_labels( iwp_labels_path,
+                                    iwp_labels,
+                                    pretty_flag=pretty_flag )
+
+        assert iwp.labels.probe_iwp_labels( iwp_labels_path )
+
+    @pytest.mark.parametrize( "contents",
+                              [b"",
+                               b"{}",
+                               b"[1, 2, 3]",
+                               b"[{\"id\": \"1\"}",
+                               b"  [{\"id\": \"1\"}, " + (b" " * 10000) + b"{\"id\": \"2\"}, "] )
+    def test_invalid_labels( self, tmp_path, contents ):
+        """
+        Verifies that files that are not lists of objects, or are truncated, are
+        rejected.
+
+        Takes 2 arguments:
+
+          tmp_path - pytest fixture specifying a temporary directory.
+          contents - Bytes to write to the file probed.
+
+        Returns nothing.
+
+        """
+
+        iwp_labels_path = tmp_path / "labels.json"
+        iwp_labels_path.write_bytes( contents )
+
+        assert not iwp.labels.probe_iwp_labels( str( iwp_labels_path ) )
+
+        # missing files are rejected as well.
+        assert not iwp.labels.probe_iwp_labels( str( tmp_path / "does-not-exist.json" ) )
+
+
+if __name__ == "__main__":
+    pytest.main()
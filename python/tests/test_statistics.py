@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# Tests for the statistics module.
+
+import numpy as np
+import pytest
+import sys
+import xarray
+
+import iwp.statistics
+
+class TestComputeStatistics:
+    """
+    Test harness for iwp.statistics.compute_statistics().  Verifies that NumPy
+    arrays are reduced consistently whether or not bottleneck is installed.
+    """
+
+    @pytest.mark.parametrize( "bottleneck_flag", [True, False] )
+    def test_nan_values( self, monkeypatch, bottleneck_flag ):
+        """
+        Verifies that NaNs are ignored when reducing NumPy arrays, matching the
+        statistics of an equivalent xarray.DataArray.
+
+        Takes 2 arguments:
+
+          monkeypatch     - pytest fixture for hiding bottleneck.
+          bottleneck_flag - Flag specifying whether bottleneck is used, if installed.
+
+        Returns nothing.
+
+        """
+
+        if bottleneck_flag:
+            pytest.importorskip( "bottleneck" )
+        else:
+            # make bottleneck's import fail so NumPy is used instead.
+            monkeypatch.setitem( sys.modules, "bottleneck", None )
+
+        data = np.array( [[1.0, np.nan, 3.0],
+                          [np.nan, 5.0, 7.0]] )
+
+        statistics = iwp.statistics.compute_statistics( data )
+
+        assert all( map( lambda x: type( x ) == np.float64, statistics ) )
+        assert statistics == pytest.approx( (1.0, 7.0, np.nanstd( data )) )
+        assert statistics == pytest.approx( iwp.statistics.compute_statistics( xarray.DataArray( data ) ) )
+
+class TestSaveStatistics:
+    """
+    Test harness for iwp.statistics.save_statistics().  Verifies that statistics
+    computed by compute_statistics() survive a round trip through disk.
+    """
+
+    @pytest.mark.parametrize( "orjson_flag", [True, False] )
+    @pytest.mark.parametrize( "pretty_flag", [True, False] )
+    def test_round_trip( self, tmp_path, monkeypatch, pretty_flag, orjson_flag ):
+        """
+        Verifies that statistics are saved and loaded, both pretty printed and
+        compactly, with and without orjson.
+
+        Takes 4 arguments:
+
+          tmp_path    - pytest fixture specifying a temporary directory.
+          monkeypatch - pytest fixture for hiding orjson.
+          pretty_flag - Flag specifying whether the statistics are pretty printed.
+          orjson_flag - Flag specifying whether orjson is used, if installed.
+
+        Returns nothing.
+
+        """
+
+        if orjson_flag:
+            pytest.importorskip( "orjson" )
+        else:
+            # make orjson's import fail so the json module is used instead.
+            monkeypatch.setitem( sys.modules, "orjson", None )
+
+        statistics_path = str( tmp_path / "statistics.json" )
+        statistics      = {"u": iwp.statistics.compute_statistics( np.arange( 10.0 ) ),
+                           "v": iwp.statistics.compute_statistics( np.arange( 5.0, dtype=np.float32 ) )}
+
+        iwp.statistics.save_statistics( statistics_path,
+                                        statistics,
+                                        pretty_flag=pretty_flag )
+
+        assert iwp.statistics.load_statistics( statistics_path ) == {
+            variable_name: list( map( float, variable_statistics ) )
+            for variable_name, variable_statistics in statistics.items()}
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+# Tests for the transforms module.
+
+import math
+import netCDF4 as nc
+import numpy as np
+import pytest
+
+import iwp.transforms
+import iwp.wavelet
+
+def create_netcdf_file( netcdf_path, grid_size, chunk_sizes, output_names=[] ):
+    """
+    Creates a netCDF4 file with a reference variable initialized to reproducible
+    random data, and optionally uninitialized output variables with the same
+    layout.
+
+    Takes 4 arguments:
+
+      netcdf_path  - Path to the netCDF4 file to create.
+      grid_size    - Size of the underlying grid, shaped (z, y, x).
+      chunk_sizes  - Chunk sizes of the variables, shaped (z, y, x), or None to
+                     create contiguous variables.
+      output_names - Optional list of output variable names to create.  If omitted,
+                     defaults to an empty list and only the reference variable is
+                     created.
+
+    Returns 1 value:
+
+      reference_data - NumPy array, of type np.float32, written to the reference
+                       variable.
+
+    """
+
+    reference_data = np.random.default_rng( 1 ).standard_normal( grid_size ).astype( np.float32 )
+
+    with nc.Dataset( netcdf_path,
+                     "w",
+                     format="NETCDF4",
+                     clobber=True ) as ds:
+
+        for dimension_name, dimension_size in zip( ["z", "y", "x"], grid_size ):
+            ds.createDimension( dimension_name, dimension_size )
+
+        #
+        # NOTE: we create the output variables here, rather than letting the
+        #       transformer create them from the reference, so the tests do not
+        #       depend on the filters netCDF4 reports for the reference.
+        #
+        for variable_name in ["u"] + output_names:
+            ds.createVariable( variable_name,
+                               np.float32,
+                               dimensions=("z", "y", "x"),
+                               chunksizes=chunk_sizes,
+                               contiguous=(chunk_sizes is None) )
+
+        ds["u"][:] = reference_data
+
+    return reference_data
+
+class TestIWPnetCDFTransformer:
+    """
+    Test harness for iwp.transforms.IWPnetCDFTransformer.  Verifies that the
+    reference and output variables' chunk caches are sized and that transforming
+    blocks of XY slices matches transforming each XY slice individually.
+    """
+
+    @pytest.mark.parametrize( "chunk_cache_bytes, chunk_cache_nelems",
+                              [(None,          None),
+                               (32 * 1024**2,  None),
+                               (None,          1009),
+                               (32 * 1024**2,  1009)] )
+    def test_chunk_cache( self, tmp_path, chunk_cache_bytes, chunk_cache_nelems ):
+        """
+        Verifies that the chunk cache is sized to hold a block of chunks by default,
+        is never shrunk, and is set to the requested size and slots when supplied.
+
+        Takes 3 arguments:
+
+          tmp_path           - pytest fixture specifying a temporary directory.
+          chunk_cache_bytes  - Chunk cache size requested, or None.
+          chunk_cache_nelems - Chunk cache slots requested, or None.
+
+        Returns nothing.
+
+        """
+
+        netcdf_path = str( tmp_path / "iwp.nc" )
+        chunk_sizes = (8, 256, 256)
+
+        create_netcdf_file( netcdf_path, (16, 256, 256), chunk_sizes )
+
+        transformer = iwp.transforms.IWPnetCDFTransformer( "u",
+                                                           ["u_transformed"],
+                                                           ["symmetric_morlet_single_scale:alpha=30:scales=2"],
+                                                           chunk_cache_bytes=chunk_cache_bytes,
+                                                           chunk_cache_nelems=chunk_cache_nelems )
+
+        with nc.Dataset( netcdf_path, "r" ) as ds:
+            variable = ds["u"]
+
+            (original_bytes,
+             original_nelems,
+             original_preemption) = variable.get_var_chunk_cache()
+
+            transformer._set_chunk_cache( variable )
+
+            (cache_bytes,
+             cache_nelems,
+             cache_preemption) = variable.get_var_chunk_cache()
+
+            if chunk_cache_bytes is None:
+                assert cache_bytes == max( original_bytes,
+                                           4 * math.prod( chunk_sizes ) * np.dtype( np.float32 ).itemsize )
+            else:
+                assert cache_bytes == chunk_cache_bytes
+
+            if chunk_cache_nelems is None:
+                assert cache_nelems == original_nelems
+            else:
+                assert cache_nelems == chunk_cache_nelems
+
+            assert cache_preemption == pytest.approx( original_preemption )
+
+            # verify that a larger cache is not shrunk by default.
+            if chunk_cache_bytes is None:
+                variable.set_var_chunk_cache( size=2 * cache_bytes )
+                transformer._set_chunk_cache( variable )
+
+                assert variable.get_var_chunk_cache()[0] == 2 * cache_bytes
+
+    def test_contiguous_chunk_cache( self, tmp_path ):
+        """
+        Verifies that contiguous variables' chunk caches are left as is.
+
+        Takes 1 argument:
+
+          tmp_path - pytest fixture specifying a temporary directory.
+
+        Returns nothing.
+
+        """
+
+        netcdf_path = str( tmp_path / "iwp.nc" )
+
+        create_netcdf_file( netcdf_path, (4, 24, 32), None )
+
+        transformer = iwp.transforms.IWPnetCDFTransformer( "u",
+                                                           ["u_transformed"],
+                                                           ["symmetric_morlet_single_scale:alpha=30:scales=2"],
+                                                           chunk_cache_bytes=32 * 1024**2,
+                                                           chunk_cache_nelems=1009 )
+
+        with nc.Dataset( netcdf_path, "r" ) as ds:
+            original_cache = ds["u"].get_var_chunk_cache()
+
+            transformer._set_chunk_cache( ds["u"] )
+
+            assert ds["u"].get_var_chunk_cache() == original_cache
+
+    @pytest.mark.parametrize( "grid_size, chunk_sizes",
+                              [((10, 24, 32), (4, 24, 32)),
+                               ((10, 24, 32), (3, 12, 16)),
+                               ((70, 24, 32), None)] )
+    def test_block_transform( self, tmp_path, grid_size, chunk_sizes ):
+        """
+        Verifies that transforming blocks of XY slices along Z matches transforming
+        each XY slice individually.  Grids that are not a multiple of the block size
+        are used so partial blocks are exercised for both chunked and contiguous
+        variables.
+
+        Takes 3 arguments:
+
+          tmp_path    - pytest fixture specifying a temporary directory.
+          grid_size   - Size of the grid, shaped (z, y, x).
+          chunk_sizes - Chunk sizes of the variables, shaped (z, y, x), or None
+                        for contiguous variables.
+
+        Returns nothing.
+
+        """
+
+        netcdf_path     = str( tmp_path / "iwp.nc" )
+        output_names    = ["u_max_modulus", "u_single_scale"]
+        transform_specs = ["symmetric_morlet_max_modulus:alpha=30:scales=2,4",
+                           "symmetric_morlet_single_scale:alpha=-20:scales=3"]
+
+        reference_data = create_netcdf_file( netcdf_path,
+                                             grid_size,
+                                             chunk_sizes,
+                                             output_names )
+
+        transformer = iwp.transforms.IWPnetCDFTransformer( "u",
+                                                           output_names,
+                                                           transform_specs )
+
+        assert transformer( netcdf_path ) == (0, "Success")
+
+        with nc.Dataset( netcdf_path, "r" ) as ds:
+            for output_name, transform_spec in zip( output_names, transform_specs ):
+                transform, _, _ = iwp.transforms.lookup_transform( transform_spec )
+
+                expected_data = np.stack( [transform( xy_slice ) for xy_slice in reference_data] )
+
+                assert np.array_equal( ds[output_name][:], expected_data )
+
+
+class TestParseTransformSpec:
+    """
+    Test harness for iwp.transforms._parse_transform_spec().  Verifies that
+    specifications are parsed into their names and type cast parameters, that
+    cached specifications are returned as independent copies, and that invalid
+    specifications are rejected.
+    """
+
+    @pytest.mark.parametrize( "transform_spec, expected_name, expected_parameters",
+                              [("symmetric_morlet_max_modulus:alpha=30:scales=2,4,8",
+                                iwp.transforms.SYMMETRIC_MORLET_MAX_MODULUS,
+                                {"alpha": 30.0, "scales": [2.0, 4.0, 8.0]}),
+                               ("symmetric_morlet_max_modulus:scales=2.5:alpha=-45.5",
+                                iwp.transforms.SYMMETRIC_MORLET_MAX_MODULUS,
+                                {"alpha": -45.5, "scales": [2.5]}),
+                               ("symmetric_morlet_single_scale:alpha=20:scales=2,4:scale_index=1",
+                                iwp.transforms.SYMMETRIC_MORLET_SINGLE_SCALE,
+                                {"alpha": 20.0, "scales": [2.0, 4.0], "scale_index": 1}),
+                               ("symmetric_morlet_single_scale:alpha=20:scales=3",
+                                iwp.transforms.SYMMETRIC_MORLET_SINGLE_SCALE,
+                                {"alpha": 20.0, "scales": [3.0], "scale_index": 0})] )
+    def test_round_trip( self, transform_spec, expected_name, expected_parameters ):
+        """
+        Verifies that a specification parses into the expected name and parameters,
+        that the parameters format back into an equivalent specification, and that
+        modifying the parameters returned does not affect later parses.
+
+        Takes 3 arguments:
+
+          transform_spec      - Transform specification to parse.
+          expected_name       - Name of the transform expected.
+          expected_parameters - Dictionary of the parameters expected.
+
+        Returns nothing.
+
+        """
+
+        def check_parameters( transform_parameters ):
+            assert transform_parameters.keys() == expected_parameters.keys()
+
+            for key, value in expected_parameters.items():
+                assert np.array_equal( transform_parameters[key], value )
+
+        (transform_name,
+         transform_parameters) = iwp.transforms._parse_transform_spec( transform_spec )
+
+        assert transform_name == expected_name
+        assert transform_parameters["scales"].dtype == np.float64
+        check_parameters( transform_parameters )
+
+        # format the parameters back into a specification and parse it again.
+        round_trip_spec = "{:s}:{:s}".format(
+            transform_name,
+            ":".join( "{:s}={:s}".format(
+                key,
+                ",".join( map( str, value ) ) if key == "scales" else str( value ) )
+                      for key, value in transform_parameters.items() ) )
+
+        (round_trip_name,
+         round_trip_parameters) = iwp.transforms._parse_transform_spec( round_trip_spec )
+
+        assert round_trip_name == expected_name
+        check_parameters( round_trip_parameters )
+
+        # modify the parameters returned and verify the cached copy is intact.
+        transform_parameters["alpha"]     = 0.0
+        transform_parameters["scales"][0] = -1.0
+
+        (_,
+         transform_parameters) = iwp.transforms._parse_transform_spec( transform_spec )
+
+        check_parameters( transform_parameters )
+
+    @pytest.mark.parametrize( "transform_spec",
+                              ["symmetric_morlet_max_modulus",
+                               "unknown_transform:alpha=30:scales=2",
+                               "symmetric_morlet_max_modulus:alpha=30",
+                               "symmetric_morlet_max_modulus:alpha=30:scales=2,-4",
+                               "symmetric_morlet_max_modulus:alpha=30:scales=2,abc",
+                               "symmetric_morlet_max_modulus:alpha=inf:scales=2",
+                               "symmetric_morlet_max_modulus:alpha=30:scales=2=4",
+                               "symmetric_morlet_max_modulus:alpha=30:scales",
+                               "symmetric_morlet_single_scale:alpha=30:scales=2:scale_index=1"] )
+    def test_invalid_spec( self, transform_spec ):
+        """
+        Verifies that invalid specifications raise ValueError each time they are
+        parsed and are reported as invalid.
+
+        Takes 1 argument:
+
+          transform_spec - Invalid transform specification to parse.
+
+        Returns nothing.
+
+        """
+
+        # parse twice to verify that failures are not cached.
+        for _ in range( 2 ):
+            with pytest.raises( ValueError ):
+                iwp.transforms._parse_transform_spec( transform_spec )
+
+        assert not iwp.transforms.is_valid_transform_spec( transform_spec )
+
+        with pytest.raises( ValueError ):
+            iwp.transforms.lookup_transform( transform_spec )
+
+class TestSymmetricMorletTransforms:
+    """
+    Test harness for the symmetric Morlet transforms.  Verifies that they match
+    the maximum modulus of the separately computed CWTs.
+    """
+
+    @pytest.mark.parametrize( "transform_spec, scales",
+                              [("symmetric_morlet_max_modulus:alpha=30:scales=2,4,8", [2.0, 4.0, 8.0]),
+                               ("symmetric_morlet_single_scale:alpha=30:scales=2,4,8:scale_index=2", [8.0])] )
+    def test_matches_cwt_max_modulus( self, transform_spec, scales ):
+        """
+        Verifies that repeated calls, batched frames, output arrays, and single
+        precision computation match cwt_max_modulus() applied to cwt_2d()'s CWTs.
+
+        Takes 2 arguments:
+
+          transform_spec - Transform specification to look up.
+          scales         - List of length scales the transform computes with.
+
+        Returns nothing.
+
+        """
+
+        data = np.random.default_rng( 1 ).standard_normal( (3, 24, 32) )
+
+        expected_data = np.stack( [iwp.wavelet.cwt_max_modulus( [iwp.wavelet.cwt_2d( frame,
+                                                                                      scales,
+                                                                                      iwp.wavelet.CWT_MORLET,
+                                                                                      alpha=alpha )
+                                                                  for alpha in [30.0, -30.0]],
+                                                                minimum_value=1e-7 )
+                                   for frame in data] )
+
+        transform, _, _ = iwp.transforms.lookup_transform( transform_spec )
+
+        # transform each frame twice so the cached filters and work buffers
+        # are reused.
+        for _ in range( 2 ):
+            for frame, expected_frame in zip( data, expected_data ):
+                assert np.array_equal( transform( frame ), expected_frame )
+
+        out = np.empty_like( data )
+
+        assert transform( data, out=out ) is out
+        assert np.array_equal( out, expected_data )
+
+        transformed_data = transform( data, dtype=np.float32 )
+
+        assert transformed_data.dtype == np.float32
+        assert np.allclose( transformed_data, expected_data, rtol=1e-4, atol=1e-5 )
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+
+# Tests for the wavelet module.
+
+import numpy as np
+import pytest
+
+import iwp.wavelet
+
+def compute_baseline_cwt( data, scales, wavelet_name, **wavelet_parameters ):
+    """
+    Computes a 2D CWT the way iwp.wavelet.cwt_2d() originally did: the wavelet
+    filters are built from the frequency plane for each length scale and the
+    data are filtered with NumPy's FFTs.  This serves as the reference the
+    optimized kernels are compared against.
+
+    Takes 4 arguments:
+
+      data               - 2D NumPy array, of type np.float32 or np.float64, to
+                           compute the CWT of.
+      scales             - List of length scales to compute the CWT at.
+      wavelet_name       - Name of the wavelet to compute with.
+      wavelet_parameters - Optional dictionary of parameters for the wavelet.
+
+    Returns 1 value:
+
+      cwt - Complex NumPy array, shaped (len( scales ), height, width), with
+            data's precision.
+
+    """
+
+    cwt_dtype = np.complex64 if data.dtype == np.float32 else np.complex128
+
+    data_spectra     = np.fft.fft2( data )
+    omega_x, omega_y = iwp.wavelet._create_frequency_plane( data.shape[1], data.shape[0] )
+
+    cwt = np.empty( (len( scales ), data.shape[0], data.shape[1]), dtype=cwt_dtype )
+
+    for scale_index, scale in enumerate( scales ):
+        wavelet_filter = iwp.wavelet._wavelet_filters_map[wavelet_name]( omega_x,
+                                                                          omega_y,
+                                                                          scale,
+                                                                          **wavelet_parameters )
+
+        cwt[scale_index, ...] = np.fft.ifft2( data_spectra * wavelet_filter )
+
+    return cwt
+
+def compute_baseline_symmetric_max_modulus( data, scales, alpha, minimum_value=None ):
+    """
+    Computes the maximum modulus of a symmetric Morlet CWT the way the symmetric
+    Morlet transforms originally did: the full CWTs at alpha and -alpha are
+    computed and the maximum modulus is taken across both.
+
+    Takes 4 arguments:
+
+      data          - 2D NumPy array, of type np.float32 or np.float64, to compute
+                      the CWT modulus of.
+      scales        - List of length scales to compute the CWT at.
+      alpha         - Orientation angle, in degrees, of the Morlet wavelet.
+      minimum_value - Optional minimum value to clip the modulus against.  If
+                      omitted, no clipping is performed.
+
+    Returns 1 value:
+
+      cwt_modulus - 2D NumPy array containing the maximum modulus.
+
+    """
+
+    cwt_modulus = np.maximum( np.max( np.abs( compute_baseline_cwt( data,
+                                                                    scales,
+                                                                    iwp.wavelet.CWT_MORLET,
+                                                                    alpha=alpha ) ),
+                                      axis=0 ),
+                              np.max( np.abs( compute_baseline_cwt( data,
+                                                                    scales,
+                                                                    iwp.wavelet.CWT_MORLET,
+                                                                    alpha=-alpha ) ),
+                                      axis=0 ) )
+
+    if minimum_value is not None:
+        cwt_modulus = np.maximum( cwt_modulus, minimum_value )
+
+    return cwt_modulus
+
+def create_test_data( shape, dtype ):
+    """
+    Creates reproducible random data to transform.
+
+    Takes 2 arguments:
+
+      shape - Tuple specifying the data's shape.
+      dtype - NumPy floating point data type of the data.
+
+    Returns 1 value:
+
+      data - NumPy array of shape and dtype.
+
+    """
+
+    return np.random.default_rng( 1 ).standard_normal( shape ).astype( dtype )
+
+class TestInPlaceInverseFFT:
+    """
+    Test harness for iwp.wavelet._ifft2_in_place().  Verifies that the inverse
+    FFT is written into its input on NumPy and that the resulting CWTs are
+    unchanged.
+    """
+
+    @pytest.mark.parametrize( "dtype", [np.complex64, np.complex128] )
+    @pytest.mark.parametrize( "shape", [(24, 32), (3, 24, 32)] )
+    def test_in_place( self, shape, dtype ):
+        """
+        Verifies that the inverse FFT is computed into the supplied spectra and
+        matches NumPy's out of place inverse FFT.
+
+        Takes 2 arguments:
+
+          shape - Tuple specifying the spectra's shape.
+          dtype - NumPy complex data type of the spectra.
+
+        Returns nothing.
+
+        """
+
+        spectra = (create_test_data( shape, np.float64 ) +
+                   1j * create_test_data( shape[::-1], np.float64 ).T).astype( dtype )
+
+        expected_data = np.fft.ifft2( spectra.copy() )
+
+        data = iwp.wavelet._ifft2_in_place( spectra )
+
+        assert data is spectra
+        assert data.dtype == expected_data.dtype
+        assert np.array_equal( data, expected_data )
+
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_cwt_modulus( self, dtype ):
+        """
+        Verifies that the CWT modulus computed with the in place inverse FFT
+        matches the original cwt_2d() implementation.
+
+        Takes 1 argument:
+
+          dtype - NumPy floating point data type of the data transformed.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (40, 48), dtype )
+        scales = [2.0, 4.0, 8.0]
+
+        cwt          = iwp.wavelet.cwt_2d( data, scales, iwp.wavelet.CWT_MORLET, alpha=30.0 )
+        expected_cwt = compute_baseline_cwt( data, scales, iwp.wavelet.CWT_MORLET, alpha=30.0 )
+
+        assert cwt.dtype == expected_cwt.dtype
+        assert np.array_equal( np.abs( cwt ), np.abs( expected_cwt ) )
+
+class TestSymmetricMorletWorkBuffers:
+    """
+    Test harness for the work buffers of iwp.wavelet.symmetric_morlet_max_modulus().
+    Verifies that buffers are reused across calls, that only the serial path
+    requests them, and that the results are unaffected.
+    """
+
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_serial_reuse( self, dtype ):
+        """
+        Verifies that the serial path reuses its work buffers across calls and
+        returns independent results that match the original implementation.
+
+        Takes 1 argument:
+
+          dtype - NumPy floating point data type of the data transformed.
+
+        Returns nothing.
+
+        """
+
+        scales       = [2.0, 4.0]
+        work_buffers = {}
+
+        data = [create_test_data( (24, 32), dtype ),
+                create_test_data( (24, 32), dtype )[::-1, :].copy()]
+
+        first_modulus = iwp.wavelet.symmetric_morlet_max_modulus( data[0],
+                                                                  scales,
+                                                                  30.0,
+                                                                  work_buffers=work_buffers )
+
+        # single precision data are rounded through the CWT buffer as the
+        # filters are double precision.
+        expected_names = {"data_spectra", "spectra", "modulus"}
+        if dtype == np.float32:
+            expected_names.add( "cwt" )
+
+        assert set( work_buffers.keys() ) == expected_names
+
+        first_buffers = dict( work_buffers )
+
+        second_modulus = iwp.wavelet.symmetric_morlet_max_modulus( data[1],
+                                                                   scales,
+                                                                   30.0,
+                                                                   work_buffers=work_buffers )
+
+        for buffer_name, work_buffer in first_buffers.items():
+            assert work_buffers[buffer_name] is work_buffer
+
+        assert not np.shares_memory( first_modulus, second_modulus )
+
+        for data_index, modulus in enumerate( [first_modulus, second_modulus] ):
+            expected_modulus = compute_baseline_symmetric_max_modulus( data[data_index],
+                                                                       scales,
+                                                                       30.0 )
+
+            assert modulus.dtype == expected_modulus.dtype
+            assert np.array_equal( modulus, expected_modulus )
+
+    def test_threaded_buffers( self ):
+        """
+        Verifies that the threaded path only requests the data's spectra buffer
+        and matches the original implementation.
+
+        Takes no arguments.
+
+        Returns nothing.
+
+        """
+
+        data         = create_test_data( (24, 32), np.float64 )
+        scales       = [2.0, 4.0]
+        work_buffers = {}
+
+        modulus = iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                            scales,
+                                                            30.0,
+                                                            number_workers=2,
+                                                            work_buffers=work_buffers )
+
+        assert set( work_buffers.keys() ) == {"data_spectra"}
+        assert np.array_equal( modulus,
+                               compute_baseline_symmetric_max_modulus( data, scales, 30.0 ) )
+
+class TestSymmetricMorletMaxModulus:
+    """
+    Test harness for iwp.wavelet.symmetric_morlet_max_modulus().  Verifies that
+    the fused kernel matches the maximum modulus of the separately computed CWTs.
+    """
+
+    @pytest.mark.parametrize( "minimum_value", [None, 1e-2] )
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_matches_cwt_max_modulus( self, dtype, minimum_value ):
+        """
+        Verifies that the fused kernel matches both cwt_max_modulus() applied to
+        cwt_2d()'s CWTs and the original implementation.
+
+        Takes 2 arguments:
+
+          dtype         - NumPy floating point data type of the data transformed.
+          minimum_value - Minimum value to clip the modulus against, or None.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (40, 48), dtype )
+        scales = [2.0, 4.0, 8.0]
+        alpha  = 40.0
+
+        modulus = iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                            scales,
+                                                            alpha,
+                                                            minimum_value=minimum_value )
+
+        cwt_modulus = iwp.wavelet.cwt_max_modulus( [iwp.wavelet.cwt_2d( data,
+                                                                         scales,
+                                                                         iwp.wavelet.CWT_MORLET,
+                                                                         alpha=alpha ),
+                                                     iwp.wavelet.cwt_2d( data,
+                                                                         scales,
+                                                                         iwp.wavelet.CWT_MORLET,
+                                                                         alpha=-alpha )],
+                                                   minimum_value=minimum_value )
+        expected_modulus = compute_baseline_symmetric_max_modulus( data,
+                                                                   scales,
+                                                                   alpha,
+                                                                   minimum_value=minimum_value )
+
+        assert modulus.dtype == data.dtype
+        assert np.array_equal( modulus, cwt_modulus )
+        assert np.array_equal( modulus, expected_modulus )
+
+    @pytest.mark.parametrize( "number_workers", [1, 3] )
+    def test_options( self, number_workers ):
+        """
+        Verifies that batched frames, precomputed wavelet filters, threaded CWTs,
+        output arrays, and clipping all match the original implementation.
+
+        Takes 1 argument:
+
+          number_workers - Number of threads to compute the CWTs with.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (3, 24, 32), np.float64 )
+        scales = [2.0, 4.0]
+        alpha  = 30.0
+
+        expected_modulus = np.stack( [np.minimum( compute_baseline_symmetric_max_modulus( frame,
+                                                                                           scales,
+                                                                                           alpha,
+                                                                                           minimum_value=1e-2 ),
+                                                  1.0 )
+                                      for frame in data] )
+
+        wavelet_filters = iwp.wavelet.create_symmetric_morlet_filters( data.shape[-1],
+                                                                       data.shape[-2],
+                                                                       scales,
+                                                                       alpha )
+        out = np.empty_like( data )
+
+        modulus = iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                            scales,
+                                                            alpha,
+                                                            minimum_value=1e-2,
+                                                            maximum_value=1.0,
+                                                            wavelet_filters=wavelet_filters,
+                                                            number_workers=number_workers,
+                                                            out=out )
+
+        assert modulus is out
+        assert np.array_equal( modulus, expected_modulus )
+
+        # verify that mismatched outputs are rejected.
+        with pytest.raises( ValueError ):
+            iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                      scales,
+                                                      alpha,
+                                                      out=out.astype( np.float32 ) )
+
+    def test_single_precision_filters( self ):
+        """
+        Verifies that single precision filters applied to single precision data
+        closely match the original implementation.
+
+        Takes no arguments.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (40, 48), np.float32 )
+        scales = [2.0, 4.0, 8.0]
+        alpha  = 40.0
+
+        wavelet_filters = iwp.wavelet.create_symmetric_morlet_filters( data.shape[1],
+                                                                       data.shape[0],
+                                                                       scales,
+                                                                       alpha,
+                                                                       dtype=np.float32 )
+
+        for scale_filters in wavelet_filters:
+            for wavelet_filter in scale_filters:
+                assert wavelet_filter.dtype == np.float32
+                assert not wavelet_filter.flags.writeable
+
+        modulus = iwp.wavelet.symmetric_morlet_max_modulus( data,
+                                                            scales,
+                                                            alpha,
+                                                            wavelet_filters=wavelet_filters )
+
+        assert modulus.dtype == np.float32
+        assert np.allclose( modulus,
+                            compute_baseline_symmetric_max_modulus( data, scales, alpha ),
+                            rtol=1e-4,
+                            atol=1e-5 )
+
+class TestCWT2D:
+    """
+    Test harness for iwp.wavelet.cwt_2d() and iwp.wavelet.cwt_max_modulus().
+    Verifies that the cached wavelet filters, precomputed spectra, and in place
+    maximum modulus match the original implementation.
+    """
+
+    @pytest.mark.parametrize( "wavelet_name, wavelet_parameters",
+                              [(iwp.wavelet.CWT_MORLET, {"alpha": 30.0}),
+                               (iwp.wavelet.CWT_HALO,   {}),
+                               (iwp.wavelet.CWT_ARC,    {"rotate_flag": True})] )
+    def test_cached_filters( self, wavelet_name, wavelet_parameters ):
+        """
+        Verifies that wavelet filters are cached, read-only, and identical to
+        freshly created filters, and that CWTs computed with them match the
+        original implementation.
+
+        Takes 2 arguments:
+
+          wavelet_name       - Name of the wavelet to compute with.
+          wavelet_parameters - Dictionary of parameters for the wavelet.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (24, 32), np.float64 )
+        scales = [2.0, 4.0]
+
+        omega_x, omega_y = iwp.wavelet._create_frequency_plane( data.shape[1], data.shape[0] )
+
+        for scale in scales:
+            wavelet_filter = iwp.wavelet._create_wavelet_filter( wavelet_name,
+                                                                 data.shape[1],
+                                                                 data.shape[0],
+                                                                 scale,
+                                                                 **wavelet_parameters )
+
+            assert not wavelet_filter.flags.writeable
+            assert wavelet_filter is iwp.wavelet._create_wavelet_filter( wavelet_name,
+                                                                         data.shape[1],
+                                                                         data.shape[0],
+                                                                         scale,
+                                                                         **wavelet_parameters )
+            assert np.array_equal( wavelet_filter,
+                                   iwp.wavelet._wavelet_filters_map[wavelet_name]( omega_x,
+                                                                                   omega_y,
+                                                                                   scale,
+                                                                                   **wavelet_parameters ) )
+
+        assert np.array_equal( iwp.wavelet.cwt_2d( data, scales, wavelet_name, **wavelet_parameters ),
+                               compute_baseline_cwt( data, scales, wavelet_name, **wavelet_parameters ) )
+
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_data_spectra( self, dtype ):
+        """
+        Verifies that supplying the data's spectra matches computing it.
+
+        Takes 1 argument:
+
+          dtype - NumPy floating point data type of the data transformed.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (24, 32), dtype )
+        scales = [2.0, 4.0]
+
+        cwt = iwp.wavelet.cwt_2d( data,
+                                  scales,
+                                  iwp.wavelet.CWT_MORLET,
+                                  data_spectra=np.fft.fft2( data ),
+                                  alpha=30.0 )
+
+        expected_cwt = compute_baseline_cwt( data, scales, iwp.wavelet.CWT_MORLET, alpha=30.0 )
+
+        assert cwt.dtype == expected_cwt.dtype
+        assert np.array_equal( cwt, expected_cwt )
+
+    def test_max_modulus( self ):
+        """
+        Verifies that the maximum modulus of a list of CWTs matches reducing each
+        of them separately, and that the CWTs are not modified.
+
+        Takes no arguments.
+
+        Returns nothing.
+
+        """
+
+        data   = create_test_data( (24, 32), np.float64 )
+        scales = [2.0, 4.0, 8.0]
+
+        cwts          = [compute_baseline_cwt( data, scales, iwp.wavelet.CWT_MORLET, alpha=angle )
+                         for angle in [30.0, -30.0, 60.0]]
+        original_cwts = [cwt.copy() for cwt in cwts]
+
+        expected_modulus = np.clip( np.max( np.abs( np.stack( cwts ) ), axis=(0, 1) ),
+                                    1e-2,
+                                    1.0 )
+
+        modulus = iwp.wavelet.cwt_max_modulus( cwts,
+                                               minimum_value=1e-2,
+                                               maximum_value=1.0 )
+
+        assert np.array_equal( modulus, expected_modulus )
+
+        for cwt, original_cwt in zip( cwts, original_cwts ):
+            assert np.array_equal( cwt, original_cwt )
+
+class TestOptionalBackends:
+    """
+    Test harness for the optional pyFFTW and GPU backends.  Verifies that they
+    closely match the original implementation.  Skipped when the backend is not
+    installed.
+    """
+
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_pyfftw( self, dtype ):
+        """
+        Verifies that CWTs and the maximum modulus computed with pyFFTW closely match
+        the original implementation.
+
+        Takes 1 argument:
+
+          dtype - NumPy floating point data type of the data transformed.
+
+        Returns nothing.
+
+        """
+
+        pytest.importorskip( "pyfftw" )
+
+        data   = create_test_data( (40, 48), dtype )
+        scales = [2.0, 4.0, 8.0]
+        alpha  = 30.0
+
+        iwp.wavelet.enable_pyfftw( number_threads=2 )
+
+        try:
+            cwt     = iwp.wavelet.cwt_2d( data, scales, iwp.wavelet.CWT_MORLET, alpha=alpha )
+            modulus = iwp.wavelet.symmetric_morlet_max_modulus( data, scales, alpha )
+        finally:
+            iwp.wavelet.disable_pyfftw()
+
+        expected_cwt = compute_baseline_cwt( data, scales, iwp.wavelet.CWT_MORLET, alpha=alpha )
+
+        assert cwt.dtype == expected_cwt.dtype
+        assert modulus.dtype == data.dtype
+        assert np.allclose( cwt, expected_cwt, rtol=1e-4, atol=1e-5 )
+        assert np.allclose( modulus,
+                            compute_baseline_symmetric_max_modulus( data, scales, alpha ),
+                            rtol=1e-4,
+                            atol=1e-5 )
+
+    @pytest.mark.parametrize( "dtype", [np.float32, np.float64] )
+    def test_gpu( self, dtype ):
+        """
+        Verifies that the maximum modulus computed on a GPU closely matches the
+        original implementation.
+
+        Takes 1 argument:
+
+          dtype - NumPy floating point data type of the data transformed.
+
+        Returns nothing.
+
+        """
+
+        pytest.importorskip( "cupy" )
+
+        data   = create_test_data( (40, 48), dtype )
+        scales = [2.0, 4.0, 8.0]
+        alpha  = 30.0
+
+        modulus = iwp.wavelet.symmetric_morlet_max_modulus_gpu( data,
+                                                                scales,
+                                                                alpha,
+                                                                minimum_value=1e-2 )
+
+        assert modulus.dtype == data.dtype
+        assert np.allclose( modulus,
+                            compute_baseline_symmetric_max_modulus( data,
+                                                                    scales,
+                                                                    alpha,
+                                                                    minimum_value=1e-2 ),
+                            rtol=1e-4,
+                            atol=1e-5 )